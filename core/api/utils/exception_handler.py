@@ -0,0 +1,32 @@
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import (
+    exception_handler,
+    set_rollback,
+)
+
+from core.api.utils.response_builder import build_api_response
+from core.apps.common.exceptions.database_exceptions.database_exc import DatabaseTimeoutException
+
+
+# Через сколько секунд клиенту имеет смысл повторить запрос, отменённый из-за перегрузки.
+RETRY_AFTER_SECONDS = 5
+
+
+def api_exception_handler(exc: Exception, context: dict) -> Response | None:
+    """
+    Обработчик исключений DRF: таймауты БД, не перехваченные представлением, возвращаются
+    в формате `build_api_response`; остальное обрабатывает стандартный обработчик DRF.
+    """
+    if not isinstance(exc, DatabaseTimeoutException):
+        return exception_handler(exc, context)
+
+    set_rollback()
+    response = build_api_response(
+        message=exc.detail,
+        status_code=exc.status_code,
+        errors=[{"detail": str(exc)}],
+    )
+    if exc.status_code == status.HTTP_503_SERVICE_UNAVAILABLE:
+        response["Retry-After"] = str(RETRY_AFTER_SECONDS)
+    return response
@@ -0,0 +1,220 @@
+"""
+Поддержка заголовка `Idempotency-Key` для создающих эндпоинтов.
+
+Первый успешный ответ на запрос с ключом сохраняется в Redis по пользователю, эндпоинту
+и ключу; повтор с тем же ключом получает сохранённый ответ (с заголовком `Idempotent-Replayed`)
+без обращения к сервисному слою. Одновременные повторы выстраиваются в очередь короткой
+блокировкой. Сохраняются только ответы 2xx: неудачный запрос ничего не создал, и повтор
+выполнится заново.
+"""
+
+import hashlib
+import json
+import logging
+import time
+import uuid
+from functools import (
+    lru_cache,
+    wraps,
+)
+
+import redis
+from django.conf import settings
+from drf_spectacular.utils import (
+    OpenApiParameter,
+    OpenApiTypes,
+)
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from core.api.utils.response_builder import build_api_response
+
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+LOCK_POLL_SECONDS = 0.05
+
+RESPONSE_KEY = "idempotency:{scope}:{user_id}:{key}"
+LOCK_KEY = "idempotency:lock:{scope}:{user_id}:{key}"
+
+# Снимает блокировку, только если она всё ещё принадлежит этому запросу.
+RELEASE_LOCK_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+
+IDEMPOTENCY_KEY_PARAMETER = OpenApiParameter(
+    name=IDEMPOTENCY_HEADER,
+    type=OpenApiTypes.STR,
+    location=OpenApiParameter.HEADER,
+    description="Уникальный ключ запроса: повтор с тем же ключом вернёт первый ответ, не создавая объект заново.",
+    required=False,
+)
+
+
+class IdempotencyStore:
+    def __init__(self, redis_url: str, ttl: int, lock_timeout: float, lock_wait: float):
+        self.client = redis.Redis.from_url(redis_url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        self.ttl = ttl
+        self.lock_timeout = lock_timeout
+        self.lock_wait = lock_wait
+        self._release_lock = self.client.register_script(RELEASE_LOCK_SCRIPT)
+
+    def get(self, key: str) -> dict | None:
+        raw = self.client.get(key)
+        return json.loads(raw) if raw is not None else None
+
+    def save(self, key: str, record: dict) -> None:
+        self.client.set(key, json.dumps(record, cls=JSONEncoder, ensure_ascii=False), ex=self.ttl)
+
+    def acquire(self, lock_key: str) -> str | None:
+        """Токен блокировки или None, если её держит другой запрос."""
+        token = uuid.uuid4().hex
+        if self.client.set(lock_key, token, nx=True, px=int(self.lock_timeout * 1000)):
+            return token
+        return None
+
+    def release(self, lock_key: str, token: str) -> None:
+        self._release_lock(keys=[lock_key], args=[token])
+
+    def reserve(self, key: str, lock_key: str) -> tuple[dict | None, str | None]:
+        """
+        Сохранённый ответ или токен блокировки для выполнения запроса.
+
+        Returns:
+            tuple[dict | None, str | None]: (ответ, None), (None, токен) или (None, None),
+            если параллельный запрос с тем же ключом не завершился за время ожидания.
+        """
+        record = self.get(key)
+        if record is not None:
+            return record, None
+
+        token = self.acquire(lock_key)
+        if token is None:
+            record = self.wait_for(key, lock_key)
+            if record is not None:
+                return record, None
+            token = self.acquire(lock_key)
+            if token is None:
+                return None, None
+
+        # Ответ мог быть сохранён между проверкой и захватом блокировки.
+        record = self.get(key)
+        if record is not None:
+            self.release(lock_key, token)
+            return record, None
+        return None, token
+
+    def wait_for(self, key: str, lock_key: str) -> dict | None:
+        """Ждёт, пока параллельный запрос с тем же ключом сохранит ответ или снимет блокировку."""
+        deadline = time.monotonic() + self.lock_wait
+        while time.monotonic() < deadline:
+            record = self.get(key)
+            if record is not None or not self.client.exists(lock_key):
+                return record
+            time.sleep(LOCK_POLL_SECONDS)
+        return None
+
+
+@lru_cache(1)
+def get_idempotency_store() -> IdempotencyStore:
+    return IdempotencyStore(
+        redis_url=settings.IDEMPOTENCY_REDIS_URL,
+        ttl=settings.IDEMPOTENCY_TTL_SECONDS,
+        lock_timeout=settings.IDEMPOTENCY_LOCK_TIMEOUT_SECONDS,
+        lock_wait=settings.IDEMPOTENCY_LOCK_WAIT_SECONDS,
+    )
+
+
+def request_fingerprint(request: Request) -> str:
+    """Отпечаток тела запроса: повтор ключа с другими данными — ошибка клиента."""
+    body = json.dumps(request.data, cls=JSONEncoder, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(f"{request.method} {request.path}\n{body}".encode()).hexdigest()
+
+
+def replay(record: dict) -> Response:
+    response = Response(record["data"], status=record["status"])
+    response[REPLAYED_HEADER] = "true"
+    return response
+
+
+def idempotent(scope: str):
+    """
+    Декоратор метода APIView: поддержка заголовка Idempotency-Key.
+
+    Представление не должно выполняться внутри транзакции запроса (ATOMIC_REQUESTS,
+    STATEMENT_TIMEOUTS_MS для этого метода): иначе ответ сохранится и блокировка снимется до коммита.
+    Запрос без ключа или без аутентифицированного пользователя обрабатывается как обычно.
+    Если Redis недоступен, запрос тоже выполняется как обычно: без защиты от повтора,
+    но без отказа клиенту.
+
+    Args:
+        scope (str): Имя эндпоинта в ключе Redis, например `orders.create`.
+    """
+
+    def decorator(method):
+        @wraps(method)
+        def wrapper(view, request: Request, *args, **kwargs) -> Response:
+            idempotency_key = request.headers.get(IDEMPOTENCY_HEADER)
+            if not idempotency_key or not request.user.is_authenticated:
+                return method(view, request, *args, **kwargs)
+
+            if len(idempotency_key) > MAX_KEY_LENGTH:
+                return build_api_response(
+                    message=f"Заголовок {IDEMPOTENCY_HEADER} длиннее {MAX_KEY_LENGTH} символов.",
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                )
+
+            names = {"scope": scope, "user_id": request.user.id, "key": idempotency_key}
+            key, lock_key = RESPONSE_KEY.format(**names), LOCK_KEY.format(**names)
+            fingerprint = request_fingerprint(request)
+            store = get_idempotency_store()
+            try:
+                record, token = store.reserve(key, lock_key)
+            except redis.RedisError as e:
+                logger.warning("Хранилище ключей идемпотентности недоступно, запрос выполняется без него: %s", e)
+                return method(view, request, *args, **kwargs)
+
+            if record is not None:
+                if record["fingerprint"] != fingerprint:
+                    return build_api_response(
+                        message=f"Ключ {IDEMPOTENCY_HEADER} уже использован для запроса с другими данными.",
+                        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    )
+                return replay(record)
+
+            if token is None:
+                response = build_api_response(
+                    message=f"Запрос с этим ключом {IDEMPOTENCY_HEADER} ещё выполняется.",
+                    status_code=status.HTTP_409_CONFLICT,
+                )
+                response["Retry-After"] = "1"
+                return response
+
+            try:
+                response = method(view, request, *args, **kwargs)
+                if status.is_success(response.status_code):
+                    try:
+                        store.save(
+                            key, {"fingerprint": fingerprint, "status": response.status_code, "data": response.data}
+                        )
+                    except redis.RedisError as e:
+                        logger.warning("Не удалось сохранить ответ по ключу идемпотентности: %s", e)
+                return response
+            finally:
+                try:
+                    store.release(lock_key, token)
+                except redis.RedisError as e:
+                    # Блокировка истечёт сама через IDEMPOTENCY_LOCK_TIMEOUT_SECONDS.
+                    logger.warning("Не удалось снять блокировку ключа идемпотентности: %s", e)
+
+        return wrapper
+
+    return decorator
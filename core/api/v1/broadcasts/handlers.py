@@ -0,0 +1,187 @@
+import uuid
+
+from drf_spectacular.utils import (
+    extend_schema,
+    OpenApiParameter,
+    OpenApiTypes,
+)
+from pydantic import ValidationError
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core.api.schemas.pagination import (
+    PaginationIn,
+    PaginationOut,
+)
+from core.api.schemas.response_schemas import (
+    ApiResponse,
+    ListResponsePayload,
+)
+from core.api.utils.response_builder import build_api_response
+from core.api.v1.broadcasts.schemas.schemas import BroadcastCreate
+from core.apps.common.exceptions.base_exception import ServiceException
+from core.apps.subscriptions.serializers import TariffBroadcastSerializer
+from core.apps.subscriptions.services.base_broadcast_service import BroadcastBaseService
+from core.project.containers import get_container
+from core.project.permissions import IsAdminUser
+
+
+class BroadcastListCreateView(APIView):
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(
+        summary="Получить список рассылок",
+        description="Получает список рассылок по тарифам с прогрессом и метриками доставки.",
+        parameters=[
+            OpenApiParameter(
+                name="offset",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                description="Смещение для пагинации.",
+                required=False,
+                default=0,
+            ),
+            OpenApiParameter(
+                name="limit",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                description="Лимит элементов для пагинации.",
+                required=False,
+                default=10,
+            ),
+        ],
+        responses={
+            200: ApiResponse[ListResponsePayload[TariffBroadcastSerializer]],
+        },
+        tags=["Broadcasts"],
+        operation_id="list_broadcasts",
+    )
+    def get(self, request: Request) -> Response:
+        container = get_container()
+        service: BroadcastBaseService = container.resolve(BroadcastBaseService)
+
+        try:
+            pagination_in = PaginationIn.model_validate(
+                request.query_params.dict(),
+            )
+        except ValidationError as e:
+            return build_api_response(
+                message="Ошибка валидации параметров запроса",
+                status_code=status.HTTP_400_BAD_REQUEST,
+                errors=e.errors(),
+            )
+
+        broadcasts = service.get_broadcast_list(pagination_in=pagination_in)
+        pagination_out = PaginationOut(
+            offset=pagination_in.offset,
+            limit=pagination_in.limit,
+            total=service.get_broadcast_count(),
+        )
+
+        return build_api_response(
+            data=ListResponsePayload(
+                items=TariffBroadcastSerializer(broadcasts, many=True).data,
+                pagination=pagination_out,
+            ),
+        )
+
+    @extend_schema(
+        summary="Запустить рассылку подписчикам тарифа",
+        description=(
+            "Ставит в очередь рассылку сообщения в Telegram всем пользователям с активной подпиской "
+            "на тариф. Отправка выполняется фоновой задачей Celery; прогресс доступен по UUID рассылки."
+        ),
+        request=BroadcastCreate,
+        responses={
+            202: ApiResponse[TariffBroadcastSerializer],
+            400: ApiResponse[None],
+            500: ApiResponse[None],
+        },
+        tags=["Broadcasts"],
+        operation_id="create_broadcast",
+    )
+    def post(self, request: Request) -> Response:
+        container = get_container()
+        service: BroadcastBaseService = container.resolve(BroadcastBaseService)
+
+        try:
+            parsed_data = BroadcastCreate.model_validate(request.data)
+            broadcast = service.create_broadcast(
+                tariff_id=parsed_data.tariff_id,
+                message=parsed_data.message,
+                created_by_id=request.user.id,
+            )
+
+            return build_api_response(
+                message="Рассылка поставлена в очередь",
+                status_code=status.HTTP_202_ACCEPTED,
+                data=TariffBroadcastSerializer(broadcast).data,
+            )
+        except ValidationError as e:
+            return build_api_response(
+                message="Ошибка валидации входящих данных",
+                status_code=status.HTTP_400_BAD_REQUEST,
+                errors=e.errors(),
+            )
+        except ServiceException as e:
+            return build_api_response(
+                message=e.detail,
+                status_code=status.HTTP_400_BAD_REQUEST,
+                errors=[{"detail": str(e)}],
+            )
+        except Exception as e:
+            return build_api_response(
+                message=f"Непредвиденная ошибка при обработке запроса: {e}",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                errors=[{"detail": str(e)}],
+            )
+
+
+class BroadcastDetailView(APIView):
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(
+        summary="Получить рассылку по UUID",
+        description="Возвращает статус, прогресс и метрики задержки отправки рассылки.",
+        parameters=[
+            OpenApiParameter(
+                name="broadcast_uuid",
+                type=OpenApiTypes.UUID,
+                location=OpenApiParameter.PATH,
+                description="UUID рассылки.",
+                required=True,
+            ),
+        ],
+        responses={
+            200: ApiResponse[TariffBroadcastSerializer],
+            404: ApiResponse[None],
+            500: ApiResponse[None],
+        },
+        tags=["Broadcasts"],
+        operation_id="retrieve_broadcast_by_id",
+    )
+    def get(self, request: Request, broadcast_uuid: uuid.UUID) -> Response:
+        container = get_container()
+        service: BroadcastBaseService = container.resolve(BroadcastBaseService)
+
+        try:
+            broadcast = service.get_broadcast_by_id(broadcast_id=broadcast_uuid)
+
+            return build_api_response(
+                data=TariffBroadcastSerializer(broadcast).data,
+                status_code=status.HTTP_200_OK,
+            )
+        except ServiceException as e:
+            return build_api_response(
+                message=e.detail,
+                status_code=status.HTTP_404_NOT_FOUND,
+                errors=[{"detail": str(e)}],
+            )
+        except Exception as e:
+            return build_api_response(
+                message=f"Непредвиденная ошибка при обработке запроса: {e}",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                errors=[{"detail": str(e)}],
+            )
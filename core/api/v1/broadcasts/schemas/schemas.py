@@ -0,0 +1,19 @@
+from uuid import UUID
+
+from pydantic import (
+    BaseModel,
+    Field,
+)
+
+
+class BroadcastCreate(BaseModel):
+    tariff_id: UUID = Field(
+        ...,
+        description="Уникальный идентификатор тарифа, подписчикам которого отправляется сообщение",
+    )
+    message: str = Field(
+        ...,
+        min_length=1,
+        max_length=4096,
+        description="Текст сообщения (не длиннее лимита Telegram в 4096 символов)",
+    )
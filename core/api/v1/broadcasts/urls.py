@@ -0,0 +1,22 @@
+from django.urls import path
+
+from core.api.v1.broadcasts.handlers import (
+    BroadcastDetailView,
+    BroadcastListCreateView,
+)
+
+
+app_name = "broadcasts"
+
+urlpatterns = [
+    path(
+        "",
+        BroadcastListCreateView.as_view(),
+        name="broadcast-list-create",
+    ),
+    path(
+        "<uuid:broadcast_uuid>/",
+        BroadcastDetailView.as_view(),
+        name="broadcast-detail",
+    ),
+]
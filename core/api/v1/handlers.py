@@ -3,19 +3,26 @@ from django.views.decorators.csrf import csrf_exempt
 from drf_spectacular.utils import extend_schema
 from rest_framework import status
 from rest_framework.exceptions import ValidationError as DRFValidationError
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import (
+    AllowAny,
+    IsAuthenticated,
+)
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from rest_framework_simplejwt.exceptions import TokenError
 
 from core.api.schemas.response_schemas import ApiResponse
 from core.api.utils.response_builder import build_api_response
 from core.apps.common.exceptions.base_exception import ServiceException
+from core.apps.user.revocation import get_revocation_store
 from core.apps.user.serializers import (
+    LogoutSerializer,
     UserRegistrationSerializer,
     UserSerializer,
 )
 from core.apps.user.services.base_user_service import BaseUserService
+from core.apps.user.tokens import EntitlementRefreshToken
 from core.project.containers import get_container
 
 
@@ -82,6 +89,76 @@ class RegisterUserView(APIView):
             )
 
 
+@method_decorator(csrf_exempt, name="dispatch")
+class LogoutView(APIView):
+    # Выйти может и неактивированный пользователь.
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        summary="Выход",
+        description="Отзывает текущий access-токен и, если передан, refresh-токен.",
+        request=LogoutSerializer,
+        responses={
+            200: ApiResponse[None],
+            400: ApiResponse[None],
+            503: ApiResponse[None],
+        },
+        tags=["v1"],
+        operation_id="logout",
+    )
+    def post(
+        self,
+        request: Request,
+    ) -> Response:
+        serializer = LogoutSerializer(data=request.data)
+
+        try:
+            serializer.is_valid(raise_exception=True)
+
+            tokens = [request.auth] if request.auth is not None else []
+            if serializer.validated_data.get("refresh"):
+                refresh = EntitlementRefreshToken(serializer.validated_data["refresh"])
+                if str(refresh.get("user_id")) != str(request.user.id):
+                    return build_api_response(
+                        message="Refresh-токен выдан другому пользователю.",
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                    )
+                tokens.append(refresh)
+
+            store = get_revocation_store()
+            for token in tokens:
+                store.revoke_token(token)
+
+            return build_api_response(
+                message="Вы вышли из системы.",
+                status_code=status.HTTP_200_OK,
+            )
+        except DRFValidationError as e:
+            return build_api_response(
+                message="Ошибка валидации входящих данных",
+                status_code=status.HTTP_400_BAD_REQUEST,
+                errors=e.detail,
+            )
+        except TokenError as e:
+            return build_api_response(
+                message="Некорректный refresh-токен.",
+                status_code=status.HTTP_400_BAD_REQUEST,
+                errors=[{"detail": str(e)}],
+            )
+        except ServiceException as e:
+            return build_api_response(
+                message=e.detail,
+                status_code=e.status_code,
+                errors=[{"detail": str(e)}],
+            )
+        except Exception as e:
+            return build_api_response(
+                message=f"Непредвиденная ошибка при обработке запроса: {e}",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                errors=[{"detail": str(e)}],
+            )
+
+
 # class ActivateUserAPIView(APIView):
 #     permission_classes = [IsBotApiKeyAuthenticated]
 
@@ -21,6 +21,10 @@ from core.api.schemas.response_schemas import (
     ApiResponse,
     ListResponsePayload,
 )
+from core.api.utils.idempotency import (
+    IDEMPOTENCY_KEY_PARAMETER,
+    idempotent,
+)
 from core.api.utils.response_builder import build_api_response
 from core.api.v1.products.schemas.filters import OrderFilter
 from core.api.v1.products.schemas.schemas import OrderCreate
@@ -33,7 +37,6 @@ from core.apps.products.serializers import (
     UserOrderSerializer,
 )
 from core.apps.products.services.order_service import OrderBaseService
-from core.apps.products.tasks import send_order_creation_telegram_message
 from core.project.containers import get_container
 from core.project.permissions import (
     IsAdminUser,
@@ -143,6 +146,7 @@ class OrderListCreateView(APIView):
     @extend_schema(
         summary="Создать новый заказ",
         description="Создаёт новый заказ с предоставленными данными.",
+        parameters=[IDEMPOTENCY_KEY_PARAMETER],
         request=OrderCreate,
         responses={
             201: AdminOrderSerializer,
@@ -151,6 +155,7 @@ class OrderListCreateView(APIView):
         },
         operation_id="create_order",
     )
+    @idempotent("orders.create")
     def post(
         self,
         request: Request,
@@ -190,10 +195,6 @@ class OrderListCreateView(APIView):
             else:
                 serializer = UserOrderSerializer(order)
 
-            user = order.user
-
-            send_order_creation_telegram_message.delay(telegram_id=user.telegram_id)
-
             return build_api_response(
                 message="Заказ успешно создан",
                 status_code=status.HTTP_201_CREATED,
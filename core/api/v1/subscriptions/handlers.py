@@ -23,6 +23,10 @@ from core.api.schemas.response_schemas import (
     ApiResponse,
     ListResponsePayload,
 )
+from core.api.utils.idempotency import (
+    IDEMPOTENCY_KEY_PARAMETER,
+    idempotent,
+)
 from core.api.utils.response_builder import build_api_response
 from core.api.v1.subscriptions.schemas.filters import SubscriptionFilter
 from core.api.v1.subscriptions.schemas.schemas import SubscriptionCreate
@@ -133,6 +137,7 @@ class SubscriptionsListCreateView(APIView):
     @extend_schema(
         summary="Создать новую подписку",
         description="Создаёт новую подписку с предоставленными данными.",
+        parameters=[IDEMPOTENCY_KEY_PARAMETER],
         request=SubscriptionCreate,
         responses={
             201: SubscriptionSerializer,
@@ -142,6 +147,7 @@ class SubscriptionsListCreateView(APIView):
         tags=["Subscriptions"],
         operation_id="create_subscription",
     )
+    @idempotent("subscriptions.create")
     def post(
         self,
         request: Request,
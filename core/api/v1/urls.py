@@ -8,7 +8,10 @@ from rest_framework_simplejwt.views import (
     TokenVerifyView,
 )
 
-from core.api.v1.handlers import RegisterUserView
+from core.api.v1.handlers import (
+    LogoutView,
+    RegisterUserView,
+)
 
 
 app_name = "v1"
@@ -29,6 +32,11 @@ urlpatterns = [
         TokenRefreshView.as_view(),
         name="token_refresh",
     ),
+    path(
+        "v1/logout/",
+        LogoutView.as_view(),
+        name="logout",
+    ),
     path(
         "v1/login/verify/",
         TokenVerifyView.as_view(),
@@ -46,6 +54,10 @@ urlpatterns = [
         "v1/subscriptions/",
         include("core.api.v1.subscriptions.urls"),
     ),
+    path(
+        "v1/broadcasts/",
+        include("core.api.v1.broadcasts.urls"),
+    ),
     path(
         "v1/orders/",
         include("core.api.v1.products.urls"),
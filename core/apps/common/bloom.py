@@ -0,0 +1,43 @@
+import hashlib
+import math
+from typing import Iterable
+
+
+class BloomFilter:
+    """
+    Фильтр Блума: множество строк с ложноположительными, но без ложноотрицательных ответов.
+
+    Не зависит от Django. Размер битового массива и число хешей подбираются по ожидаемому
+    числу элементов `capacity` и доле ложноположительных ответов `error_rate`; позиции
+    считаются двойным хешированием одного дайджеста blake2b.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        capacity = max(capacity, 1)
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    @classmethod
+    def from_items(cls, items: Iterable[str], capacity: int, error_rate: float = 0.001) -> "BloomFilter":
+        items = list(items)
+        # Переполненный фильтр быстро теряет точность, поэтому ёмкость растёт вместе с данными.
+        bloom = cls(max(capacity, 2 * len(items)), error_rate)
+        for item in items:
+            bloom.add(item)
+        return bloom
+
+    def _positions(self, item: str) -> Iterable[int]:
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return ((first + index * second) % self.size for index in range(self.hash_count))
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
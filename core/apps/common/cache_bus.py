@@ -0,0 +1,199 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import (
+    Callable,
+    Dict,
+    List,
+    Optional,
+)
+
+import redis
+import redis.asyncio as aioredis
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHANNEL = "cache-invalidation"
+RECONNECT_DELAY_SECONDS = 1.0
+PUBLISH_TIMEOUT_SECONDS = 0.5
+
+USER_ENTITY = "user"
+ENTITLEMENT_ENTITY = "entitlement"
+REVOCATION_ENTITY = "revocation"
+
+EvictCallback = Callable[[Optional[str]], None]
+
+
+def encode_event(entity: str, key: str) -> str:
+    """Кодирует событие инвалидации в компактную строку вида `user:<uuid>`."""
+    return f"{entity}:{key}"
+
+
+def decode_event(raw: str | bytes) -> tuple[str, str] | None:
+    """Разбирает событие инвалидации. Возвращает (entity, key) или None для мусора."""
+    if isinstance(raw, bytes):
+        raw = raw.decode()
+    entity, sep, key = raw.partition(":")
+    if not sep or not entity or not key:
+        return None
+    return entity, key
+
+
+class CacheInvalidationBus:
+    """
+    Шина инвалидации кэшей между процессами (Django, Celery, Telegram-бот) поверх Redis pub/sub.
+
+    Не зависит от Django: бот использует тот же класс, что и сервисы приложения.
+    Локальные кэши регистрируют колбэк через `subscribe`; колбэк получает ключ
+    сущности или None, если нужно сбросить кэш целиком (после переподключения
+    к Redis часть событий могла быть потеряна).
+    """
+
+    def __init__(self, redis_url: str, channel: str = DEFAULT_CHANNEL):
+        self.redis_url = redis_url
+        self.channel = channel
+        self._callbacks: Dict[str, List[EvictCallback]] = defaultdict(list)
+        self._lock = threading.Lock()
+        self._client: redis.Redis | None = None
+        self._async_client: aioredis.Redis | None = None
+        self._listener: threading.Thread | None = None
+
+    def _get_client(self) -> redis.Redis:
+        if self._client is None:
+            self._client = redis.Redis.from_url(
+                self.redis_url,
+                socket_timeout=PUBLISH_TIMEOUT_SECONDS,
+                socket_connect_timeout=PUBLISH_TIMEOUT_SECONDS,
+            )
+        return self._client
+
+    def publish(self, entity: str, key: str) -> None:
+        """Публикует событие инвалидации. Ошибки Redis логируются и не пробрасываются."""
+        self.dispatch(encode_event(entity, key))
+        try:
+            self._get_client().publish(self.channel, encode_event(entity, key))
+        except redis.RedisError as e:
+            logger.warning("Не удалось опубликовать событие инвалидации %s:%s: %s", entity, key, e)
+
+    async def publish_async(self, entity: str, key: str) -> None:
+        """Асинхронный вариант `publish` для aiogram-обработчиков."""
+        self.dispatch(encode_event(entity, key))
+        if self._async_client is None:
+            self._async_client = aioredis.from_url(
+                self.redis_url,
+                socket_timeout=PUBLISH_TIMEOUT_SECONDS,
+                socket_connect_timeout=PUBLISH_TIMEOUT_SECONDS,
+            )
+        try:
+            await self._async_client.publish(self.channel, encode_event(entity, key))
+        except redis.RedisError as e:
+            logger.warning("Не удалось опубликовать событие инвалидации %s:%s: %s", entity, key, e)
+
+    def subscribe(self, entity: str, callback: EvictCallback) -> None:
+        """
+        Регистрирует колбэк локального кэша для сущности.
+
+        Фоновый поток-слушатель запускается лениво при первой подписке, поэтому
+        процессы без локальных кэшей не держат соединение с Redis.
+        """
+        with self._lock:
+            self._callbacks[entity].append(callback)
+        self.start_listener()
+
+    def dispatch(self, raw: str | bytes) -> None:
+        """Передаёт событие всем колбэкам соответствующей сущности."""
+        event = decode_event(raw)
+        if event is None:
+            logger.debug("Пропущено некорректное событие инвалидации: %r", raw)
+            return
+
+        entity, key = event
+        for callback in list(self._callbacks.get(entity, ())):
+            try:
+                callback(key)
+            except Exception:
+                logger.exception("Ошибка в колбэке инвалидации для %s", entity)
+
+    def flush_all(self) -> None:
+        """Сбрасывает все зарегистрированные локальные кэши."""
+        for callbacks in list(self._callbacks.values()):
+            for callback in list(callbacks):
+                try:
+                    callback(None)
+                except Exception:
+                    logger.exception("Ошибка при полном сбросе локального кэша")
+
+    def start_listener(self) -> None:
+        """Запускает поток-слушатель в текущем процессе, если он ещё не запущен."""
+        with self._lock:
+            if self._listener is not None and self._listener.is_alive():
+                return
+            self._listener = threading.Thread(
+                target=self._listen_forever,
+                name="cache-invalidation-listener",
+                daemon=True,
+            )
+            self._listener.start()
+
+    def reset_after_fork(self) -> None:
+        """Сбрасывает соединение и поток, унаследованные от родителя после fork (prefork-воркеры Celery)."""
+        self._client = None
+        self._listener = None
+        if self._callbacks:
+            self.start_listener()
+
+    def _listen_forever(self) -> None:
+        while True:
+            client = redis.Redis.from_url(self.redis_url)
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.subscribe(self.channel)
+                # Пока соединения не было, события могли потеряться.
+                self.flush_all()
+                for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self._dispatch_safely(message["data"])
+            except redis.RedisError as e:
+                logger.warning("Слушатель шины инвалидации потерял соединение с Redis: %s", e)
+                time.sleep(RECONNECT_DELAY_SECONDS)
+            except Exception:
+                logger.exception("Ошибка в слушателе шины инвалидации, переподключение")
+                time.sleep(RECONNECT_DELAY_SECONDS)
+            finally:
+                pubsub.close()
+                client.close()
+
+    def _dispatch_safely(self, raw: str | bytes) -> None:
+        """`dispatch` для слушателей: ошибка обработки одного события не должна останавливать поток."""
+        try:
+            self.dispatch(raw)
+        except Exception:
+            logger.exception("Ошибка при обработке события инвалидации %r", raw)
+
+    async def listen_async(self) -> None:
+        """Асинхронный слушатель для процесса бота (запускается отдельной задачей)."""
+        while True:
+            client = aioredis.from_url(self.redis_url)
+            try:
+                async with client.pubsub(ignore_subscribe_messages=True) as pubsub:
+                    await pubsub.subscribe(self.channel)
+                    self.flush_all()
+                    async for message in pubsub.listen():
+                        if message.get("type") == "message":
+                            self._dispatch_safely(message["data"])
+            except redis.RedisError as e:
+                logger.warning("Слушатель шины инвалидации потерял соединение с Redis: %s", e)
+                await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+            except Exception:
+                # Задача работает в asyncio.gather вместе с ботом: исключение остановило бы и бота.
+                # CancelledError не наследует Exception, поэтому отмена задачи по-прежнему проходит.
+                logger.exception("Ошибка в слушателе шины инвалидации, переподключение")
+                await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+            finally:
+                try:
+                    await client.aclose()
+                except Exception as e:
+                    logger.warning("Не удалось закрыть соединение слушателя шины инвалидации: %s", e)
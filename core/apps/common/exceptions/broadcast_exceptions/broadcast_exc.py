@@ -0,0 +1,24 @@
+import uuid
+
+from rest_framework import status
+
+from core.apps.common.exceptions.base_exception import ServiceException
+
+
+class BroadcastCreationError(ServiceException):
+    status_code = status.HTTP_400_BAD_REQUEST
+    default_detail = "Произошла ошибка при создании рассылки."
+
+    def __init__(self, detail=None, code=None):
+        super().__init__(detail=detail or self.default_detail, code=code)
+
+
+class BroadcastNotFoundException(ServiceException):
+    status_code = status.HTTP_404_NOT_FOUND
+    default_detail = "Рассылка не найдена."
+
+    def __init__(self, broadcast_id: uuid.UUID = None):
+        detail = self.default_detail
+        if broadcast_id:
+            detail = f"Рассылка с ID '{broadcast_id}' не найдена."
+        super().__init__(detail=detail, code="broadcast_not_found")
@@ -0,0 +1,23 @@
+from rest_framework import status
+
+from core.apps.common.exceptions.base_exception import ServiceException
+
+
+class DatabaseTimeoutException(ServiceException):
+    """Исключение: Postgres отменил запрос по statement_timeout."""
+
+    status_code = status.HTTP_504_GATEWAY_TIMEOUT
+    default_detail = "Запрос к базе данных выполнялся слишком долго."
+
+    def __init__(self, detail=None, code=None):
+        super().__init__(detail=detail or self.default_detail, code=code or "statement_timeout")
+
+
+class DatabaseOverloadedException(DatabaseTimeoutException):
+    """Исключение: запрос к базе данных отменён, потому что истёк срок выполнения HTTP-запроса."""
+
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Сервис перегружен. Повторите попытку позже."
+
+    def __init__(self, detail=None, code=None):
+        super().__init__(detail=detail, code=code or "request_deadline_exceeded")
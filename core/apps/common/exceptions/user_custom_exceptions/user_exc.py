@@ -60,6 +60,16 @@ class UserCreationError(ServiceException):
         super().__init__(detail=detail or self.default_detail, code=code)
 
 
+class UserPhoneExistsError(ServiceException):
+    """Исключение: Номер телефона уже принадлежит другому пользователю."""
+
+    status_code = status.HTTP_400_BAD_REQUEST
+    default_detail = "Пользователь с таким номером телефона уже существует."
+
+    def __init__(self, detail=None, code=None):
+        super().__init__(detail=detail or self.default_detail, code=code or "user_phone_exists")
+
+
 class EmptyUpdateDataError(ServiceException):
     """Исключение: Нет данных для обновления пользователя."""
 
@@ -113,3 +123,13 @@ class UserExistsError(Exception):
             self.message = f"Пользователь с номером телефона '{phone}' уже привязан к другому аккаунту Telegram."
         else:
             self.message = message
+
+
+class TokenRevocationError(ServiceException):
+    """Исключение: Не удалось отозвать токен (хранилище отзыва недоступно)."""
+
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Не удалось отозвать токен, попробуйте позже."
+
+    def __init__(self, detail=None, code=None):
+        super().__init__(detail=detail or self.default_detail, code=code or "token_revocation_failed")
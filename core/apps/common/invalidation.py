@@ -0,0 +1,24 @@
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import transaction
+
+from core.apps.common.cache_bus import CacheInvalidationBus
+
+
+@lru_cache(1)
+def get_cache_bus() -> CacheInvalidationBus:
+    return CacheInvalidationBus(
+        redis_url=settings.CACHE_INVALIDATION_REDIS_URL,
+        channel=settings.CACHE_INVALIDATION_CHANNEL,
+    )
+
+
+def invalidate_on_commit(entity: str, key) -> None:
+    """
+    Публикует событие инвалидации после фиксации текущей транзакции.
+
+    Вне транзакции событие публикуется сразу. Если транзакция откатится,
+    событие не будет отправлено и кэши останутся согласованными с БД.
+    """
+    transaction.on_commit(lambda: get_cache_bus().publish(entity, str(key)))
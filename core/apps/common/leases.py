@@ -0,0 +1,71 @@
+"""
+Аренда фоновых задач, возобновляемых по контрольным точкам (рассылки, массовые операции).
+
+Celery с `acks_late` может выдать задачу повторно, пока первая копия ещё выполняется
+(истёк visibility_timeout брокера или задачу поставили в очередь дважды). Запуск захватывает
+запись условным UPDATE статуса, каждая контрольная точка продлевает аренду в поле
+`heartbeat_at`, поэтому вторая копия выходит без работы. Аренда, которую не продлевали
+дольше `timeout`, считается брошенной (воркер упал) и может быть захвачена заново.
+
+Модель должна иметь поля `status` и `heartbeat_at` и константы STATUS_QUEUED,
+STATUS_RUNNING, STATUS_FAILED.
+"""
+
+import datetime
+from typing import Type
+
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+
+class LeaseLost(Exception):
+    """Аренду перехватил другой воркер: продолжать выполнение нельзя."""
+
+
+class Lease:
+    def __init__(self, model: Type[models.Model], pk, heartbeat_at: datetime.datetime):
+        self.model = model
+        self.pk = pk
+        self.heartbeat_at = heartbeat_at
+
+    def _owned(self) -> models.QuerySet:
+        return self.model._base_manager.filter(
+            pk=self.pk,
+            status=self.model.STATUS_RUNNING,
+            heartbeat_at=self.heartbeat_at,
+        )
+
+    def renew(self, **values) -> None:
+        """
+        Продлевает аренду, сохраняя `values` тем же UPDATE.
+
+        Raises:
+            LeaseLost: Если запись уже захвачена другим воркером.
+        """
+        now = timezone.now()
+        if not self._owned().update(heartbeat_at=now, **values):
+            raise LeaseLost()
+        self.heartbeat_at = now
+
+    def release(self, status: str, **values) -> bool:
+        """Освобождает аренду, переводя запись в `status`. Возвращает False, если аренда уже потеряна."""
+        return bool(self._owned().update(status=status, heartbeat_at=None, **values))
+
+
+def claim_lease(model: Type[models.Model], pk, timeout: datetime.timedelta, **values) -> Lease | None:
+    """
+    Захватывает запись в очереди, упавшую или с брошенной арендой; `values` сохраняются тем же UPDATE.
+
+    Returns:
+        Lease | None: Аренда или None, если запись выполняется другим воркером или уже завершена.
+    """
+    now = timezone.now()
+    abandoned = Q(heartbeat_at__isnull=True) | Q(heartbeat_at__lt=now - timeout)
+    claimable = Q(status__in=[model.STATUS_QUEUED, model.STATUS_FAILED]) | Q(abandoned, status=model.STATUS_RUNNING)
+    claimed = model._base_manager.filter(claimable, pk=pk).update(
+        status=model.STATUS_RUNNING,
+        heartbeat_at=now,
+        **values,
+    )
+    return Lease(model, pk, now) if claimed else None
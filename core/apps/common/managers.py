@@ -1,7 +1,19 @@
-from django.db import models
+from typing import (
+    Callable,
+    Sequence,
+)
+
+from django.db import (
+    models,
+    transaction,
+)
 from django.utils import timezone
 
 
+# Колбэк прогресса массовых операций: (обработано ключей в пачке, обновлено строк в пачке).
+ProgressCallback = Callable[[int, int], None]
+
+
 class GetOrNoneQuerySet(models.QuerySet):
     def get_or_none(self, **kwargs):
         try:
@@ -25,6 +37,31 @@ class IsDeletedQuerySet(GetOrNoneQuerySet):
         else:
             return self.update(is_deleted=True, deleted_at=timezone.now())
 
+    def update_in_chunks(
+        self,
+        pks: Sequence,
+        chunk_size: int = 1000,
+        on_chunk: Callable[[Sequence, int], None] | None = None,
+        **values,
+    ) -> int:
+        """
+        Выполняет `UPDATE ... WHERE id IN (...)` для строк `pks` пачками по `chunk_size`.
+
+        Каждая пачка — один запрос в своей транзакции, поэтому блокировки строк не держатся
+        на всё время операции. После UPDATE вызывает `on_chunk(ключи пачки, число обновлённых строк)`
+        в транзакции пачки: запись колбэка фиксируется вместе с пачкой, а его исключение
+        откатывает пачку и прерывает операцию. Возвращает общее число обновлённых строк.
+        """
+        updated_total = 0
+        for start in range(0, len(pks), chunk_size):
+            chunk = pks[start : start + chunk_size]
+            with transaction.atomic(using=self.db):
+                updated = self.filter(pk__in=chunk).update(**values)
+                if on_chunk is not None:
+                    on_chunk(chunk, updated)
+            updated_total += updated
+        return updated_total
+
 
 class IsDeletedManager(GetOrNoneManager):
     def get_queryset(self):
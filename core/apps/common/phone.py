@@ -0,0 +1,37 @@
+import re
+
+
+E164_MIN_DIGITS = 8
+E164_MAX_DIGITS = 15
+
+_NON_DIGITS_RE = re.compile(r"\D")
+
+
+def normalize_phone(phone_number: str | None) -> str | None:
+    """Приводит номер телефона к каноническому виду E.164 (`+79123456789`).
+
+    Модуль не зависит от Django и используется как сервисами приложения,
+    так и Telegram-ботом, чтобы обе стороны искали пользователя по одному
+    и тому же значению индексируемого поля `phone_e164`.
+
+    Args:
+        phone_number (str | None): Номер в произвольном формате (пробелы, скобки, дефисы, `00`, `8...`).
+
+    Returns:
+        str | None: Номер в формате E.164 или None, если номер не может быть нормализован.
+    """
+    if not phone_number:
+        return None
+
+    digits = _NON_DIGITS_RE.sub("", phone_number)
+
+    if digits.startswith("00"):
+        digits = digits[2:]
+
+    if len(digits) == 11 and digits.startswith("8"):
+        digits = "7" + digits[1:]
+
+    if not E164_MIN_DIGITS <= len(digits) <= E164_MAX_DIGITS or digits.startswith("0"):
+        return None
+
+    return f"+{digits}"
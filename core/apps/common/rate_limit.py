@@ -0,0 +1,133 @@
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict
+
+import redis
+
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+# После ошибки Redis столько секунд решения принимает локальный ограничитель,
+# чтобы не платить таймаутом соединения за каждый запрос.
+REDIS_RETRY_DELAY_SECONDS = 5.0
+
+# GCRA (generic cell rate algorithm): в ключе хранится теоретическое время прихода (TAT)
+# следующего запроса в миллисекундах. Время берётся у Redis, поэтому часы процессов не важны.
+# Возвращает {разрешён, осталось, до полного восстановления (мс), повторить через (мс)}.
+GCRA_SCRIPT = """
+local interval = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local clock = redis.call("TIME")
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+local tat = tonumber(redis.call("GET", KEYS[1])) or now
+if tat < now then
+    tat = now
+end
+local new_tat = tat + interval
+local wait = new_tat - now - period
+if wait > 0 then
+    return {0, 0, math.ceil(tat - now), math.ceil(wait)}
+end
+redis.call("SET", KEYS[1], math.ceil(new_tat), "PX", math.ceil(new_tat - now))
+return {1, math.floor((period - (new_tat - now)) / interval), math.ceil(new_tat - now), 0}
+"""
+
+
+@dataclass(frozen=True)
+class Rate:
+    """Не больше `limit` запросов за `period` секунд; весь лимит можно израсходовать сразу."""
+
+    limit: int
+    period: int
+
+    @classmethod
+    def parse(cls, value: str) -> "Rate":
+        """Разбирает строку вида `100/m` (s, m, h, d; допускается `100/5m`)."""
+        limit, _, period = value.partition("/")
+        unit = period[-1:]
+        if unit not in PERIODS or not limit.isdigit() or int(limit) < 1:
+            raise ValueError(f"Некорректный лимит запросов: {value!r}")
+        multiplier = int(period[:-1]) if period[:-1] else 1
+        return cls(limit=int(limit), period=multiplier * PERIODS[unit])
+
+    @property
+    def interval_ms(self) -> float:
+        return self.period * 1000 / self.limit
+
+    @property
+    def policy(self) -> str:
+        """Значение заголовка RateLimit-Policy."""
+        return f"{self.limit};w={self.period}"
+
+
+@dataclass
+class RateLimitDecision:
+    allowed: bool
+    limit: int
+    remaining: int
+    reset: float
+    retry_after: float = 0.0
+
+
+class LocalGCRA:
+    """
+    GCRA в памяти процесса: запасной вариант, пока Redis недоступен.
+
+    Лимит при этом действует на каждый процесс отдельно, то есть суммарно он мягче.
+    Не зависит от Django.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._tats: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, rate: Rate) -> RateLimitDecision:
+        now = time.monotonic() * 1000
+        period_ms = rate.period * 1000
+        with self._lock:
+            tat = max(self._tats.get(key, now), now)
+            new_tat = tat + rate.interval_ms
+            wait = new_tat - now - period_ms
+            if wait > 0:
+                return RateLimitDecision(False, rate.limit, 0, (tat - now) / 1000, wait / 1000)
+            if len(self._tats) >= self.max_keys:
+                self._tats = {k: v for k, v in self._tats.items() if v > now}
+            self._tats[key] = new_tat
+        remaining = math.floor((period_ms - (new_tat - now)) / rate.interval_ms)
+        return RateLimitDecision(True, rate.limit, remaining, (new_tat - now) / 1000)
+
+
+class RedisGCRA:
+    """
+    Общий для всех процессов ограничитель на атомарном Lua-скрипте GCRA.
+
+    Один ключ Redis на клиента, без списков отметок времени. При ошибке Redis решение
+    принимает `LocalGCRA`, а обращения к Redis возобновляются через REDIS_RETRY_DELAY_SECONDS.
+    Не зависит от Django.
+    """
+
+    def __init__(self, redis_url: str, key_prefix: str = "ratelimit", timeout: float = 0.2):
+        self.client = redis.Redis.from_url(redis_url, socket_timeout=timeout, socket_connect_timeout=timeout)
+        self.key_prefix = key_prefix
+        self.fallback = LocalGCRA()
+        self._script = self.client.register_script(GCRA_SCRIPT)
+        self._redis_down_until = 0.0
+
+    def hit(self, key: str, rate: Rate) -> RateLimitDecision:
+        if time.monotonic() < self._redis_down_until:
+            return self.fallback.hit(key, rate)
+        try:
+            allowed, remaining, reset_ms, retry_ms = self._script(
+                keys=[f"{self.key_prefix}:{key}"], args=[rate.interval_ms, rate.period * 1000]
+            )
+        except redis.RedisError as e:
+            logger.warning("Ограничитель запросов переходит на локальный режим, Redis недоступен: %s", e)
+            self._redis_down_until = time.monotonic() + REDIS_RETRY_DELAY_SECONDS
+            return self.fallback.hit(key, rate)
+        return RateLimitDecision(bool(allowed), rate.limit, int(remaining), reset_ms / 1000, retry_ms / 1000)
@@ -0,0 +1,90 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import (
+    dataclass,
+    field,
+)
+
+
+DEFAULT_INTERVAL_SECONDS = 0.005
+MAX_STACK_DEPTH = 128
+
+_PATH_PREFIXES = sorted({os.path.dirname(path) for path in sys.path if path}, key=len, reverse=True)
+
+
+def _short_path(filename: str) -> str:
+    for prefix in _PATH_PREFIXES:
+        if filename.startswith(prefix + os.sep):
+            return filename[len(prefix) + 1 :]
+    return filename
+
+
+@dataclass
+class ProfileResult:
+    samples: Counter = field(default_factory=Counter)
+    sample_count: int = 0
+    duration: float = 0.0
+    interval: float = DEFAULT_INTERVAL_SECONDS
+
+    def folded(self) -> str:
+        """Стеки в «свёрнутом» формате (`a;b;c 12`), который читают flamegraph.pl и speedscope."""
+        return "\n".join(f"{stack} {count}" for stack, count in self.samples.most_common())
+
+
+class SamplingProfiler:
+    """
+    Сэмплирующий профайлер одного потока.
+
+    Фоновый поток раз в `interval` секунд снимает стек целевого потока через
+    `sys._current_frames()` и считает одинаковые стеки. В отличие от cProfile,
+    профилируемый код не трассируется, поэтому накладные расходы почти не зависят
+    от числа вызовов функций и профайлер можно включать на живых запросах.
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL_SECONDS, max_depth: int = MAX_STACK_DEPTH):
+        self.interval = interval
+        self.max_depth = max_depth
+        self._result = ProfileResult(interval=interval)
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._target_thread_id: int | None = None
+        self._started = 0.0
+        self._labels: dict = {}
+
+    def start(self) -> None:
+        """Начинает сэмплировать поток, из которого вызван метод."""
+        self._target_thread_id = threading.get_ident()
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> ProfileResult:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._result.duration = time.perf_counter() - self._started
+        return self._result
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target_thread_id)
+            if frame is None:
+                continue
+            self._result.samples[self._collapse(frame)] += 1
+            self._result.sample_count += 1
+
+    def _collapse(self, frame) -> str:
+        stack = []
+        while frame is not None and len(stack) < self.max_depth:
+            code = frame.f_code
+            label = self._labels.get(code)
+            if label is None:
+                label = f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})".replace(";", ",")
+                self._labels[code] = label
+            stack.append(label)
+            frame = frame.f_back
+        stack.reverse()
+        return ";".join(stack)
@@ -0,0 +1,137 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import (
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
+
+import aiohttp
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_API_BASE_URL = "https://api.telegram.org"
+
+
+@dataclass
+class SendResult:
+    chat_id: int
+    ok: bool
+    latency: float = 0.0
+    error: Optional[str] = None
+
+
+class RateLimiter:
+    """
+    Асинхронный token bucket: не более `rate` операций в секунду с допустимым всплеском `burst`.
+    При rate <= 0 ограничение отключено.
+    """
+
+    def __init__(self, rate: float, burst: int | None = None):
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated: float | None = None
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            now = loop.time()
+            if self._updated is not None:
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._updated = loop.time()
+                self._tokens = 0.0
+            else:
+                self._tokens -= 1
+
+
+class AsyncTelegramSender:
+    """
+    Отправляет сообщения через Telegram Bot API с ограничением частоты и числа одновременных запросов.
+
+    Используется как асинхронный контекстный менеджер, чтобы все сообщения кампании
+    шли через один пул HTTP-соединений. Ответ 429 обрабатывается с учётом `retry_after`.
+    """
+
+    def __init__(
+        self,
+        bot_token: str,
+        api_base_url: str = DEFAULT_API_BASE_URL,
+        rate_per_second: float = 30,
+        max_concurrency: int = 20,
+        timeout: float = 10.0,
+        max_retries: int = 3,
+    ):
+        self.api_url = f"{api_base_url.rstrip('/')}/bot{bot_token}/"
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self._rate_limiter = RateLimiter(rate_per_second)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._session: aiohttp.ClientSession | None = None
+
+    async def __aenter__(self) -> "AsyncTelegramSender":
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.max_concurrency),
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        )
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _post(self, method: str, payload: dict) -> tuple[int, dict]:
+        async with self._session.post(self.api_url + method, json=payload) as response:
+            return response.status, await response.json(content_type=None)
+
+    async def send_message(self, chat_id: int, text: str) -> SendResult:
+        loop = asyncio.get_running_loop()
+        error = None
+
+        async with self._semaphore:
+            started = loop.time()
+            for _ in range(self.max_retries + 1):
+                await self._rate_limiter.acquire()
+                try:
+                    status_code, data = await self._post("sendMessage", {"chat_id": chat_id, "text": text})
+                except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                    error = f"HTTP error: {e!r}"
+                    continue
+
+                if status_code == 429:
+                    retry_after = data.get("parameters", {}).get("retry_after", 1)
+                    error = f"Rate limited, retry after {retry_after}s"
+                    await asyncio.sleep(retry_after)
+                    continue
+
+                if status_code >= 500:
+                    error = f"Telegram API {status_code}"
+                    continue
+
+                if data.get("ok"):
+                    return SendResult(chat_id=chat_id, ok=True, latency=loop.time() - started)
+                return SendResult(
+                    chat_id=chat_id,
+                    ok=False,
+                    latency=loop.time() - started,
+                    error=data.get("description", "Неизвестная ошибка"),
+                )
+
+        return SendResult(chat_id=chat_id, ok=False, latency=loop.time() - started, error=error)
+
+    async def send_many(self, messages: Iterable[Tuple[int, str]]) -> List[SendResult]:
+        """Отправляет пачку сообщений (chat_id, text) конкурентно, сохраняя порядок результатов."""
+        return await asyncio.gather(*(self.send_message(chat_id, text) for chat_id, text in messages))
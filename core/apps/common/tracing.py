@@ -0,0 +1,173 @@
+"""
+Распределённая трассировка (OpenTelemetry), общая для Django, Celery и Telegram-бота.
+
+Модуль не зависит от Django. Пока `configure_tracing` не вызван, трассировщик
+OpenTelemetry работает в режиме no-op, и обёртки из этого модуля ничего не стоят.
+"""
+
+import functools
+import inspect
+import json
+import logging
+import threading
+from contextlib import contextmanager
+from typing import (
+    Any,
+    Callable,
+    Iterator,
+    Mapping,
+    MutableMapping,
+)
+
+from opentelemetry import (
+    context as otel_context,
+    propagate,
+    trace,
+)
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    ConsoleSpanExporter,
+)
+from opentelemetry.sdk.trace.sampling import (
+    ParentBased,
+    TraceIdRatioBased,
+)
+from opentelemetry.trace import (
+    SpanKind,
+    Status,
+    StatusCode,
+)
+
+
+logger = logging.getLogger(__name__)
+
+TRACER_NAME = "subscriptions"
+
+EXPORTER_NONE = "none"
+EXPORTER_CONSOLE = "console"
+EXPORTER_FILE = "file"
+
+_configured_lock = threading.Lock()
+_configured = False
+
+
+def configure_tracing(
+    service_name: str,
+    exporter: str = EXPORTER_NONE,
+    file_path: str | None = None,
+    sample_ratio: float = 1.0,
+) -> bool:
+    """
+    Настраивает глобальный TracerProvider процесса. Повторные вызовы игнорируются.
+
+    Args:
+        service_name (str): Имя сервиса в трассах (`subscriptions-api`, `subscriptions-celery`, `telegram-bot`).
+        exporter (str): `console` — вывод в stdout, `file` — JSON-строки в `file_path`, `none` — трассировка выключена.
+        file_path (str | None): Путь к файлу для экспортёра `file`.
+        sample_ratio (float): Доля сэмплируемых корневых трасс; дочерние спаны следуют решению родителя.
+
+    Returns:
+        bool: True, если трассировка включена этим вызовом.
+    """
+    global _configured
+
+    if exporter == EXPORTER_NONE:
+        return False
+
+    with _configured_lock:
+        if _configured:
+            return False
+
+        if exporter == EXPORTER_CONSOLE:
+            span_exporter = ConsoleSpanExporter(service_name=service_name)
+        elif exporter == EXPORTER_FILE:
+            if not file_path:
+                raise ValueError("Для экспортёра трасс 'file' нужно указать путь к файлу")
+            span_exporter = ConsoleSpanExporter(
+                service_name=service_name,
+                out=open(file_path, "a", buffering=1, encoding="utf-8"),
+                formatter=lambda span: json.dumps(json.loads(span.to_json()), ensure_ascii=False) + "\n",
+            )
+        else:
+            raise ValueError(f"Неизвестный экспортёр трасс: {exporter}")
+
+        provider = TracerProvider(
+            resource=Resource.create({"service.name": service_name}),
+            sampler=ParentBased(TraceIdRatioBased(sample_ratio)),
+        )
+        provider.add_span_processor(BatchSpanProcessor(span_exporter))
+        trace.set_tracer_provider(provider)
+        _configured = True
+
+    logger.info("Трассировка включена: сервис %s, экспортёр %s", service_name, exporter)
+    return True
+
+
+def get_tracer() -> trace.Tracer:
+    return trace.get_tracer(TRACER_NAME)
+
+
+def inject_context(carrier: MutableMapping[str, Any]) -> MutableMapping[str, Any]:
+    """Записывает текущий контекст трассировки (W3C traceparent) в словарь заголовков."""
+    propagate.inject(carrier)
+    return carrier
+
+
+def extract_context(carrier: Mapping[str, Any] | None) -> otel_context.Context:
+    """Восстанавливает контекст трассировки из заголовков (HTTP, Celery, outbox)."""
+    return propagate.extract(carrier or {})
+
+
+@contextmanager
+def use_context(carrier: Mapping[str, Any] | None) -> Iterator[None]:
+    """Делает контекст из `carrier` текущим на время блока."""
+    token = otel_context.attach(extract_context(carrier))
+    try:
+        yield
+    finally:
+        otel_context.detach(token)
+
+
+def record_exception(span: trace.Span, exc: BaseException) -> None:
+    span.record_exception(exc)
+    span.set_status(Status(StatusCode.ERROR, str(exc)))
+
+
+def traced(name: str | None = None, kind: SpanKind = SpanKind.INTERNAL) -> Callable:
+    """Декоратор: выполняет функцию (синхронную или корутину) внутри спана `name`."""
+
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with get_tracer().start_as_current_span(span_name, kind=kind):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with get_tracer().start_as_current_span(span_name, kind=kind):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def traced_methods(cls: type) -> type:
+    """
+    Декоратор класса: оборачивает в спаны все публичные методы, объявленные в самом классе.
+
+    Имя спана — `<Класс>.<метод>`, например `OrderService.create_order`.
+    """
+    for attr_name, attr in list(vars(cls).items()):
+        if attr_name.startswith("_") or not callable(attr) or isinstance(attr, (staticmethod, classmethod, type)):
+            continue
+        setattr(cls, attr_name, traced(f"{cls.__name__}.{attr_name}")(attr))
+    return cls
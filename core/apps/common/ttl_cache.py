@@ -0,0 +1,53 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import (
+    Any,
+    Hashable,
+    Optional,
+)
+
+
+class TTLCache:
+    """
+    Локальный кэш процесса с временем жизни записей и вытеснением давно не использованных (LRU).
+
+    Не зависит от Django. Метод `evict` совместим с колбэком `CacheInvalidationBus.subscribe`:
+    ключ удаляет одну запись, None очищает кэш целиком.
+    """
+
+    def __init__(self, ttl: float, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Значение по ключу или None, если записи нет или она устарела."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def evict(self, key: Optional[Hashable]) -> None:
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
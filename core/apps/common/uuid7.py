@@ -0,0 +1,69 @@
+"""
+UUID версии 7 (RFC 9562): 48 бит времени Unix в миллисекундах, версия, 74 случайных бита.
+
+Ключи, созданные позже, больше созданных раньше, поэтому новые строки дописываются в правый
+край B-дерева первичного ключа, а не в случайную страницу, как с uuid4, и сортировка по id
+совпадает с порядком создания. Модуль не зависит от Django (его может использовать и бот).
+"""
+
+import datetime
+import os
+import random
+import threading
+import time
+import uuid
+
+
+_TIMESTAMP_MASK = (1 << 48) - 1
+_RAND_A_MASK = (1 << 12) - 1
+_RAND_B_MASK = (1 << 62) - 1
+
+_lock = threading.Lock()
+_last_timestamp_ms = 0
+_counter = 0
+
+
+def uuid7_from_parts(timestamp_ms: int, rand_a: int, rand_b: int) -> uuid.UUID:
+    """Собирает UUIDv7 из времени в миллисекундах, 12 бит `rand_a` и 62 бит `rand_b`."""
+    value = (timestamp_ms & _TIMESTAMP_MASK) << 80
+    value |= 0x7 << 76
+    value |= (rand_a & _RAND_A_MASK) << 64
+    value |= 0b10 << 62
+    value |= rand_b & _RAND_B_MASK
+    return uuid.UUID(int=value)
+
+
+def uuid7() -> uuid.UUID:
+    """
+    Новый UUIDv7 для текущего момента.
+
+    Внутри одной миллисекунды 12 бит `rand_a` работают как счётчик (метод 1 из RFC 9562),
+    поэтому ключи одного процесса строго возрастают; при переполнении счётчика время
+    сдвигается на миллисекунду вперёд.
+    """
+    global _last_timestamp_ms, _counter
+
+    with _lock:
+        timestamp_ms = time.time_ns() // 1_000_000
+        if timestamp_ms > _last_timestamp_ms:
+            _last_timestamp_ms = timestamp_ms
+            # Старший бит счётчика свободен, чтобы в миллисекунду помещалось не меньше 2048 ключей.
+            _counter = int.from_bytes(os.urandom(2), "big") & (_RAND_A_MASK >> 1)
+        else:
+            _counter += 1
+            if _counter > _RAND_A_MASK:
+                _last_timestamp_ms += 1
+                _counter = 0
+        timestamp_ms, counter = _last_timestamp_ms, _counter
+
+    return uuid7_from_parts(timestamp_ms, counter, int.from_bytes(os.urandom(8), "big"))
+
+
+def uuid7_at(moment: datetime.datetime, rng: random.Random | None = None) -> uuid.UUID:
+    """UUIDv7 для заданного момента: для переноса существующих строк и генерации тестовых данных."""
+    timestamp_ms = int(moment.timestamp() * 1000)
+    if rng is None:
+        return uuid7_from_parts(
+            timestamp_ms, int.from_bytes(os.urandom(2), "big"), int.from_bytes(os.urandom(8), "big")
+        )
+    return uuid7_from_parts(timestamp_ms, rng.getrandbits(12), rng.getrandbits(62))
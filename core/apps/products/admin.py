@@ -1,7 +1,13 @@
 from django.contrib import admin
 
+from core.apps.common.admin import (
+    AutocompleteFilter,
+    ScalableAdminMixin,
+)
+
 from .models import (
     Order,
+    OutboxMessage,
     Product,
 )
 
@@ -15,9 +21,19 @@ class ProductAdmin(admin.ModelAdmin):
 
 
 @admin.register(Order)
-class OrderAdmin(admin.ModelAdmin):
+class OrderAdmin(ScalableAdminMixin, admin.ModelAdmin):
     list_display = ("id", "user", "product", "status", "created_at")
-    list_filter = ("status", "created_at", "user", "product")
-    search_fields = ("id__contains", "description", "user__email", "product__title")
-    ordering = ("-created_at",)
+    list_filter = ("status", "created_at", ("user", AutocompleteFilter), ("product", AutocompleteFilter))
+    list_select_related = ("user", "product")
+    search_fields = ("^user__email",)
+    search_help_text = "UUID заказа или начало email пользователя"
+    ordering = ("-id",)
     raw_id_fields = ("user", "product")
+
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    list_display = ("id", "topic", "attempts", "available_at", "created_at")
+    list_filter = ("topic",)
+    readonly_fields = ("topic", "payload", "created_at")
+    ordering = ("id",)
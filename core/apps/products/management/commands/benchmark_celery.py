@@ -0,0 +1,140 @@
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+
+import redis
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.project.celery import app
+from core.project.celery_benchmark import (
+    latency_key,
+    PROBE_TASK_NAME,
+    SLOW_TASK_NAME,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Замеряет пропускную способность (задач/с) и сквозную задержку Celery на локальном Redis. "
+        "Опционально нагружает очередь массовых задач, чтобы проверить, что уведомления не голодают."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tasks", type=int, default=10_000, help="Количество задач-зондов.")
+        parser.add_argument("--concurrency", type=int, default=8, help="Процессов воркера уведомлений.")
+        parser.add_argument("--prefetch-multiplier", type=int, default=4)
+        parser.add_argument("--bulk-tasks", type=int, default=0, help="Долгих задач в очереди bulk.")
+        parser.add_argument("--bulk-duration", type=float, default=2.0, help="Длительность долгой задачи, с.")
+        parser.add_argument("--bulk-concurrency", type=int, default=2)
+        parser.add_argument(
+            "--single-queue",
+            action="store_true",
+            help="Отправлять все задачи в одну очередь (поведение до разделения очередей) для сравнения.",
+        )
+        parser.add_argument("--timeout", type=float, default=300.0)
+
+    def handle(self, *args, **options):
+        run_id = uuid.uuid4().hex
+        client = redis.Redis.from_url(settings.CELERY_BROKER_URL)
+        notifications_queue = f"benchmark-{run_id}-notifications"
+        bulk_queue = notifications_queue if options["single_queue"] else f"benchmark-{run_id}-bulk"
+
+        workers = [
+            self._start_worker(notifications_queue, options["concurrency"], options["prefetch_multiplier"]),
+        ]
+        hostnames = [self._worker_hostname(notifications_queue)]
+        if bulk_queue != notifications_queue:
+            workers.append(self._start_worker(bulk_queue, options["bulk_concurrency"], 1))
+            hostnames.append(self._worker_hostname(bulk_queue))
+
+        try:
+            self._wait_for_workers(hostnames)
+
+            for _ in range(options["bulk_tasks"]):
+                app.send_task(SLOW_TASK_NAME, kwargs={"duration": options["bulk_duration"]}, queue=bulk_queue)
+
+            started = time.perf_counter()
+            for _ in range(options["tasks"]):
+                app.send_task(
+                    PROBE_TASK_NAME,
+                    kwargs={"run_id": run_id, "published_at": time.time()},
+                    queue=notifications_queue,
+                )
+            published = time.perf_counter() - started
+
+            key = latency_key(run_id)
+            deadline = time.monotonic() + options["timeout"]
+            while client.llen(key) < options["tasks"]:
+                if time.monotonic() > deadline:
+                    self.stderr.write(f"Таймаут: выполнено {client.llen(key)} из {options['tasks']} задач")
+                    break
+                time.sleep(0.05)
+            elapsed = time.perf_counter() - started
+
+            latencies = sorted(float(value) for value in client.lrange(key, 0, -1))
+            client.delete(key)
+        finally:
+            for worker in workers:
+                worker.terminate()
+            for worker in workers:
+                worker.wait()
+
+        if not latencies:
+            self.stderr.write("Ни одна задача не выполнена")
+            return
+
+        p99 = latencies[max(0, int(len(latencies) * 0.99) - 1)]
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Задач: {len(latencies)}, публикация: {len(latencies) / published:,.0f} задач/с, "
+                f"выполнение: {len(latencies) / elapsed:,.0f} задач/с, "
+                f"задержка p50: {statistics.median(latencies) * 1000:.1f} мс, p99: {p99 * 1000:.1f} мс, "
+                f"max: {latencies[-1] * 1000:.1f} мс"
+            )
+        )
+
+    @staticmethod
+    def _start_worker(queue: str, concurrency: int, prefetch_multiplier: int) -> subprocess.Popen:
+        return subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "celery",
+                "-A",
+                "core.project",
+                "worker",
+                "-l",
+                "warning",
+                "-n",
+                Command._worker_hostname(queue),
+                "-Q",
+                queue,
+                "-c",
+                str(concurrency),
+                "--prefetch-multiplier",
+                str(prefetch_multiplier),
+                "--include",
+                "core.project.celery_benchmark",
+                "--without-gossip",
+                "--without-mingle",
+                "--without-heartbeat",
+            ]
+        )
+
+    @staticmethod
+    def _worker_hostname(queue: str) -> str:
+        return f"{queue}@{socket.gethostname()}"
+
+    @staticmethod
+    def _wait_for_workers(hostnames: list[str], timeout: float = 30.0) -> None:
+        """Ждёт ответа на ping от запущенных бенчмарком воркеров; другие воркеры брокера не учитываются."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            replies = app.control.ping(destination=hostnames, timeout=0.5) or []
+            if {hostname for reply in replies for hostname in reply} >= set(hostnames):
+                return
+        raise RuntimeError("Воркеры бенчмарка не запустились")
@@ -0,0 +1,41 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from prometheus_client import start_http_server
+
+from core.apps.products.outbox import OutboxRelay
+from core.project.tracing import setup_tracing
+
+
+class Command(BaseCommand):
+    help = "Запускает ретранслятор транзакционного outbox: переносит события из БД в Celery."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=settings.OUTBOX_RELAY_BATCH_SIZE)
+        parser.add_argument("--poll-interval", type=float, default=settings.OUTBOX_RELAY_POLL_INTERVAL)
+        parser.add_argument(
+            "--metrics-port",
+            type=int,
+            default=settings.OUTBOX_RELAY_METRICS_PORT,
+            help="Порт HTTP-сервера метрик Prometheus (0 — не запускать).",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Обработать накопившиеся сообщения и завершиться.",
+        )
+
+    def handle(self, *args, **options):
+        setup_tracing()
+        relay = OutboxRelay(batch_size=options["batch_size"], max_attempts=settings.OUTBOX_MAX_ATTEMPTS)
+
+        if options["once"]:
+            total = 0
+            while selected := relay.drain_batch():
+                total += selected
+            self.stdout.write(self.style.SUCCESS(f"Обработано сообщений outbox: {total}"))
+            return
+
+        if options["metrics_port"]:
+            start_http_server(options["metrics_port"])
+        self.stdout.write(f"Ретранслятор outbox запущен (пачка {options['batch_size']})")
+        relay.run_forever(poll_interval=options["poll_interval"])
@@ -0,0 +1,38 @@
+# Generated by Django 5.2 on 2026-10-19 09:56
+
+import django.utils.timezone
+from django.db import (
+    migrations,
+    models,
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OutboxMessage",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("topic", models.CharField(max_length=100, verbose_name="Тип события")),
+                ("payload", models.JSONField(default=dict, verbose_name="Данные события")),
+                ("attempts", models.PositiveIntegerField(default=0, verbose_name="Попыток обработки")),
+                (
+                    "available_at",
+                    models.DateTimeField(default=django.utils.timezone.now, verbose_name="Доступно для обработки с"),
+                ),
+                ("last_error", models.TextField(blank=True, null=True, verbose_name="Последняя ошибка")),
+                ("created_at", models.DateTimeField(auto_now_add=True, verbose_name="Дата создания")),
+            ],
+            options={
+                "verbose_name": "Сообщение outbox",
+                "verbose_name_plural": "Сообщения outbox",
+                "db_table": "outbox_messages",
+                "ordering": ("id",),
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2 on 2026-10-19 10:02
+
+from django.db import (
+    migrations,
+    models,
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0002_outboxmessage"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="outboxmessage",
+            name="trace_context",
+            field=models.JSONField(blank=True, default=dict, verbose_name="Контекст трассировки"),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2 on 2026-10-19 10:11
+
+from django.conf import settings
+from django.db import (
+    migrations,
+    models,
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0003_outboxmessage_trace_context"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(fields=["-created_at"], name="order_created_at_idx"),
+        ),
+    ]
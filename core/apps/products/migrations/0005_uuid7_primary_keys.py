@@ -0,0 +1,36 @@
+# Generated by Django 5.2 on 2026-10-19 10:15
+
+from django.db import (
+    migrations,
+    models,
+)
+
+import core.apps.common.uuid7
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0004_order_created_at_idx"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="order",
+            options={"ordering": ("-id",), "verbose_name": "Заказ", "verbose_name_plural": "Заказы"},
+        ),
+        migrations.AlterField(
+            model_name="order",
+            name="id",
+            field=models.UUIDField(
+                default=core.apps.common.uuid7.uuid7, editable=False, primary_key=True, serialize=False, unique=True
+            ),
+        ),
+        migrations.AlterField(
+            model_name="product",
+            name="id",
+            field=models.UUIDField(
+                default=core.apps.common.uuid7.uuid7, editable=False, primary_key=True, serialize=False, unique=True
+            ),
+        ),
+    ]
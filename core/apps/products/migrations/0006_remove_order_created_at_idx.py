@@ -0,0 +1,19 @@
+from django.contrib.postgres.operations import RemoveIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # Индекс был нужен только для сортировки по -created_at, которую заменила сортировка по ключу UUIDv7.
+    # DROP INDEX CONCURRENTLY не блокирует запись в orders и не выполняется в транзакции.
+    atomic = False
+
+    dependencies = [
+        ("products", "0005_uuid7_primary_keys"),
+    ]
+
+    operations = [
+        RemoveIndexConcurrently(
+            model_name="order",
+            name="order_created_at_idx",
+        ),
+    ]
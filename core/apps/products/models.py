@@ -1,14 +1,14 @@
-import uuid
-
 from django.db import models
+from django.utils import timezone
 
 from core.apps.common.models import TimedBaseModel
+from core.apps.common.uuid7 import uuid7
 
 
 class Product(TimedBaseModel):
     id = models.UUIDField(
         unique=True,
-        default=uuid.uuid4,
+        default=uuid7,
         editable=False,
         primary_key=True,
     )
@@ -42,7 +42,7 @@ class Product(TimedBaseModel):
 class Order(TimedBaseModel):
     id = models.UUIDField(
         unique=True,
-        default=uuid.uuid4,
+        default=uuid7,
         editable=False,
         primary_key=True,
     )
@@ -74,7 +74,61 @@ class Order(TimedBaseModel):
         db_table = "orders"
         verbose_name = "Заказ"
         verbose_name_plural = "Заказы"
-        ordering = ("-created_at",)
+        # Ключ UUIDv7 упорядочен по времени создания: «сначала новые» читается обратным проходом по PK.
+        ordering = ("-id",)
 
     def __str__(self):
         return f"Order {self.id} for {self.product.title} by {self.user.id}, {self.user.email} - Status: {self.status}"
+
+
+class OutboxMessage(models.Model):
+    """
+    Запись транзакционного outbox: побочный эффект, который нужно выполнить после фиксации транзакции.
+
+    Сообщение пишется в той же транзакции, что и бизнес-данные, и выполняется
+    фоновым ретранслятором (`run_outbox_relay`), поэтому задача никогда не
+    стартует раньше коммита и не теряется при недоступности брокера.
+    """
+
+    id = models.BigAutoField(
+        primary_key=True,
+    )
+    topic = models.CharField(
+        max_length=100,
+        verbose_name="Тип события",
+    )
+    payload = models.JSONField(
+        default=dict,
+        verbose_name="Данные события",
+    )
+    trace_context = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name="Контекст трассировки",
+    )
+    attempts = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Попыток обработки",
+    )
+    available_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name="Доступно для обработки с",
+    )
+    last_error = models.TextField(
+        null=True,
+        blank=True,
+        verbose_name="Последняя ошибка",
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Дата создания",
+    )
+
+    class Meta:
+        db_table = "outbox_messages"
+        verbose_name = "Сообщение outbox"
+        verbose_name_plural = "Сообщения outbox"
+        ordering = ("id",)
+
+    def __str__(self):
+        return f"Outbox {self.id} ({self.topic})"
@@ -0,0 +1,173 @@
+import datetime
+import logging
+import time
+import uuid
+from collections import defaultdict
+from typing import (
+    Callable,
+    Dict,
+    List,
+)
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from core.apps.common.tracing import (
+    inject_context,
+    use_context,
+)
+from core.apps.products.models import OutboxMessage
+from core.apps.products.tasks import send_order_creation_telegram_message
+from core.apps.user.models import User
+
+
+logger = logging.getLogger(__name__)
+
+ORDER_CREATED_TOPIC = "order.created"
+
+# Обработчик возвращает ошибки отдельных сообщений: {id сообщения: текст ошибки}.
+OutboxHandler = Callable[[List[OutboxMessage]], Dict[int, str] | None]
+
+
+def add_outbox_message(topic: str, payload: dict) -> OutboxMessage:
+    """
+    Добавляет сообщение в outbox. Вызывается внутри транзакции, меняющей бизнес-данные.
+
+    Args:
+        topic (str): Тип события, по которому ретранслятор выбирает обработчик.
+        payload (dict): JSON-сериализуемые данные события.
+
+    Returns:
+        OutboxMessage: Созданная запись outbox.
+    """
+    return OutboxMessage.objects.create(topic=topic, payload=payload, trace_context=inject_context({}))
+
+
+def handle_order_created(messages: List[OutboxMessage]) -> Dict[int, str]:
+    """Ставит уведомления о созданных заказах в Celery, загружая telegram_id всей пачки одним запросом."""
+    user_ids = {uuid.UUID(message.payload["user_id"]) for message in messages}
+    telegram_ids = dict(
+        User.objects.filter(id__in=user_ids, telegram_id__isnull=False).values_list("id", "telegram_id"),
+    )
+    errors = {}
+    for message in messages:
+        telegram_id = telegram_ids.get(uuid.UUID(message.payload["user_id"]))
+        if telegram_id is None:
+            logger.info("Заказ %s: у пользователя нет Telegram, уведомление пропущено", message.payload["order_id"])
+            continue
+        try:
+            # Публикация продолжает трассу запроса, создавшего заказ.
+            with use_context(message.trace_context):
+                send_order_creation_telegram_message.delay(telegram_id=telegram_id)
+        except Exception as e:
+            logger.exception("Не удалось опубликовать уведомление о заказе %s", message.payload["order_id"])
+            errors[message.id] = str(e)
+    return errors
+
+
+class OutboxRelay:
+    """
+    Ретранслятор outbox: пачками переносит сообщения из таблицы в Celery.
+
+    Пачка выбирается `SELECT ... FOR UPDATE SKIP LOCKED`, поэтому несколько
+    ретрансляторов могут работать параллельно, не обрабатывая одно сообщение дважды.
+    Успешно обработанные сообщения удаляются, неудачные откладываются по одному на
+    `retry_delay * attempts` и после `max_attempts` попыток остаются в таблице для разбора.
+    Если обработчик упал на всей пачке, сообщения события обрабатываются по одному,
+    чтобы одно некорректное сообщение не задерживало остальные.
+    Доставка «как минимум один раз»: при падении между публикацией и коммитом
+    сообщение будет отправлено повторно.
+    """
+
+    def __init__(
+        self,
+        handlers: Dict[str, OutboxHandler] | None = None,
+        batch_size: int = 100,
+        max_attempts: int = 10,
+        retry_delay: datetime.timedelta = datetime.timedelta(seconds=30),
+    ):
+        if handlers is None:
+            handlers = {topic: import_string(path) for topic, path in settings.OUTBOX_HANDLERS.items()}
+        self.handlers = handlers
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+
+    def drain_batch(self) -> int:
+        """Обрабатывает одну пачку сообщений. Возвращает количество выбранных сообщений."""
+        with transaction.atomic():
+            batch = list(
+                OutboxMessage.objects.select_for_update(skip_locked=True)
+                .filter(available_at__lte=timezone.now(), attempts__lt=self.max_attempts)
+                .order_by("id")[: self.batch_size]
+            )
+            if not batch:
+                return 0
+
+            by_topic: Dict[str, List[OutboxMessage]] = defaultdict(list)
+            for message in batch:
+                by_topic[message.topic].append(message)
+
+            done_ids = []
+            failed: List[OutboxMessage] = []
+            for topic, messages in by_topic.items():
+                handler = self.handlers.get(topic)
+                if handler is None:
+                    for message in messages:
+                        message.last_error = f"Нет обработчика для события '{topic}'"
+                    failed.extend(messages)
+                    continue
+                try:
+                    # Точка сохранения: ошибка SQL в обработчике не должна прерывать транзакцию пачки.
+                    with transaction.atomic():
+                        errors = handler(messages) or {}
+                except Exception:
+                    logger.exception(
+                        "Ошибка обработки %s сообщений outbox '%s', обработка по одному", len(messages), topic
+                    )
+                    errors = self._handle_one_by_one(handler, messages)
+                for message in messages:
+                    if message.id in errors:
+                        message.last_error = errors[message.id]
+                        failed.append(message)
+                    else:
+                        done_ids.append(message.id)
+
+            if failed:
+                self._postpone(failed)
+            if done_ids:
+                OutboxMessage.objects.filter(id__in=done_ids).delete()
+        return len(batch)
+
+    @staticmethod
+    def _handle_one_by_one(handler: OutboxHandler, messages: List[OutboxMessage]) -> Dict[int, str]:
+        errors = {}
+        for message in messages:
+            try:
+                with transaction.atomic():
+                    errors.update(handler([message]) or {})
+            except Exception as e:
+                logger.exception("Ошибка обработки сообщения outbox %s '%s'", message.id, message.topic)
+                errors[message.id] = str(e)
+        return errors
+
+    def _postpone(self, messages: List[OutboxMessage]) -> None:
+        """Откладывает сообщения с заполненным `last_error` до следующей попытки."""
+        now = timezone.now()
+        for message in messages:
+            message.attempts += 1
+            message.available_at = now + self.retry_delay * message.attempts
+        OutboxMessage.objects.bulk_update(messages, ["attempts", "last_error", "available_at"])
+
+    def run_forever(self, poll_interval: float = 1.0) -> None:
+        """Обрабатывает outbox в цикле; засыпает на `poll_interval`, когда очередь пуста."""
+        while True:
+            try:
+                selected = self.drain_batch()
+            except Exception:
+                logger.exception("Ретранслятор outbox: ошибка при обработке пачки")
+                selected = 0
+            if selected < self.batch_size:
+                time.sleep(poll_interval)
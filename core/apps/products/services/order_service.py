@@ -18,10 +18,16 @@ from core.apps.common.exceptions.orders_exceptions.order_exc import (
     OrderNotFoundException,
     OrderUpdateError,
 )
+from core.apps.common.tracing import traced_methods
 from core.apps.products.models import Order
+from core.apps.products.outbox import (
+    add_outbox_message,
+    ORDER_CREATED_TOPIC,
+)
 from core.apps.products.services.base_order_service import OrderBaseService
 
 
+@traced_methods
 class OrderService(OrderBaseService):
     def _build_query_orders(
         self,
@@ -45,11 +51,17 @@ class OrderService(OrderBaseService):
         description: str | None = None,
     ) -> Order:
         try:
-            order = Order.objects.create(
-                user_id=user_id,
-                product_id=product_id,
-                description=description,
-            )
+            with transaction.atomic():
+                order = Order.objects.create(
+                    user_id=user_id,
+                    product_id=product_id,
+                    description=description,
+                )
+                # Уведомление ставит в очередь ретранслятор outbox, только после коммита заказа.
+                add_outbox_message(
+                    ORDER_CREATED_TOPIC,
+                    {"order_id": str(order.id), "user_id": str(user_id)},
+                )
             return order
         except IntegrityError as e:
             raise OrderCreationError(detail=f"Ошибка базы данных при создании заказа: {e}")
@@ -3,33 +3,43 @@ import logging
 import requests
 from celery import shared_task
 from django.conf import settings
+from opentelemetry.trace import SpanKind
+
+from core.apps.common.tracing import get_tracer
 
 
 logger = logging.getLogger(__name__)
 
 TELEGRAM_BOT_TOKEN = settings.TELEGRAM_BOT_TOKEN
-TELEGRAM_API_URL = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/"
+TELEGRAM_API_URL = f"{settings.TELEGRAM_API_BASE_URL.rstrip('/')}/bot{TELEGRAM_BOT_TOKEN}/"
+TELEGRAM_REQUEST_TIMEOUT = 10
+
+# Сессия на процесс воркера: соединение с Telegram API переиспользуется между задачами.
+_session = requests.Session()
 
 
-@shared_task
+@shared_task(ignore_result=True)
 def send_order_creation_telegram_message(telegram_id: int):
     try:
         message_text = "✅ Ваш заказ успешно создан!"
 
         payload = {"chat_id": telegram_id, "text": message_text}
 
-        response = requests.post(TELEGRAM_API_URL + "sendMessage", json=payload)
+        with get_tracer().start_as_current_span("telegram sendMessage", kind=SpanKind.CLIENT):
+            response = _session.post(TELEGRAM_API_URL + "sendMessage", json=payload, timeout=TELEGRAM_REQUEST_TIMEOUT)
         response.raise_for_status()
 
         response_data = response.json()
         if response_data.get("ok"):
-            logger.info(f"Сообщение об успешном создании заказа отправлено пользователю {telegram_id}.")
+            logger.info("Сообщение об успешном создании заказа отправлено пользователю %s.", telegram_id)
         else:
             logger.error(
-                f"Telegram API вернул ошибку для {telegram_id}: {response_data.get('description', 'Неизвестная ошибка')}"
+                "Telegram API вернул ошибку для %s: %s",
+                telegram_id,
+                response_data.get("description", "Неизвестная ошибка"),
             )
 
     except requests.exceptions.RequestException as e:
-        logger.error(f"Ошибка HTTP-запроса при отправке сообщения пользователю {telegram_id}: {e}")
+        logger.error("Ошибка HTTP-запроса при отправке сообщения пользователю %s: %s", telegram_id, e)
     except Exception as e:
-        logger.error(f"Непредвиденная ошибка при отправке сообщения пользователю {telegram_id}: {e}")
+        logger.error("Непредвиденная ошибка при отправке сообщения пользователю %s: %s", telegram_id, e)
@@ -1,11 +1,106 @@
 from django.contrib import admin
+from django.utils.html import format_html
 
-from .models import Subscription
+from core.apps.common.admin import (
+    AutocompleteFilter,
+    ScalableAdminMixin,
+)
+from core.apps.common.cache_bus import ENTITLEMENT_ENTITY
+from core.apps.common.invalidation import invalidate_on_commit
+from core.apps.subscriptions.bulk_actions import bulk_action
+from core.apps.user.models import User
+
+from .models import (
+    BulkOperation,
+    Subscription,
+)
 
 
 @admin.register(Subscription)
-class SubscriptionAdmin(admin.ModelAdmin):
-    list_display = ("user", "tariff", "start_date", "end_date")
-    search_fields = ("user__email", "tariff__name")
-    list_filter = ("tariff", "start_date", "end_date")
+class SubscriptionAdmin(ScalableAdminMixin, admin.ModelAdmin):
+    list_display = ("user", "tariff", "start_date", "end_date", "is_active", "is_deleted")
+    list_select_related = ("user", "tariff")
+    search_fields = ("^user__email",)
+    search_help_text = "UUID подписки или начало email пользователя"
+    list_filter = ("tariff", "is_active", "is_deleted", "start_date", "end_date", ("user", AutocompleteFilter))
     autocomplete_fields = ("user", "tariff")
+    actions = [
+        *(
+            bulk_action(
+                BulkOperation.ACTION_EXTEND_SUBSCRIPTIONS,
+                f"Продлить на {months} мес.",
+                name=f"extend_subscriptions_{months}",
+                months=months,
+            )
+            for months in (1, 3, 6, 12)
+        ),
+        bulk_action(BulkOperation.ACTION_DEACTIVATE_SUBSCRIPTIONS, "Деактивировать"),
+        bulk_action(BulkOperation.ACTION_SOFT_DELETE_SUBSCRIPTIONS, "Удалить (мягко)"),
+        bulk_action(BulkOperation.ACTION_RESTORE_SUBSCRIPTIONS, "Восстановить"),
+    ]
+
+    def get_queryset(self, request):
+        # Удалённые подписки видны в админке, чтобы их можно было восстановить.
+        return self.model.objects.unfiltered()
+
+    # Правки в админке идут мимо сервиса подписок, поэтому `User.active_until` пересчитывается здесь.
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        user_ids = {obj.user_id}
+        if change and "user" in form.changed_data:
+            user_ids.add(form.initial["user"])
+        self._entitlement_changed(user_ids)
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        self._entitlement_changed([obj.user_id])
+
+    def delete_queryset(self, request, queryset):
+        user_ids = set(queryset.values_list("user_id", flat=True))
+        super().delete_queryset(request, queryset)
+        self._entitlement_changed(user_ids)
+
+    @staticmethod
+    def _entitlement_changed(user_ids) -> None:
+        User.objects.refresh_active_until(user_ids)
+        for user_id in user_ids:
+            invalidate_on_commit(ENTITLEMENT_ENTITY, user_id)
+
+
+@admin.register(BulkOperation)
+class BulkOperationAdmin(admin.ModelAdmin):
+    list_display = ("action", "status", "progress", "updated", "created_by", "created_at", "finished_at")
+    list_filter = ("action", "status")
+    list_select_related = ("created_by",)
+    exclude = ("object_ids",)
+    readonly_fields = (
+        "action",
+        "params",
+        "status",
+        "progress",
+        "total",
+        "processed",
+        "updated",
+        "created_by",
+        "started_at",
+        "finished_at",
+        "error",
+    )
+
+    @admin.display(description="Прогресс")
+    def progress(self, obj: BulkOperation):
+        percent = round(obj.processed * 100 / obj.total) if obj.total else 100
+        return format_html(
+            '<progress value="{}" max="{}"></progress> {}/{} ({}%)',
+            obj.processed,
+            obj.total or 1,
+            obj.processed,
+            obj.total,
+            percent,
+        )
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
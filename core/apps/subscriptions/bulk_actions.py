@@ -0,0 +1,44 @@
+"""
+Массовые действия админки поверх `BulkOperationService`.
+
+Выборка до BULK_ACTION_SYNC_LIMIT строк обновляется сразу, в запросе админки; большая
+сохраняется как `BulkOperation` и выполняется в Celery, а администратор получает ссылку
+на страницу операции с прогрессом.
+"""
+
+from django.conf import settings
+from django.contrib import (
+    admin,
+    messages,
+)
+from django.urls import reverse
+from django.utils.html import format_html
+
+from core.apps.subscriptions.services.bulk_operation_service import BulkOperationService
+from core.project.containers import get_container
+
+
+def bulk_action(action: str, description: str, name: str | None = None, **params):
+    """Создаёт действие админки, выполняющее `action` над выбранными объектами."""
+
+    def run(modeladmin, request, queryset):
+        object_ids = list(queryset.order_by("pk").values_list("pk", flat=True))
+        service: BulkOperationService = get_container().resolve(BulkOperationService)
+
+        if len(object_ids) <= settings.BULK_ACTION_SYNC_LIMIT:
+            updated = service.execute(action, object_ids, params)
+            modeladmin.message_user(request, f"Обновлено записей: {updated}.", messages.SUCCESS)
+            return
+
+        operation = service.create_operation(action, object_ids, params, created_by_id=request.user.pk)
+        url = reverse("admin:subscriptions_bulkoperation_change", args=[operation.pk])
+        modeladmin.message_user(
+            request,
+            format_html(
+                'Выбрано записей: {}. Операция выполняется в фоне, <a href="{}">прогресс</a>.', len(object_ids), url
+            ),
+            messages.INFO,
+        )
+
+    run.__name__ = name or action
+    return admin.action(description=description, permissions=["change"])(run)
@@ -0,0 +1,103 @@
+import logging
+import os
+import statistics
+import time
+import uuid
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from core.apps.user.models import User
+from core.apps.user.tokens import EntitlementRefreshToken
+from core.project.middleware.subscription_middleware import SubscriptionMiddleware
+from core.project.structured_logging import (
+    JsonFormatter,
+    QueueLogHandler,
+)
+
+
+MIDDLEWARE_LOGGER = "subscription_middleware"
+
+
+def _ok(request):
+    return HttpResponse()
+
+
+class Command(BaseCommand):
+    help = (
+        "Замеряет накладные расходы логирования в SubscriptionMiddleware: без логов, с синхронной записью, "
+        "через QueueLogHandler и с выборкой."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=20_000)
+        parser.add_argument("--sample-rate", type=float, default=0.01)
+
+    def handle(self, *args, **options):
+        factory = RequestFactory()
+        requests = {"public": lambda: factory.post("/api/v1/register/")}
+        if settings.JWT_ENTITLEMENT_CLAIMS:
+            # Токен с утверждениями: мидлварь не обращается к БД.
+            staff = User(id=uuid.uuid4(), email="staff@example.com", is_staff=True, is_active=True)
+            header = f"Bearer {EntitlementRefreshToken.for_user(staff).access_token}"
+            requests["staff"] = lambda: factory.get("/api/v1/orders/", HTTP_AUTHORIZATION=header)
+        else:
+            self.stdout.write("JWT_ENTITLEMENT_CLAIMS выключен: запросы сотрудников потребуют БД, сценарий пропущен.")
+
+        middleware = SubscriptionMiddleware(_ok)
+        logger = logging.getLogger(MIDDLEWARE_LOGGER)
+        saved = logger.level, logger.handlers[:], logger.propagate
+        devnull = open(os.devnull, "w")
+        scenarios = {
+            "off": (logging.WARNING, lambda: logging.NullHandler()),
+            "sync_stream": (logging.DEBUG, lambda: self._stream_handler(devnull)),
+            "queue": (logging.DEBUG, lambda: QueueLogHandler(stream=devnull)),
+            "queue_sampled": (
+                logging.DEBUG,
+                lambda: QueueLogHandler(stream=devnull, sample_rates={MIDDLEWARE_LOGGER: options["sample_rate"]}),
+            ),
+        }
+        try:
+            for scenario, (level, make_handler) in scenarios.items():
+                for kind, make_request in requests.items():
+                    handler = make_handler()
+                    logger.handlers = [handler]
+                    logger.setLevel(level)
+                    logger.propagate = False
+                    timings = self._measure(middleware, make_request, options["requests"])
+                    drained_at = time.perf_counter()
+                    if isinstance(handler, QueueLogHandler):
+                        handler.stop()
+                    drain_ms = (time.perf_counter() - drained_at) * 1000
+                    self._report(f"{scenario}.{kind}", timings, drain_ms)
+        finally:
+            logger.setLevel(saved[0])
+            logger.handlers = saved[1]
+            logger.propagate = saved[2]
+            devnull.close()
+
+    @staticmethod
+    def _stream_handler(stream) -> logging.Handler:
+        handler = logging.StreamHandler(stream)
+        handler.setFormatter(JsonFormatter())
+        return handler
+
+    @staticmethod
+    def _measure(middleware, make_request, count: int) -> list:
+        request_objects = [make_request() for _ in range(count)]
+        timings = []
+        for request in request_objects:
+            started = time.perf_counter()
+            middleware(request)
+            timings.append(time.perf_counter() - started)
+        return timings
+
+    def _report(self, name: str, timings: list, drain_ms: float) -> None:
+        timings.sort()
+        p95 = timings[int(len(timings) * 0.95) - 1]
+        self.stdout.write(
+            f"{name}: медиана {statistics.median(timings) * 1e6:.1f} мкс, p95 {p95 * 1e6:.1f} мкс, "
+            f"дозапись очереди {drain_ms:.1f} мс"
+        )
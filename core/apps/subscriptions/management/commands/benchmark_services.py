@@ -0,0 +1,36 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from core.project.benchmarks import run_suite
+
+
+class Command(BaseCommand):
+    help = (
+        "Замеряет время горячих методов сервисов и HTTP-стека на заполненной БД "
+        "(см. generate_dataset) и сохраняет результаты в JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=50)
+        parser.add_argument("--warmup", type=int, default=5)
+        parser.add_argument("--only", help="Запустить только кейсы, в имени которых есть эта подстрока.")
+        parser.add_argument(
+            "--output",
+            default="benchmarks/current.json",
+            help="Файл результатов; базовая линия — результат, сохранённый на эталонном коммите.",
+        )
+
+    def handle(self, *args, **options):
+        report = run_suite(
+            iterations=options["iterations"],
+            warmup=options["warmup"],
+            only=options["only"],
+            report=self.stdout.write,
+        )
+
+        output = Path(options["output"])
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        self.stdout.write(self.style.SUCCESS(f"Результаты {len(report['results'])} кейсов сохранены в {output}"))
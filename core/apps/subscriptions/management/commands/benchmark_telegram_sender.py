@@ -0,0 +1,121 @@
+import asyncio
+import multiprocessing
+import random
+import socket
+import statistics
+import time
+
+from aiohttp import web
+from django.core.management.base import BaseCommand
+
+from core.apps.common.telegram_sender import AsyncTelegramSender
+
+
+STUB_TOKEN = "stub-token"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def run_telegram_stub(port: int, latency_ms: float, rate_limited_share: float) -> None:
+    """Локальная заглушка Telegram Bot API: отвечает на sendMessage с задержкой и изредка 429."""
+
+    async def send_message(request: web.Request) -> web.Response:
+        payload = await request.json()
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+        if rate_limited_share and random.random() < rate_limited_share:
+            return web.json_response(
+                {"ok": False, "error_code": 429, "parameters": {"retry_after": 1}},
+                status=429,
+            )
+        return web.json_response({"ok": True, "result": {"chat": {"id": payload["chat_id"]}}})
+
+    app = web.Application()
+    app.router.add_post(f"/bot{STUB_TOKEN}/sendMessage", send_message)
+    web.run_app(app, host="127.0.0.1", port=port, print=None, access_log=None)
+
+
+class Command(BaseCommand):
+    help = "Замеряет пропускную способность AsyncTelegramSender на локальной заглушке Telegram API."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--recipients", type=int, default=1_000_000)
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument("--concurrency", type=int, default=200)
+        parser.add_argument(
+            "--rate",
+            type=float,
+            default=0,
+            help="Ограничение сообщений в секунду (0 — без ограничения, замер потолка отправителя).",
+        )
+        parser.add_argument("--latency-ms", type=float, default=20)
+        parser.add_argument("--rate-limited-share", type=float, default=0.0)
+
+    def handle(self, *args, **options):
+        port = _free_port()
+        stub = multiprocessing.Process(
+            target=run_telegram_stub,
+            args=(port, options["latency_ms"], options["rate_limited_share"]),
+            daemon=True,
+        )
+        stub.start()
+        try:
+            self._wait_for_port(port)
+            asyncio.run(self._run(port, options))
+        finally:
+            stub.terminate()
+            stub.join()
+
+    @staticmethod
+    def _wait_for_port(port: int, timeout: float = 10.0) -> None:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with socket.socket() as sock:
+                if sock.connect_ex(("127.0.0.1", port)) == 0:
+                    return
+            time.sleep(0.05)
+        raise RuntimeError("Заглушка Telegram API не запустилась")
+
+    async def _run(self, port: int, options: dict) -> None:
+        recipients = options["recipients"]
+        chunk_size = options["chunk_size"]
+        latencies = []
+        sent = failed = 0
+
+        sender = AsyncTelegramSender(
+            bot_token=STUB_TOKEN,
+            api_base_url=f"http://127.0.0.1:{port}",
+            rate_per_second=options["rate"],
+            max_concurrency=options["concurrency"],
+        )
+        started = time.perf_counter()
+        async with sender:
+            for offset in range(0, recipients, chunk_size):
+                batch = range(offset, min(offset + chunk_size, recipients))
+                results = await sender.send_many((chat_id, "benchmark") for chat_id in batch)
+                for result in results:
+                    latencies.append(result.latency)
+                    if result.ok:
+                        sent += 1
+                    else:
+                        failed += 1
+
+                done = offset + len(batch)
+                if done % (chunk_size * 50) == 0:
+                    elapsed = time.perf_counter() - started
+                    self.stdout.write(f"{done}/{recipients}: {done / elapsed:,.0f} msg/s")
+
+        elapsed = time.perf_counter() - started
+        latencies.sort()
+        p99 = latencies[int(len(latencies) * 0.99) - 1] if latencies else 0.0
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Получателей: {recipients}, отправлено: {sent}, ошибок: {failed}, "
+                f"время: {elapsed:.1f} с, пропускная способность: {recipients / elapsed:,.0f} msg/s, "
+                f"задержка p50: {statistics.median(latencies) * 1000:.1f} мс, p99: {p99 * 1000:.1f} мс"
+            )
+        )
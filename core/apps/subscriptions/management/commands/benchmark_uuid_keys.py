@@ -0,0 +1,63 @@
+import time
+import uuid
+
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+)
+from django.db import connection
+from psycopg2.extras import execute_values
+
+from core.apps.common.uuid7 import uuid7
+
+
+GENERATORS = {
+    "uuid4": uuid.uuid4,
+    "uuid7": uuid7,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнивает скорость вставки и размер индекса первичного ключа для uuid4 и UUIDv7 "
+        "на временных таблицах PostgreSQL."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1_000_000)
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("Бенчмарк работает только с PostgreSQL.")
+
+        for name, generate in GENERATORS.items():
+            table = f"uuid_benchmark_{name}"
+            with connection.cursor() as cursor:
+                raw_cursor = cursor.cursor
+                raw_cursor.execute(f"DROP TABLE IF EXISTS {table}")
+                raw_cursor.execute(
+                    f"CREATE TEMP TABLE {table} (id uuid PRIMARY KEY, created_at timestamptz NOT NULL DEFAULT now())"
+                )
+
+                started = time.perf_counter()
+                for offset in range(0, options["rows"], options["batch_size"]):
+                    batch = [(str(generate()),) for _ in range(min(options["batch_size"], options["rows"] - offset))]
+                    execute_values(raw_cursor, f"INSERT INTO {table} (id) VALUES %s", batch, page_size=len(batch))
+                elapsed = time.perf_counter() - started
+
+                raw_cursor.execute(
+                    "SELECT pg_relation_size(%s), pg_relation_size(%s)",
+                    (table, f"{table}_pkey"),
+                )
+                table_size, index_size = raw_cursor.fetchone()
+
+                raw_cursor.execute(f"EXPLAIN (ANALYZE, FORMAT JSON) SELECT id FROM {table} ORDER BY id DESC LIMIT 20")
+                recent_plan = raw_cursor.fetchone()[0][0]
+                raw_cursor.execute(f"DROP TABLE {table}")
+
+            self.stdout.write(
+                f"{name}: {options['rows'] / elapsed:,.0f} строк/с ({elapsed:.1f} с), "
+                f"таблица {table_size / 2**20:.1f} МБ, индекс PK {index_size / 2**20:.1f} МБ, "
+                f"последние 20 по id: {recent_plan['Execution Time']:.2f} мс"
+            )
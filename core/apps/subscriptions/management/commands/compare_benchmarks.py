@@ -0,0 +1,65 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+)
+
+from core.project.benchmarks import compare_results
+
+
+class Command(BaseCommand):
+    help = "Сравнивает результаты benchmark_services с базовой линией и завершается с ошибкой при регрессиях."
+
+    def add_arguments(self, parser):
+        parser.add_argument("baseline")
+        parser.add_argument("current", nargs="?", default="benchmarks/current.json")
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.15,
+            help="Допустимый рост метрики в долях (0.15 — на 15%%).",
+        )
+        parser.add_argument("--metric", choices=("median_ms", "p95_ms", "min_ms"), default="median_ms")
+
+    def handle(self, *args, **options):
+        baseline = self._load(options["baseline"])
+        current = self._load(options["current"])
+        rows = compare_results(baseline, current, threshold=options["threshold"], metric=options["metric"])
+
+        if baseline["environment"].get("dataset") != current["environment"].get("dataset"):
+            self.stdout.write(self.style.WARNING("Наборы данных базовой линии и текущего замера различаются."))
+
+        self.stdout.write(f"{'Кейс':<42} {'было, мс':>10} {'стало, мс':>10} {'изм.':>8} {'SQL':>9}  статус")
+        for row in sorted(rows, key=lambda row: row["name"]):
+            self.stdout.write(self._format_row(row))
+
+        regressions = [row["name"] for row in rows if row["status"] == "regression"]
+        if regressions:
+            raise CommandError(f"Регрессии производительности: {', '.join(sorted(regressions))}")
+        self.stdout.write(self.style.SUCCESS("Регрессий не найдено."))
+
+    def _format_row(self, row: dict) -> str:
+        if row["status"] == "new":
+            return f"{row['name']:<42} {'—':>10} {row['current']:>10.2f} {'':>8} {'':>9}  новый"
+        if row["status"] == "missing":
+            return f"{row['name']:<42} {row['baseline']:>10.2f} {'—':>10} {'':>8} {'':>9}  отсутствует"
+
+        queries = f"{row['baseline_queries']:g}→{row['current_queries']:g}"
+        line = (
+            f"{row['name']:<42} {row['baseline']:>10.2f} {row['current']:>10.2f} "
+            f"{row['change']:>+8.1%} {queries:>9}  {row['status']}"
+        )
+        if row["status"] == "regression":
+            return self.style.ERROR(line)
+        if row["status"] == "improvement":
+            return self.style.SUCCESS(line)
+        return line
+
+    @staticmethod
+    def _load(path: str) -> dict:
+        try:
+            return json.loads(Path(path).read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Не удалось прочитать результаты {path}: {e}")
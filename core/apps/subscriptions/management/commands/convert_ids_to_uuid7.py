@@ -0,0 +1,132 @@
+from typing import (
+    List,
+    Tuple,
+    Type,
+)
+
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+)
+from django.db import (
+    connection,
+    models,
+    transaction,
+)
+from django.db.models import Q
+from psycopg2.extras import execute_values
+
+from core.apps.common.uuid7 import uuid7_at
+from core.apps.products.models import (
+    Order,
+    OutboxMessage,
+    Product,
+)
+from core.apps.subscriptions.models import (
+    BulkOperation,
+    Subscription,
+    TariffBroadcast,
+)
+from core.apps.tariff.models import Tariff
+from core.apps.user.models import User
+
+
+MODELS = (Tariff, Product, User, Subscription, Order)
+
+
+def referencing_columns(model: Type[models.Model]) -> List[Tuple[str, str]]:
+    """Таблицы и колонки внешних ключей, ссылающихся на первичный ключ модели (включая M2M-таблицы)."""
+    return [
+        (relation.related_model._meta.db_table, relation.field.column)
+        for relation in model._meta.get_fields(include_hidden=True)
+        if relation.auto_created and not relation.concrete and (relation.one_to_many or relation.one_to_one)
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        "Переводит существующие первичные ключи uuid4 на UUIDv7, построенные из created_at, вместе со всеми "
+        "внешними ключами на них. Запускать в окно обслуживания: выданные JWT и ссылки на старые id "
+        "(журнал админки, внешние системы) перестанут находить объекты."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=5000)
+        parser.add_argument(
+            "--model",
+            action="append",
+            choices=[model._meta.label for model in MODELS],
+            help="Модель для конвертации (можно несколько раз); по умолчанию все.",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Не проверять незавершённые рассылки, массовые операции и сообщения outbox.",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("Конвертация использует UPDATE ... FROM (VALUES ...) и работает только с PostgreSQL.")
+        if not options["force"]:
+            self._check_pending_work()
+
+        selected = options["model"]
+        for model in MODELS:
+            if selected and model._meta.label not in selected:
+                continue
+            converted = self._convert(model, options["chunk_size"])
+            self.stdout.write(self.style.SUCCESS(f"{model._meta.label}: сконвертировано {converted} ключей"))
+
+    def _check_pending_work(self) -> None:
+        # Эти записи хранят id пользователей и заказов вне внешних ключей (JSON, контрольные точки).
+        pending = {
+            "рассылки": TariffBroadcast.objects.filter(
+                status__in=[TariffBroadcast.STATUS_QUEUED, TariffBroadcast.STATUS_RUNNING]
+            ).exists(),
+            "массовые операции": BulkOperation.objects.filter(
+                status__in=[BulkOperation.STATUS_QUEUED, BulkOperation.STATUS_RUNNING]
+            ).exists(),
+            "сообщения outbox": OutboxMessage.objects.exists(),
+        }
+        blocking = [name for name, exists in pending.items() if exists]
+        if blocking:
+            raise CommandError(
+                f"Есть незавершённые {', '.join(blocking)}: дождитесь их завершения или запустите с --force."
+            )
+
+    def _convert(self, model: Type[models.Model], chunk_size: int) -> int:
+        table = model._meta.db_table
+        pk_column = model._meta.pk.column
+        targets = [(table, pk_column), *referencing_columns(model)]
+        queryset = model._base_manager.order_by("created_at", "pk").values_list("created_at", "pk")
+
+        converted = 0
+        last = None
+        while True:
+            chunk_queryset = queryset
+            if last is not None:
+                chunk_queryset = queryset.filter(Q(created_at__gt=last[0]) | Q(created_at=last[0], pk__gt=last[1]))
+            rows = list(chunk_queryset[:chunk_size])
+            if not rows:
+                return converted
+            last = rows[-1]
+
+            # Уже сконвертированные строки (повторный запуск) пропускаются.
+            mapping = [(str(old_id), str(uuid7_at(created_at))) for created_at, old_id in rows if old_id.version != 7]
+            if not mapping:
+                continue
+
+            # Внешние ключи Django создаются DEFERRABLE INITIALLY DEFERRED: ссылки проверяются при коммите,
+            # когда и первичные ключи, и ссылки на них в пачке уже обновлены.
+            with transaction.atomic(), connection.cursor() as cursor:
+                for target_table, column in targets:
+                    execute_values(
+                        cursor.cursor,
+                        f'UPDATE "{target_table}" AS t SET "{column}" = m.new_id '
+                        f'FROM (VALUES %s) AS m(old_id, new_id) WHERE t."{column}" = m.old_id',
+                        mapping,
+                        template="(%s::uuid, %s::uuid)",
+                        page_size=len(mapping),
+                    )
+            converted += len(mapping)
+            self.stdout.write(f"{model._meta.label}: {converted}")
@@ -0,0 +1,323 @@
+import datetime
+import io
+import random
+import time
+import uuid
+from decimal import Decimal
+from functools import lru_cache
+from typing import (
+    Iterable,
+    List,
+    Sequence,
+    Type,
+)
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+)
+from django.db import (
+    connection,
+    models,
+    transaction,
+)
+from django.utils import timezone
+
+from core.apps.common.uuid7 import uuid7_at
+from core.apps.products.models import (
+    Order,
+    Product,
+)
+from core.apps.subscriptions.models import Subscription
+from core.apps.tariff.models import Tariff
+from core.apps.user.models import User
+
+
+FIRST_NAMES = ("Александр", "Мария", "Дмитрий", "Анна", "Иван", "Елена", "Сергей", "Ольга", "Никита", "Дарья")
+LAST_NAMES = ("Иванов", "Смирнов", "Кузнецов", "Попов", "Васильев", "Петров", "Соколов", "Михайлов", "Новиков")
+
+SUBSCRIPTIONS_PER_USER_WEIGHTS = (25, 40, 20, 10, 5)  # 0..4 подписки
+ORDERS_PER_USER_WEIGHTS = (30, 30, 20, 10, 6, 4)  # 0..5 заказов
+SUBSCRIPTION_MONTHS = (1, 3, 6, 12)
+SUBSCRIPTION_MONTHS_WEIGHTS = (50, 25, 15, 10)
+ORDER_STATUSES = ("pending", "completed", "canceled")
+ORDER_STATUS_WEIGHTS = (20, 70, 10)
+
+TELEGRAM_ID_BASE = 5_000_000_000
+PHONE_BASE = 79_000_000_000
+
+
+def zipf_weights(count: int, exponent: float = 1.2) -> List[float]:
+    """Веса популярности «длинного хвоста»: первый элемент самый популярный."""
+    return [1 / (rank**exponent) for rank in range(1, count + 1)]
+
+
+class CopyBuffer:
+    """Накопитель строк модели в текстовом формате COPY (`\\t`-разделитель, `\\N` для NULL)."""
+
+    def __init__(self, model: Type[models.Model], columns: Sequence[str]):
+        self.model = model
+        self.columns = columns
+        self.buffer = io.StringIO()
+        self.rows = 0
+        self.total = 0
+
+    def add(self, values: Iterable) -> None:
+        self.buffer.write("\t".join(r"\N" if value is None else str(value) for value in values))
+        self.buffer.write("\n")
+        self.rows += 1
+
+    def flush(self, cursor) -> None:
+        if not self.rows:
+            return
+        self.buffer.seek(0)
+        cursor.copy_expert(
+            f"COPY {self.model._meta.db_table} ({', '.join(self.columns)}) FROM STDIN",
+            self.buffer,
+        )
+        self.total += self.rows
+        self.buffer = io.StringIO()
+        self.rows = 0
+
+
+class Command(BaseCommand):
+    help = (
+        "Генерирует синтетический набор данных (пользователи, тарифы, продукты, подписки, заказы) "
+        "и загружает его через COPY. Результат детерминирован значением --seed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=100_000)
+        parser.add_argument("--tariffs", type=int, default=12)
+        parser.add_argument("--products", type=int, default=200)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument(
+            "--anchor-date",
+            type=datetime.date.fromisoformat,
+            default=None,
+            help="Дата «сегодня» для генерации (YYYY-MM-DD); вместе с --seed даёт полностью воспроизводимые данные.",
+        )
+        parser.add_argument("--chunk-size", type=int, default=20_000, help="Пользователей на одну транзакцию COPY.")
+        parser.add_argument("--deleted-share", type=float, default=0.05, help="Доля мягко удалённых записей.")
+        parser.add_argument("--telegram-share", type=float, default=0.7, help="Доля пользователей с Telegram.")
+        parser.add_argument("--password", default="password", help="Пароль всех сгенерированных пользователей.")
+        parser.add_argument(
+            "--truncate",
+            action="store_true",
+            help="Очистить таблицы пользователей, тарифов, продуктов, подписок и заказов перед загрузкой.",
+        )
+        parser.add_argument("--noinput", "--no-input", action="store_false", dest="interactive")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("Генератор использует COPY и работает только с PostgreSQL.")
+
+        self.rng = random.Random(options["seed"])
+        self.today = options["anchor_date"] or timezone.localdate()
+        self.now = timezone.make_aware(datetime.datetime.combine(self.today, datetime.time(12)))
+        self.deleted_share = options["deleted_share"]
+        # Хеш считается один раз: PBKDF2 на каждого пользователя занял бы часы.
+        self.password_hash = make_password(options["password"], salt=f"dataset{options['seed']}")
+
+        if options["truncate"]:
+            self._truncate(options["interactive"])
+
+        started = time.monotonic()
+        tariff_ids = self._load_reference(Tariff, options["tariffs"], self._tariff_row)
+        product_ids = self._load_reference(Product, options["products"], self._product_row)
+        self.tariff_weights = zipf_weights(len(tariff_ids))
+        self.product_weights = zipf_weights(len(product_ids))
+
+        users = CopyBuffer(User, self._columns(User, exclude=("last_login",)))
+        subscriptions = CopyBuffer(Subscription, self._columns(Subscription))
+        orders = CopyBuffer(Order, self._columns(Order))
+
+        for offset in range(0, options["users"], options["chunk_size"]):
+            with transaction.atomic(), connection.cursor() as cursor:
+                for index in range(offset, min(offset + options["chunk_size"], options["users"])):
+                    created_at = self._timestamp(max_days_ago=3 * 365)
+                    user_id = self._uuid(created_at)
+                    user = self._user_values(index, user_id, created_at, options["telegram_share"])
+                    user_subscriptions = list(self._subscription_values(user_id, tariff_ids))
+                    # Денормализованное поле, которое в приложении поддерживает сервис подписок.
+                    user["active_until"] = max(
+                        (sub["end_date"] for sub in user_subscriptions if sub["is_active"] and not sub["is_deleted"]),
+                        default=None,
+                    )
+                    users.add(self._row(User, user, exclude=("last_login",)))
+                    for values in user_subscriptions:
+                        subscriptions.add(self._row(Subscription, values))
+                    for row in self._order_rows(user_id, product_ids):
+                        orders.add(row)
+
+                # Порядок важен: внешние ключи подписок и заказов ссылаются на пользователей пачки.
+                raw_cursor = cursor.cursor
+                users.flush(raw_cursor)
+                subscriptions.flush(raw_cursor)
+                orders.flush(raw_cursor)
+
+            elapsed = time.monotonic() - started
+            loaded = users.total + subscriptions.total + orders.total
+            self.stdout.write(f"Пользователей: {users.total}, строк: {loaded}, {loaded / elapsed * 60:,.0f} строк/мин")
+
+        with connection.cursor() as cursor:
+            for model in (User, Tariff, Product, Subscription, Order):
+                cursor.execute(f"ANALYZE {model._meta.db_table}")
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Загружено за {elapsed:.1f} с: тарифов {len(tariff_ids)}, продуктов {len(product_ids)}, "
+                f"пользователей {users.total}, подписок {subscriptions.total}, заказов {orders.total}"
+            )
+        )
+
+    def _truncate(self, interactive: bool) -> None:
+        tables = ", ".join(model._meta.db_table for model in (Order, Subscription, Product, Tariff, User))
+        if interactive:
+            answer = input(f"Будут безвозвратно очищены таблицы {tables}. Продолжить? [y/N] ")
+            if answer.lower() != "y":
+                raise CommandError("Отменено.")
+        with connection.cursor() as cursor:
+            cursor.execute(f"TRUNCATE {tables} CASCADE")
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _columns(model: Type[models.Model], exclude: Sequence[str] = ()) -> List[str]:
+        return [field.column for field in model._meta.concrete_fields if field.column not in exclude]
+
+    def _uuid(self, created_at: datetime.datetime) -> uuid.UUID:
+        # Ключи UUIDv7, как у моделей, с временем создания строки: порядок id совпадает с created_at.
+        return uuid7_at(created_at, self.rng)
+
+    def _timestamp(self, max_days_ago: int) -> datetime.datetime:
+        return self.now - datetime.timedelta(seconds=self.rng.randrange(max_days_ago * 24 * 60 * 60))
+
+    def _soft_delete(self, created_at: datetime.datetime) -> tuple[bool, datetime.datetime | None]:
+        if self.rng.random() < self.deleted_share:
+            return True, created_at + (self.now - created_at) * self.rng.random()
+        return False, None
+
+    def _load_reference(self, model: Type[models.Model], count: int, make_row) -> List[uuid.UUID]:
+        buffer = CopyBuffer(model, self._columns(model))
+        ids = []
+        for index in range(count):
+            created_at = self._timestamp(max_days_ago=3 * 365)
+            row_id = self._uuid(created_at)
+            ids.append(row_id)
+            buffer.add(make_row(index, row_id, created_at))
+        with transaction.atomic(), connection.cursor() as cursor:
+            buffer.flush(cursor.cursor)
+        return ids
+
+    def _row(self, model: Type[models.Model], values: dict, exclude: Sequence[str] = ()) -> list:
+        return [values[column] for column in self._columns(model, exclude=exclude)]
+
+    def _tariff_row(self, index: int, tariff_id: uuid.UUID, created_at: datetime.datetime) -> list:
+        return self._row(
+            Tariff,
+            {
+                "id": tariff_id,
+                "name": f"Тариф {index + 1}",
+                "price": Decimal(self.rng.choice((199, 299, 499, 799, 999, 1499, 2999))),
+                "created_at": created_at,
+                "updated_at": created_at,
+                "is_deleted": False,
+                "deleted_at": None,
+            },
+        )
+
+    def _product_row(self, index: int, product_id: uuid.UUID, created_at: datetime.datetime) -> list:
+        is_deleted, deleted_at = self._soft_delete(created_at)
+        return self._row(
+            Product,
+            {
+                "id": product_id,
+                "title": f"Продукт {index + 1}",
+                "description": f"Описание продукта {index + 1}",
+                "price": Decimal(self.rng.randrange(100, 100_000)) / 100,
+                "is_active": self.rng.random() < 0.9,
+                "created_at": created_at,
+                "updated_at": created_at,
+                "is_deleted": is_deleted,
+                "deleted_at": deleted_at,
+            },
+        )
+
+    def _user_values(
+        self,
+        index: int,
+        user_id: uuid.UUID,
+        created_at: datetime.datetime,
+        telegram_share: float,
+    ) -> dict:
+        is_deleted, deleted_at = self._soft_delete(created_at)
+        phone = f"+{PHONE_BASE + index}" if self.rng.random() < 0.6 else None
+        return {
+            "id": user_id,
+            "password": self.password_hash,
+            "is_superuser": False,
+            "first_name": self.rng.choice(FIRST_NAMES),
+            "last_name": self.rng.choice(LAST_NAMES),
+            "email": f"user{index}@example.com",
+            "is_staff": index == 0 or self.rng.random() < 0.001,
+            "is_active": self.rng.random() < 0.85,
+            "date_joined": created_at,
+            "created_at": created_at,
+            "updated_at": created_at,
+            "is_deleted": is_deleted,
+            "deleted_at": deleted_at,
+            "telegram_id": TELEGRAM_ID_BASE + index if self.rng.random() < telegram_share else None,
+            "phone": phone,
+            "phone_e164": phone,
+        }
+
+    def _subscription_values(self, user_id: uuid.UUID, tariff_ids: List[uuid.UUID]) -> Iterable[dict]:
+        count = self.rng.choices(range(len(SUBSCRIPTIONS_PER_USER_WEIGHTS)), SUBSCRIPTIONS_PER_USER_WEIGHTS)[0]
+        seen = set()
+        for _ in range(count):
+            tariff_id = self.rng.choices(tariff_ids, self.tariff_weights)[0]
+            # Начало в пределах двух лет назад и месяца вперёд: часть подписок истекла, часть пересекается.
+            start_date = self.today - datetime.timedelta(days=self.rng.randrange(-30, 2 * 365))
+            if (tariff_id, start_date) in seen:
+                continue
+            seen.add((tariff_id, start_date))
+
+            months = self.rng.choices(SUBSCRIPTION_MONTHS, SUBSCRIPTION_MONTHS_WEIGHTS)[0]
+            end_date = start_date + datetime.timedelta(days=30 * months)
+            created_at = timezone.make_aware(datetime.datetime.combine(start_date, datetime.time(12)))
+            is_deleted, deleted_at = self._soft_delete(min(created_at, self.now))
+            yield {
+                "id": self._uuid(created_at),
+                "user_id": user_id,
+                "tariff_id": tariff_id,
+                "start_date": start_date,
+                "end_date": end_date,
+                # Небольшая доля действующих по датам подписок отменена вручную.
+                "is_active": end_date >= self.today and self.rng.random() < 0.95,
+                "created_at": created_at,
+                "updated_at": created_at,
+                "is_deleted": is_deleted,
+                "deleted_at": deleted_at,
+            }
+
+    def _order_rows(self, user_id: uuid.UUID, product_ids: List[uuid.UUID]) -> Iterable[list]:
+        count = self.rng.choices(range(len(ORDERS_PER_USER_WEIGHTS)), ORDERS_PER_USER_WEIGHTS)[0]
+        for _ in range(count):
+            created_at = self._timestamp(max_days_ago=2 * 365)
+            is_deleted, deleted_at = self._soft_delete(created_at)
+            yield self._row(
+                Order,
+                {
+                    "id": self._uuid(created_at),
+                    "product_id": self.rng.choices(product_ids, self.product_weights)[0],
+                    "user_id": user_id,
+                    "description": None,
+                    "status": self.rng.choices(ORDER_STATUSES, ORDER_STATUS_WEIGHTS)[0],
+                    "created_at": created_at,
+                    "updated_at": created_at,
+                    "is_deleted": is_deleted,
+                    "deleted_at": deleted_at,
+                },
+            )
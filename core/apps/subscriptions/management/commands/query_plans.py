@@ -0,0 +1,118 @@
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+)
+
+from core.apps.user.models import User
+from core.project.query_plans import (
+    capture_plans,
+    diff_plans,
+    NESTED_LOOP_MAX_LOOPS,
+    SEQ_SCAN_MIN_ROWS,
+    snapshot_metadata,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Снимает планы EXPLAIN (ANALYZE, FORMAT JSON) запросов сервисов и сравнивает их формы со снимком. "
+        "С --update сохраняет снимок, с --sizes перед каждым снимком заново генерирует набор данных."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dir", default="benchmarks/plans", help="Каталог снимков планов.")
+        parser.add_argument(
+            "--label",
+            help="Имя снимка; по умолчанию users-<число пользователей в БД>.",
+        )
+        parser.add_argument(
+            "--sizes",
+            help=(
+                "Размеры набора данных через запятую (число пользователей), например 10000,100000,1000000. "
+                "Таблицы очищаются и заполняются generate_dataset для каждого размера (только при DEBUG=True)."
+            ),
+        )
+        parser.add_argument("--update", action="store_true", help="Перезаписать снимок вместо сравнения.")
+        parser.add_argument("--only", help="Только кейсы, в имени которых есть эта подстрока.")
+        parser.add_argument("--seq-scan-min-rows", type=int, default=SEQ_SCAN_MIN_ROWS)
+        parser.add_argument("--nested-loop-max-loops", type=int, default=NESTED_LOOP_MAX_LOOPS)
+        parser.add_argument("--noinput", "--no-input", action="store_false", dest="interactive")
+
+    def handle(self, *args, **options):
+        if options["sizes"] and options["label"]:
+            raise CommandError("--label нельзя использовать вместе с --sizes: имя снимка берётся из размера.")
+
+        failed = []
+        if options["sizes"]:
+            self._confirm_truncate(options["interactive"])
+            for size in (int(value) for value in options["sizes"].split(",")):
+                self.stdout.write(f"Генерация набора данных на {size} пользователей...")
+                call_command("generate_dataset", users=size, truncate=True, interactive=False, stdout=self.stdout)
+                if not self._process(f"users-{size}", options):
+                    failed.append(f"users-{size}")
+        else:
+            label = options["label"] or f"users-{User.objects.unfiltered().count()}"
+            if not self._process(label, options):
+                failed.append(label)
+
+        if failed:
+            raise CommandError(f"Планы изменились или появились предупреждения: {', '.join(failed)}")
+
+    def _confirm_truncate(self, interactive: bool) -> None:
+        # --sizes очищает таблицы пользователей, подписок и заказов: только для локальной БД.
+        if not settings.DEBUG:
+            raise CommandError("--sizes очищает данные и доступен только при DEBUG=True.")
+        if interactive:
+            answer = input(
+                "Таблицы пользователей, тарифов, продуктов, подписок и заказов будут очищены. Продолжить? [y/N] "
+            )
+            if answer.lower() != "y":
+                raise CommandError("Отменено.")
+
+    def _process(self, label: str, options: dict) -> bool:
+        plans = capture_plans(
+            only=options["only"],
+            seq_scan_min_rows=options["seq_scan_min_rows"],
+            nested_loop_max_loops=options["nested_loop_max_loops"],
+        )
+        path = Path(options["dir"]) / f"{label}.json"
+
+        if options["update"]:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            snapshot = {"environment": snapshot_metadata(label), "plans": plans}
+            path.write_text(json.dumps(snapshot, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+            for name, entry in plans.items():
+                for warning in entry["warnings"]:
+                    self.stdout.write(self.style.WARNING(f"[{label}] {name}: {warning}"))
+            self.stdout.write(self.style.SUCCESS(f"Снимок {len(plans)} планов сохранён в {path}"))
+            return True
+
+        try:
+            baseline = json.loads(path.read_text(encoding="utf-8"))["plans"]
+        except (OSError, ValueError, KeyError) as e:
+            raise CommandError(f"Не удалось прочитать снимок {path}: {e}. Создайте его с --update.")
+
+        if options["only"]:
+            baseline = {name: entry for name, entry in baseline.items() if options["only"] in name}
+
+        changes = diff_plans(baseline, plans)
+        for change in changes:
+            if change["status"] == "missing":
+                self.stdout.write(self.style.WARNING(f"[{label}] {change['name']}: запрос больше не выполняется"))
+                continue
+            if change["status"] == "new":
+                self.stdout.write(self.style.WARNING(f"[{label}] {change['name']}: новый запрос, нет в снимке"))
+            for line in change.get("diff", []):
+                self.stdout.write(f"[{label}] {change['name']}: {line}")
+            for warning in change["new_warnings"]:
+                self.stdout.write(self.style.ERROR(f"[{label}] {change['name']}: {warning}"))
+
+        if changes:
+            return False
+        self.stdout.write(self.style.SUCCESS(f"[{label}] Формы {len(plans)} планов совпадают со снимком."))
+        return True
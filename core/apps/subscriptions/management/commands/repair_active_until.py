@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand
+from django.db.models import (
+    F,
+    Q,
+)
+
+from core.apps.user.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Пересчитывает денормализованное поле User.active_until по подпискам. "
+        "Нужна после заполнения поля миграцией, ручных правок в БД и загрузки данных в обход сервиса подписок."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=5000)
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Только посчитать пользователей с расхождением, ничего не меняя.",
+        )
+
+    def handle(self, *args, **options):
+        queryset = User.objects.unfiltered().order_by("pk")
+        drifted = (
+            Q(active_until__isnull=True, expected__isnull=False)
+            | Q(active_until__isnull=False, expected__isnull=True)
+            | ~Q(active_until=F("expected"))
+        )
+        processed = repaired = 0
+        last_pk = None
+        while True:
+            chunk_queryset = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            chunk = list(chunk_queryset.values_list("pk", flat=True)[: options["chunk_size"]])
+            if not chunk:
+                break
+            last_pk = chunk[-1]
+            processed += len(chunk)
+
+            stale_ids = list(
+                User.objects.unfiltered()
+                .filter(pk__in=chunk)
+                .annotate(expected=User.objects.active_until_subquery())
+                .filter(drifted)
+                .values_list("pk", flat=True)
+            )
+            if stale_ids and not options["dry_run"]:
+                User.objects.refresh_active_until(stale_ids)
+            repaired += len(stale_ids)
+            self.stdout.write(f"Проверено {processed}, расхождений {repaired}")
+
+        verb = "найдено" if options["dry_run"] else "исправлено"
+        self.stdout.write(self.style.SUCCESS(f"Пользователей {processed}, {verb} расхождений: {repaired}"))
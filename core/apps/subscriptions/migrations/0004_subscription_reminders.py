@@ -0,0 +1,65 @@
+# Generated by Django 5.2 on 2026-10-19 09:39
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import (
+    migrations,
+    models,
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("subscriptions", "0003_alter_subscription_is_active"),
+        ("tariff", "0002_alter_tariff_table"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SubscriptionReminder",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("end_date", models.DateField()),
+                ("days_before", models.PositiveSmallIntegerField()),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("pending", "В процессе отправки"), ("sent", "Отправлено"), ("failed", "Ошибка")],
+                        default="pending",
+                        max_length=10,
+                    ),
+                ),
+                ("error", models.TextField(blank=True, null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Напоминание о подписке",
+                "verbose_name_plural": "Напоминания о подписках",
+                "db_table": "subscription_reminders",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="subscription",
+            index=models.Index(
+                condition=models.Q(("is_active", True), ("is_deleted", False)),
+                fields=["end_date"],
+                name="subscription_active_end_idx",
+            ),
+        ),
+        migrations.AddField(
+            model_name="subscriptionreminder",
+            name="subscription",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE, related_name="reminders", to="subscriptions.subscription"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="subscriptionreminder",
+            constraint=models.UniqueConstraint(
+                fields=("subscription", "end_date", "days_before"), name="uniq_subscription_reminder"
+            ),
+        ),
+    ]
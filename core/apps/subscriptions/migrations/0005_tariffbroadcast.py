@@ -0,0 +1,79 @@
+# Generated by Django 5.2 on 2026-10-19 09:54
+
+import uuid
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import (
+    migrations,
+    models,
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("subscriptions", "0004_subscription_reminders"),
+        ("tariff", "0002_alter_tariff_table"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TariffBroadcast",
+            fields=[
+                ("created_at", models.DateTimeField(auto_now_add=True, verbose_name="Дата создания")),
+                ("updated_at", models.DateTimeField(auto_now=True, verbose_name="Дата изменения")),
+                ("is_deleted", models.BooleanField(default=False)),
+                ("deleted_at", models.DateTimeField(blank=True, null=True)),
+                ("id", models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ("message", models.TextField()),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("queued", "В очереди"),
+                            ("running", "Выполняется"),
+                            ("completed", "Завершена"),
+                            ("failed", "Ошибка"),
+                        ],
+                        default="queued",
+                        max_length=10,
+                    ),
+                ),
+                ("total", models.PositiveIntegerField(default=0)),
+                ("processed", models.PositiveIntegerField(default=0)),
+                ("sent", models.PositiveIntegerField(default=0)),
+                ("failed", models.PositiveIntegerField(default=0)),
+                ("last_user_id", models.UUIDField(blank=True, null=True)),
+                ("latency_total_ms", models.FloatField(default=0)),
+                ("latency_max_ms", models.FloatField(default=0)),
+                ("latency_histogram", models.JSONField(blank=True, default=dict)),
+                ("started_at", models.DateTimeField(blank=True, null=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                ("error", models.TextField(blank=True, null=True)),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="broadcasts",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "tariff",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="broadcasts", to="tariff.tariff"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Рассылка по тарифу",
+                "verbose_name_plural": "Рассылки по тарифам",
+                "db_table": "tariff_broadcasts",
+                "ordering": ("-created_at",),
+            },
+        ),
+    ]
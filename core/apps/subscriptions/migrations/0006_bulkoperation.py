@@ -0,0 +1,82 @@
+# Generated by Django 5.2 on 2026-10-19 10:13
+
+import uuid
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import (
+    migrations,
+    models,
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("subscriptions", "0005_tariffbroadcast"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BulkOperation",
+            fields=[
+                ("created_at", models.DateTimeField(auto_now_add=True, verbose_name="Дата создания")),
+                ("updated_at", models.DateTimeField(auto_now=True, verbose_name="Дата изменения")),
+                ("is_deleted", models.BooleanField(default=False)),
+                ("deleted_at", models.DateTimeField(blank=True, null=True)),
+                ("id", models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                (
+                    "action",
+                    models.CharField(
+                        choices=[
+                            ("extend_subscriptions", "Продление подписок"),
+                            ("deactivate_subscriptions", "Деактивация подписок"),
+                            ("soft_delete_subscriptions", "Удаление подписок"),
+                            ("restore_subscriptions", "Восстановление подписок"),
+                            ("soft_delete_users", "Удаление пользователей"),
+                            ("restore_users", "Восстановление пользователей"),
+                        ],
+                        max_length=32,
+                    ),
+                ),
+                ("params", models.JSONField(blank=True, default=dict)),
+                ("object_ids", models.JSONField(default=list)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("queued", "В очереди"),
+                            ("running", "Выполняется"),
+                            ("completed", "Завершена"),
+                            ("failed", "Ошибка"),
+                        ],
+                        default="queued",
+                        max_length=10,
+                    ),
+                ),
+                ("total", models.PositiveIntegerField(default=0)),
+                ("processed", models.PositiveIntegerField(default=0)),
+                ("updated", models.PositiveIntegerField(default=0)),
+                ("started_at", models.DateTimeField(blank=True, null=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                ("error", models.TextField(blank=True, null=True)),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="bulk_operations",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Массовая операция",
+                "verbose_name_plural": "Массовые операции",
+                "db_table": "bulk_operations",
+                "ordering": ("-created_at",),
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:00
+
+from django.db import (
+    migrations,
+    models,
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("subscriptions", "0007_uuid7_primary_keys"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="tariffbroadcast",
+            name="heartbeat_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
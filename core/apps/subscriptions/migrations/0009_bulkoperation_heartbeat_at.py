@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:01
+
+from django.db import (
+    migrations,
+    models,
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("subscriptions", "0008_tariffbroadcast_heartbeat_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="bulkoperation",
+            name="heartbeat_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -3,12 +3,13 @@ import uuid
 from django.db import models
 
 from core.apps.common.models import TimedBaseModel
+from core.apps.common.uuid7 import uuid7
 
 
 class Subscription(TimedBaseModel):
     id = models.UUIDField(
         primary_key=True,
-        default=uuid.uuid4,
+        default=uuid7,
         editable=False,
     )
 
@@ -31,11 +32,265 @@ class Subscription(TimedBaseModel):
     )
 
     class Meta:
+        ordering = ("-id",)
         unique_together = (
             "user",
             "tariff",
             "start_date",
         )
+        indexes = [
+            models.Index(
+                fields=["end_date"],
+                condition=models.Q(is_active=True, is_deleted=False),
+                name="subscription_active_end_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user} - {self.tariff}"
+
+
+class SubscriptionReminder(models.Model):
+    """
+    Журнал напоминаний об окончании подписки.
+
+    Уникальность (subscription, end_date, days_before) гарантирует, что одно и то же
+    напоминание не уйдёт дважды, а продление подписки (новая end_date) даст новое.
+    """
+
+    STATUS_PENDING = "pending"
+    STATUS_SENT = "sent"
+    STATUS_FAILED = "failed"
+
+    subscription = models.ForeignKey(
+        Subscription,
+        on_delete=models.CASCADE,
+        related_name="reminders",
+    )
+    end_date = models.DateField()
+    days_before = models.PositiveSmallIntegerField()
+    status = models.CharField(
+        max_length=10,
+        choices=[
+            (STATUS_PENDING, "В процессе отправки"),
+            (STATUS_SENT, "Отправлено"),
+            (STATUS_FAILED, "Ошибка"),
+        ],
+        default=STATUS_PENDING,
+    )
+    error = models.TextField(
+        null=True,
+        blank=True,
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+    )
+
+    class Meta:
+        db_table = "subscription_reminders"
+        verbose_name = "Напоминание о подписке"
+        verbose_name_plural = "Напоминания о подписках"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["subscription", "end_date", "days_before"],
+                name="uniq_subscription_reminder",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.subscription_id} - {self.end_date} (-{self.days_before}d): {self.status}"
+
+
+class TariffBroadcast(TimedBaseModel):
+    """
+    Рассылка сообщения всем активным подписчикам тарифа.
+
+    Хранит контрольную точку (`last_user_id`) и счётчики прогресса, поэтому
+    прерванная рассылка продолжается с места остановки.
+    """
+
+    STATUS_QUEUED = "queued"
+    STATUS_RUNNING = "running"
+    STATUS_COMPLETED = "completed"
+    STATUS_FAILED = "failed"
+
+    id = models.UUIDField(
+        primary_key=True,
+        default=uuid.uuid4,
+        editable=False,
+    )
+    tariff = models.ForeignKey(
+        "tariff.Tariff",
+        on_delete=models.CASCADE,
+        related_name="broadcasts",
+    )
+    created_by = models.ForeignKey(
+        "user.User",
+        on_delete=models.SET_NULL,
+        related_name="broadcasts",
+        null=True,
+        blank=True,
+    )
+    message = models.TextField()
+    status = models.CharField(
+        max_length=10,
+        choices=[
+            (STATUS_QUEUED, "В очереди"),
+            (STATUS_RUNNING, "Выполняется"),
+            (STATUS_COMPLETED, "Завершена"),
+            (STATUS_FAILED, "Ошибка"),
+        ],
+        default=STATUS_QUEUED,
+    )
+    total = models.PositiveIntegerField(
+        default=0,
+    )
+    processed = models.PositiveIntegerField(
+        default=0,
+    )
+    sent = models.PositiveIntegerField(
+        default=0,
+    )
+    failed = models.PositiveIntegerField(
+        default=0,
+    )
+    last_user_id = models.UUIDField(
+        null=True,
+        blank=True,
+    )
+    latency_total_ms = models.FloatField(
+        default=0,
+    )
+    latency_max_ms = models.FloatField(
+        default=0,
+    )
+    latency_histogram = models.JSONField(
+        default=dict,
+        blank=True,
+    )
+    started_at = models.DateTimeField(
+        null=True,
+        blank=True,
+    )
+    finished_at = models.DateTimeField(
+        null=True,
+        blank=True,
+    )
+    error = models.TextField(
+        null=True,
+        blank=True,
+    )
+    # Аренда выполняющей рассылку задачи (core.apps.common.leases).
+    heartbeat_at = models.DateTimeField(
+        null=True,
+        blank=True,
+    )
+
+    class Meta:
+        db_table = "tariff_broadcasts"
+        verbose_name = "Рассылка по тарифу"
+        verbose_name_plural = "Рассылки по тарифам"
+        ordering = ("-created_at",)
+
+    def __str__(self):
+        return f"Broadcast {self.id} for {self.tariff_id} - {self.status}"
+
+
+class BulkOperation(TimedBaseModel):
+    """
+    Массовая операция админки над подписками или пользователями, выполняемая в Celery.
+
+    Ключи выбранных объектов хранятся в `object_ids`; `processed` — число уже обработанных ключей,
+    оно обновляется в транзакции каждой пачки, поэтому перезапущенная задача продолжает с места остановки.
+    """
+
+    ACTION_EXTEND_SUBSCRIPTIONS = "extend_subscriptions"
+    ACTION_DEACTIVATE_SUBSCRIPTIONS = "deactivate_subscriptions"
+    ACTION_SOFT_DELETE_SUBSCRIPTIONS = "soft_delete_subscriptions"
+    ACTION_RESTORE_SUBSCRIPTIONS = "restore_subscriptions"
+    ACTION_SOFT_DELETE_USERS = "soft_delete_users"
+    ACTION_RESTORE_USERS = "restore_users"
+
+    STATUS_QUEUED = "queued"
+    STATUS_RUNNING = "running"
+    STATUS_COMPLETED = "completed"
+    STATUS_FAILED = "failed"
+
+    id = models.UUIDField(
+        primary_key=True,
+        default=uuid.uuid4,
+        editable=False,
+    )
+    action = models.CharField(
+        max_length=32,
+        choices=[
+            (ACTION_EXTEND_SUBSCRIPTIONS, "Продление подписок"),
+            (ACTION_DEACTIVATE_SUBSCRIPTIONS, "Деактивация подписок"),
+            (ACTION_SOFT_DELETE_SUBSCRIPTIONS, "Удаление подписок"),
+            (ACTION_RESTORE_SUBSCRIPTIONS, "Восстановление подписок"),
+            (ACTION_SOFT_DELETE_USERS, "Удаление пользователей"),
+            (ACTION_RESTORE_USERS, "Восстановление пользователей"),
+        ],
+    )
+    params = models.JSONField(
+        default=dict,
+        blank=True,
+    )
+    object_ids = models.JSONField(
+        default=list,
+    )
+    created_by = models.ForeignKey(
+        "user.User",
+        on_delete=models.SET_NULL,
+        related_name="bulk_operations",
+        null=True,
+        blank=True,
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=[
+            (STATUS_QUEUED, "В очереди"),
+            (STATUS_RUNNING, "Выполняется"),
+            (STATUS_COMPLETED, "Завершена"),
+            (STATUS_FAILED, "Ошибка"),
+        ],
+        default=STATUS_QUEUED,
+    )
+    total = models.PositiveIntegerField(
+        default=0,
+    )
+    processed = models.PositiveIntegerField(
+        default=0,
+    )
+    updated = models.PositiveIntegerField(
+        default=0,
+    )
+    started_at = models.DateTimeField(
+        null=True,
+        blank=True,
+    )
+    finished_at = models.DateTimeField(
+        null=True,
+        blank=True,
+    )
+    error = models.TextField(
+        null=True,
+        blank=True,
+    )
+    # Аренда выполняющей операцию задачи (core.apps.common.leases).
+    heartbeat_at = models.DateTimeField(
+        null=True,
+        blank=True,
+    )
+
+    class Meta:
+        db_table = "bulk_operations"
+        verbose_name = "Массовая операция"
+        verbose_name_plural = "Массовые операции"
+        ordering = ("-created_at",)
+
+    def __str__(self):
+        return f"{self.get_action_display()} ({self.processed}/{self.total}) - {self.status}"
@@ -1,6 +1,10 @@
 from rest_framework import serializers
 
-from core.apps.subscriptions.models import Subscription
+from core.apps.subscriptions.models import (
+    Subscription,
+    TariffBroadcast,
+)
+from core.apps.subscriptions.services.broadcast_service import latency_percentile
 from core.apps.tariff.models import Tariff
 from core.apps.tariff.serializers import TariffSerializer
 
@@ -37,3 +41,49 @@ class SubscriptionSerializer(serializers.ModelSerializer):
             "start_date",
             "is_active",
         )
+
+
+class TariffBroadcastSerializer(serializers.ModelSerializer):
+    tariff_details = TariffSerializer(source="tariff", read_only=True)
+    completion_rate = serializers.SerializerMethodField(help_text="Доля обработанных получателей (0..1).")
+    success_rate = serializers.SerializerMethodField(help_text="Доля успешно отправленных сообщений (0..1).")
+    latency_avg_ms = serializers.SerializerMethodField()
+    latency_p95_ms = serializers.SerializerMethodField()
+
+    class Meta:
+        model = TariffBroadcast
+        fields = (
+            "id",
+            "tariff_details",
+            "message",
+            "status",
+            "total",
+            "processed",
+            "sent",
+            "failed",
+            "completion_rate",
+            "success_rate",
+            "latency_avg_ms",
+            "latency_p95_ms",
+            "latency_max_ms",
+            "latency_histogram",
+            "started_at",
+            "finished_at",
+            "error",
+            "created_at",
+        )
+        read_only_fields = fields
+
+    def get_completion_rate(self, obj: TariffBroadcast) -> float | None:
+        if obj.status == TariffBroadcast.STATUS_COMPLETED:
+            return 1.0
+        return obj.processed / obj.total if obj.total else None
+
+    def get_success_rate(self, obj: TariffBroadcast) -> float | None:
+        return obj.sent / obj.processed if obj.processed else None
+
+    def get_latency_avg_ms(self, obj: TariffBroadcast) -> float | None:
+        return obj.latency_total_ms / obj.processed if obj.processed else None
+
+    def get_latency_p95_ms(self, obj: TariffBroadcast) -> float | None:
+        return latency_percentile(obj.latency_histogram, 0.95)
@@ -0,0 +1,47 @@
+import uuid
+from abc import (
+    ABC,
+    abstractmethod,
+)
+from typing import (
+    Callable,
+    Iterable,
+)
+
+from core.api.schemas.pagination import PaginationIn
+from core.apps.common.telegram_sender import AsyncTelegramSender
+from core.apps.subscriptions.models import TariffBroadcast
+
+
+class BroadcastBaseService(ABC):
+
+    @abstractmethod
+    def create_broadcast(
+        self,
+        tariff_id: uuid.UUID,
+        message: str,
+        created_by_id: uuid.UUID | None = None,
+    ) -> TariffBroadcast:
+        pass
+
+    @abstractmethod
+    def get_broadcast_by_id(self, broadcast_id: uuid.UUID) -> TariffBroadcast:
+        pass
+
+    @abstractmethod
+    def get_broadcast_list(self, pagination_in: PaginationIn) -> Iterable[TariffBroadcast]:
+        pass
+
+    @abstractmethod
+    def get_broadcast_count(self) -> int:
+        pass
+
+    @abstractmethod
+    def run_broadcast(
+        self,
+        broadcast_id: uuid.UUID,
+        sender_factory: Callable[[], AsyncTelegramSender],
+        chunk_size: int = 1000,
+        max_duration: float | None = None,
+    ) -> TariffBroadcast:
+        pass
@@ -6,10 +6,12 @@ from abc import (
 from typing import (  # Iterable,
     Iterable,
     Optional,
+    Sequence,
 )
 
 from core.api.schemas.pagination import PaginationIn
 from core.api.v1.subscriptions.schemas.filters import SubscriptionFilter
+from core.apps.common.managers import ProgressCallback
 from core.apps.subscriptions.models import Subscription
 
 
@@ -64,3 +66,36 @@ class SubscriptionBaseService(ABC):
     @abstractmethod
     def get_subscription_count_archive(self, filters: SubscriptionFilter) -> int:
         pass
+
+    @abstractmethod
+    def extend_subscriptions(
+        self,
+        subscription_ids: Sequence[uuid.UUID],
+        months: int,
+        progress: ProgressCallback | None = None,
+    ) -> int:
+        pass
+
+    @abstractmethod
+    def deactivate_subscriptions(
+        self,
+        subscription_ids: Sequence[uuid.UUID],
+        progress: ProgressCallback | None = None,
+    ) -> int:
+        pass
+
+    @abstractmethod
+    def soft_delete_subscriptions(
+        self,
+        subscription_ids: Sequence[uuid.UUID],
+        progress: ProgressCallback | None = None,
+    ) -> int:
+        pass
+
+    @abstractmethod
+    def restore_subscriptions(
+        self,
+        subscription_ids: Sequence[uuid.UUID],
+        progress: ProgressCallback | None = None,
+    ) -> int:
+        pass
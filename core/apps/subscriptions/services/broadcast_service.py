@@ -0,0 +1,234 @@
+import asyncio
+import datetime
+import logging
+import time
+import uuid
+from typing import (
+    Callable,
+    Iterable,
+    List,
+    Tuple,
+)
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import (
+    Exists,
+    OuterRef,
+    QuerySet,
+)
+from django.utils import timezone
+
+from core.api.schemas.pagination import PaginationIn
+from core.apps.common.exceptions.broadcast_exceptions.broadcast_exc import (
+    BroadcastCreationError,
+    BroadcastNotFoundException,
+)
+from core.apps.common.exceptions.tariff_custom_exceptions.tariff_exc import TariffNotFoundError
+from core.apps.common.leases import (
+    claim_lease,
+    Lease,
+    LeaseLost,
+)
+from core.apps.common.telegram_sender import (
+    AsyncTelegramSender,
+    SendResult,
+)
+from core.apps.common.tracing import traced_methods
+from core.apps.subscriptions.models import (
+    Subscription,
+    TariffBroadcast,
+)
+from core.apps.subscriptions.services.base_broadcast_service import BroadcastBaseService
+from core.apps.tariff.models import Tariff
+from core.apps.user.models import User
+
+
+logger = logging.getLogger(__name__)
+
+# Верхние границы корзин гистограммы задержки отправки, мс.
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+def latency_bucket(latency_ms: float) -> str:
+    for bound in LATENCY_BUCKETS_MS:
+        if latency_ms <= bound:
+            return str(bound)
+    return "inf"
+
+
+def latency_percentile(histogram: dict, percentile: float) -> float | None:
+    """Оценивает перцентиль задержки (верхнюю границу корзины) по гистограмме рассылки."""
+    total = sum(histogram.values())
+    if not total:
+        return None
+
+    threshold = total * percentile
+    seen = 0
+    for bound in (*map(str, LATENCY_BUCKETS_MS), "inf"):
+        seen += histogram.get(bound, 0)
+        if seen >= threshold:
+            return float(bound)
+    return float("inf")
+
+
+@traced_methods
+class BroadcastService(BroadcastBaseService):
+    def _build_recipients_query(self, tariff_id: uuid.UUID, after_user_id: uuid.UUID | None = None) -> QuerySet:
+        """
+        Строит запрос получателей: пользователи с Telegram и активной подпиской на тариф.
+
+        Выборка идёт по ключу (keyset) `users.id > after_user_id`, поэтому каждая пачка
+        читается по индексу первичного ключа без OFFSET и без загрузки всех получателей в память.
+        """
+        active_subscriptions = Subscription.objects.filter(
+            user_id=OuterRef("pk"),
+            tariff_id=tariff_id,
+            is_active=True,
+            end_date__gte=timezone.localdate(),
+        )
+        queryset = User.objects.filter(Exists(active_subscriptions), telegram_id__isnull=False)
+        if after_user_id is not None:
+            queryset = queryset.filter(id__gt=after_user_id)
+        return queryset.order_by("id").values_list("id", "telegram_id")
+
+    def create_broadcast(
+        self,
+        tariff_id: uuid.UUID,
+        message: str,
+        created_by_id: uuid.UUID | None = None,
+    ) -> TariffBroadcast:
+        if not Tariff.objects.filter(id=tariff_id).exists():
+            raise TariffNotFoundError(tariff_id=tariff_id)
+
+        try:
+            broadcast = TariffBroadcast.objects.create(
+                tariff_id=tariff_id,
+                message=message,
+                created_by_id=created_by_id,
+            )
+        except Exception as e:
+            raise BroadcastCreationError(detail=f"Непредвиденная ошибка при создании рассылки: {e}")
+
+        from core.apps.subscriptions.tasks import run_tariff_broadcast
+
+        transaction.on_commit(lambda: run_tariff_broadcast.delay(broadcast_id=str(broadcast.id)))
+        return broadcast
+
+    def get_broadcast_by_id(self, broadcast_id: uuid.UUID) -> TariffBroadcast:
+        broadcast = TariffBroadcast.objects.get_or_none(id=broadcast_id)
+        if broadcast is None:
+            raise BroadcastNotFoundException(broadcast_id=broadcast_id)
+        return broadcast
+
+    def get_broadcast_list(self, pagination_in: PaginationIn) -> Iterable[TariffBroadcast]:
+        queryset = TariffBroadcast.objects.select_related("tariff")
+        return queryset[pagination_in.offset : pagination_in.offset + pagination_in.limit]
+
+    def get_broadcast_count(self) -> int:
+        return TariffBroadcast.objects.count()
+
+    def _checkpoint(
+        self,
+        broadcast: TariffBroadcast,
+        chunk: List[Tuple[uuid.UUID, int]],
+        results: List[SendResult],
+        lease: Lease,
+    ) -> None:
+        histogram = broadcast.latency_histogram
+        for result in results:
+            latency_ms = result.latency * 1000
+            bucket = latency_bucket(latency_ms)
+            histogram[bucket] = histogram.get(bucket, 0) + 1
+            broadcast.latency_total_ms += latency_ms
+            broadcast.latency_max_ms = max(broadcast.latency_max_ms, latency_ms)
+
+        sent = sum(1 for result in results if result.ok)
+        broadcast.sent += sent
+        broadcast.failed += len(results) - sent
+        broadcast.processed += len(results)
+        broadcast.last_user_id = chunk[-1][0]
+        broadcast.updated_at = timezone.now()
+        lease.renew(
+            sent=broadcast.sent,
+            failed=broadcast.failed,
+            processed=broadcast.processed,
+            last_user_id=broadcast.last_user_id,
+            latency_total_ms=broadcast.latency_total_ms,
+            latency_max_ms=broadcast.latency_max_ms,
+            latency_histogram=broadcast.latency_histogram,
+            updated_at=broadcast.updated_at,
+        )
+
+    def run_broadcast(
+        self,
+        broadcast_id: uuid.UUID,
+        sender_factory: Callable[[], AsyncTelegramSender],
+        chunk_size: int = 1000,
+        max_duration: float | None = None,
+    ) -> TariffBroadcast:
+        """
+        Выполняет рассылку пачками по `chunk_size` получателей.
+
+        После каждой пачки сохраняется контрольная точка, поэтому повторный запуск
+        (например, после перезапуска воркера) продолжает с последнего обработанного пользователя.
+        Запуск захватывает рассылку арендой: повторно доставленная задача, пока первая
+        выполняется, возвращает рассылку без отправки. Через `max_duration` секунд рассылка
+        возвращается в очередь (статус QUEUED) после текущей пачки: продолжение ставит вызывающий,
+        так одна задача не выходит за visibility_timeout брокера.
+        """
+        lease = claim_lease(
+            TariffBroadcast,
+            broadcast_id,
+            timeout=datetime.timedelta(seconds=settings.BACKGROUND_TASK_LEASE_SECONDS),
+            updated_at=timezone.now(),
+        )
+        broadcast = self.get_broadcast_by_id(broadcast_id)
+        if lease is None:
+            logger.info(
+                "Рассылка %s уже выполняется или завершена (%s), запуск пропущен", broadcast.id, broadcast.status
+            )
+            return broadcast
+
+        if broadcast.started_at is None:
+            broadcast.started_at = timezone.now()
+            broadcast.total = self._build_recipients_query(broadcast.tariff_id).count()
+            lease.renew(started_at=broadcast.started_at, total=broadcast.total)
+
+        stop_at = time.monotonic() + max_duration if max_duration is not None else None
+        loop = asyncio.new_event_loop()
+        sender = sender_factory()
+        try:
+            loop.run_until_complete(sender.__aenter__())
+            while True:
+                if stop_at is not None and time.monotonic() >= stop_at:
+                    broadcast.status = TariffBroadcast.STATUS_QUEUED
+                    lease.release(broadcast.status, updated_at=timezone.now())
+                    return broadcast
+
+                chunk = list(self._build_recipients_query(broadcast.tariff_id, broadcast.last_user_id)[:chunk_size])
+                if not chunk:
+                    break
+
+                results = loop.run_until_complete(
+                    sender.send_many((telegram_id, broadcast.message) for _, telegram_id in chunk)
+                )
+                self._checkpoint(broadcast, chunk, results, lease)
+
+            broadcast.status = TariffBroadcast.STATUS_COMPLETED
+            broadcast.finished_at = timezone.now()
+            lease.release(broadcast.status, finished_at=broadcast.finished_at, updated_at=broadcast.finished_at)
+            return broadcast
+        except LeaseLost:
+            # Аренда истекла и рассылку продолжает другой воркер: статус теперь принадлежит ему.
+            logger.warning("Рассылка %s перехвачена другим воркером, выполнение остановлено", broadcast.id)
+            broadcast.refresh_from_db()
+            return broadcast
+        except Exception as e:
+            broadcast.status = TariffBroadcast.STATUS_FAILED
+            broadcast.error = str(e)
+            lease.release(broadcast.status, error=broadcast.error, updated_at=timezone.now())
+            raise
+        finally:
+            loop.run_until_complete(sender.__aexit__(None, None, None))
+            loop.close()
@@ -0,0 +1,143 @@
+import datetime
+import logging
+import uuid
+from typing import (
+    Callable,
+    Dict,
+    Sequence,
+)
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from core.apps.common.leases import (
+    claim_lease,
+    LeaseLost,
+)
+from core.apps.common.managers import ProgressCallback
+from core.apps.common.tracing import traced_methods
+from core.apps.subscriptions.models import BulkOperation
+from core.apps.subscriptions.services.base_service import SubscriptionBaseService
+from core.apps.user.services.base_user_service import BaseUserService
+
+
+logger = logging.getLogger(__name__)
+
+BulkHandler = Callable[[Sequence[uuid.UUID], dict, ProgressCallback | None], int]
+
+
+@traced_methods
+class BulkOperationService:
+    """
+    Массовые действия админки над подписками и пользователями.
+
+    Небольшие выборки обрабатываются сразу (`execute`), большие сохраняются как `BulkOperation`
+    и выполняются задачей Celery (`run_operation`) с сохранением прогресса после каждой пачки.
+    """
+
+    def __init__(self, subscription_service: SubscriptionBaseService, user_service: BaseUserService):
+        self.handlers: Dict[str, BulkHandler] = {
+            BulkOperation.ACTION_EXTEND_SUBSCRIPTIONS: lambda ids, params, progress: (
+                subscription_service.extend_subscriptions(ids, months=params["months"], progress=progress)
+            ),
+            BulkOperation.ACTION_DEACTIVATE_SUBSCRIPTIONS: lambda ids, params, progress: (
+                subscription_service.deactivate_subscriptions(ids, progress=progress)
+            ),
+            BulkOperation.ACTION_SOFT_DELETE_SUBSCRIPTIONS: lambda ids, params, progress: (
+                subscription_service.soft_delete_subscriptions(ids, progress=progress)
+            ),
+            BulkOperation.ACTION_RESTORE_SUBSCRIPTIONS: lambda ids, params, progress: (
+                subscription_service.restore_subscriptions(ids, progress=progress)
+            ),
+            BulkOperation.ACTION_SOFT_DELETE_USERS: lambda ids, params, progress: (
+                user_service.soft_delete_users(ids, progress=progress)
+            ),
+            BulkOperation.ACTION_RESTORE_USERS: lambda ids, params, progress: (
+                user_service.restore_users(ids, progress=progress)
+            ),
+        }
+
+    def execute(self, action: str, object_ids: Sequence[uuid.UUID], params: dict | None = None) -> int:
+        """Выполняет действие в текущем процессе. Возвращает число обновлённых строк."""
+        return self.handlers[action](object_ids, params or {}, None)
+
+    def create_operation(
+        self,
+        action: str,
+        object_ids: Sequence[uuid.UUID],
+        params: dict | None = None,
+        created_by_id: uuid.UUID | None = None,
+    ) -> BulkOperation:
+        """Сохраняет операцию и ставит её выполнение в очередь после коммита."""
+        operation = BulkOperation.objects.create(
+            action=action,
+            params=params or {},
+            object_ids=[str(object_id) for object_id in object_ids],
+            total=len(object_ids),
+            created_by_id=created_by_id,
+        )
+
+        from core.apps.subscriptions.tasks import run_bulk_operation
+
+        transaction.on_commit(lambda: run_bulk_operation.delay(operation_id=str(operation.id)))
+        return operation
+
+    def run_operation(self, operation_id: uuid.UUID) -> BulkOperation:
+        """
+        Выполняет сохранённую операцию, начиная с первого необработанного ключа.
+
+        Счётчики прогресса обновляются в транзакции каждой пачки вместе с самим UPDATE,
+        поэтому повторный запуск не обрабатывает пачку дважды. Запуск захватывает операцию
+        арендой, которую продлевает каждая пачка: повторно доставленная задача, пока первая
+        выполняется, возвращает операцию без изменений, а пачка воркера, потерявшего аренду,
+        откатывается.
+        """
+        now = timezone.now()
+        lease = claim_lease(
+            BulkOperation,
+            operation_id,
+            timeout=datetime.timedelta(seconds=settings.BACKGROUND_TASK_LEASE_SECONDS),
+            updated_at=now,
+        )
+        operation = BulkOperation.objects.get(id=operation_id)
+        if lease is None:
+            logger.info(
+                "Массовая операция %s уже выполняется или завершена (%s), запуск пропущен",
+                operation.id,
+                operation.status,
+            )
+            return operation
+
+        if operation.started_at is None:
+            operation.started_at = now
+            lease.renew(started_at=now)
+
+        def progress(processed: int, updated: int) -> None:
+            lease.renew(
+                processed=F("processed") + processed,
+                updated=F("updated") + updated,
+                updated_at=timezone.now(),
+            )
+
+        remaining = [uuid.UUID(object_id) for object_id in operation.object_ids[operation.processed :]]
+        try:
+            self.handlers[operation.action](remaining, operation.params, progress)
+        except LeaseLost:
+            # Аренда истекла и операцию продолжает другой воркер; пачка этого воркера откатилась.
+            logger.warning("Массовая операция %s перехвачена другим воркером, выполнение остановлено", operation.id)
+            operation.refresh_from_db()
+            return operation
+        except Exception as e:
+            operation.refresh_from_db(fields=["processed", "updated"])
+            operation.status = BulkOperation.STATUS_FAILED
+            operation.error = str(e)
+            lease.release(operation.status, error=operation.error, updated_at=timezone.now())
+            raise
+
+        operation.refresh_from_db(fields=["processed", "updated"])
+        operation.status = BulkOperation.STATUS_COMPLETED
+        operation.finished_at = timezone.now()
+        lease.release(operation.status, finished_at=operation.finished_at, updated_at=operation.finished_at)
+        return operation
@@ -0,0 +1,202 @@
+import asyncio
+import datetime
+import logging
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import (
+    Callable,
+    Iterator,
+    List,
+    Tuple,
+)
+
+from django.db import connection
+from django.db.models import (
+    Exists,
+    OuterRef,
+    QuerySet,
+)
+from django.utils import timezone
+from psycopg2.extras import execute_values
+
+from core.apps.common.telegram_sender import (
+    AsyncTelegramSender,
+    SendResult,
+)
+from core.apps.common.tracing import traced_methods
+from core.apps.subscriptions.models import (
+    Subscription,
+    SubscriptionReminder,
+)
+
+
+logger = logging.getLogger(__name__)
+
+ReminderRow = Tuple[uuid.UUID, int, datetime.date, str]
+
+CLAIM_REMINDERS_SQL = """
+    INSERT INTO subscription_reminders (subscription_id, end_date, days_before, status, created_at, updated_at)
+    VALUES %s
+    ON CONFLICT (subscription_id, end_date, days_before) DO UPDATE
+        SET status = EXCLUDED.status, updated_at = EXCLUDED.updated_at
+        WHERE subscription_reminders.status = 'failed'
+           OR (
+               subscription_reminders.status = 'pending'
+               AND subscription_reminders.updated_at < NOW() - make_interval(secs => {stale_seconds})
+           )
+    RETURNING subscription_id
+"""
+
+
+@dataclass
+class ReminderCampaignStats:
+    selected: int = 0
+    claimed: int = 0
+    sent: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+
+
+@traced_methods
+class ExpiryReminderService:
+    """
+    Кампания напоминаний об окончании подписки через Telegram.
+
+    Подписки, истекающие через `days_before` дней, читаются серверным курсором
+    вместе с `users.telegram_id` и обрабатываются пачками:
+
+    1. пачка «захватывается» в журнале `subscription_reminders` (INSERT ... ON CONFLICT),
+       поэтому уже отправленные напоминания пропускаются, а параллельный запуск не дублирует отправку;
+    2. захваченные сообщения уходят через `AsyncTelegramSender` с ограничением частоты;
+    3. статусы фиксируются двумя UPDATE на пачку.
+
+    После падения процесса повторный запуск продолжает с места остановки: отправленные
+    записи исключаются запросом, а «зависшие» в статусе pending дольше `stale_after`
+    захватываются повторно.
+    """
+
+    def __init__(
+        self,
+        sender_factory: Callable[[], AsyncTelegramSender],
+        chunk_size: int = 1000,
+        stale_after: datetime.timedelta = datetime.timedelta(minutes=30),
+    ):
+        self.sender_factory = sender_factory
+        self.chunk_size = chunk_size
+        self.stale_after = stale_after
+
+    def _build_expiring_query(self, days_before: int, today: datetime.date) -> QuerySet:
+        already_sent = SubscriptionReminder.objects.filter(
+            subscription_id=OuterRef("pk"),
+            end_date=OuterRef("end_date"),
+            days_before=days_before,
+            status=SubscriptionReminder.STATUS_SENT,
+        )
+        return (
+            Subscription.objects.filter(
+                is_active=True,
+                end_date=today + datetime.timedelta(days=days_before),
+                user__telegram_id__isnull=False,
+                user__is_deleted=False,
+            )
+            .filter(~Exists(already_sent))
+            .order_by("id")
+            .values_list("id", "user__telegram_id", "end_date", "tariff__name")
+        )
+
+    def _iter_chunks(self, queryset: QuerySet) -> Iterator[List[ReminderRow]]:
+        chunk: List[ReminderRow] = []
+        for row in queryset.iterator(chunk_size=self.chunk_size):
+            chunk.append(row)
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _claim(self, chunk: List[ReminderRow], days_before: int) -> set[uuid.UUID]:
+        now = timezone.now()
+        values = [
+            (sub_id, end_date, days_before, SubscriptionReminder.STATUS_PENDING, now, now)
+            for sub_id, _, end_date, _ in chunk
+        ]
+        sql = CLAIM_REMINDERS_SQL.format(stale_seconds=int(self.stale_after.total_seconds()))
+        with connection.cursor() as cursor:
+            rows = execute_values(cursor.cursor, sql, values, page_size=len(values), fetch=True)
+        return {row[0] for row in rows}
+
+    def _mark(self, days_before: int, results: List[Tuple[ReminderRow, SendResult]]) -> None:
+        sent_ids = []
+        failed_ids_by_error = defaultdict(list)
+        for row, result in results:
+            if result.ok:
+                sent_ids.append(row[0])
+            else:
+                failed_ids_by_error[result.error].append(row[0])
+
+        end_date = results[0][0][2]
+        base_qs = SubscriptionReminder.objects.filter(end_date=end_date, days_before=days_before)
+        if sent_ids:
+            base_qs.filter(subscription_id__in=sent_ids).update(
+                status=SubscriptionReminder.STATUS_SENT,
+                error=None,
+                updated_at=timezone.now(),
+            )
+        for error, failed_ids in failed_ids_by_error.items():
+            base_qs.filter(subscription_id__in=failed_ids).update(
+                status=SubscriptionReminder.STATUS_FAILED,
+                error=error,
+                updated_at=timezone.now(),
+            )
+
+    @staticmethod
+    def _render_message(end_date: datetime.date, tariff_name: str) -> str:
+        return f"⏰ Ваша подписка «{tariff_name}» заканчивается {end_date:%d.%m.%Y}. Не забудьте её продлить!"
+
+    def run_campaign(self, days_before: int, today: datetime.date | None = None) -> ReminderCampaignStats:
+        """Отправляет напоминания всем пользователям, чья подписка истекает через `days_before` дней."""
+        today = today or timezone.localdate()
+        stats = ReminderCampaignStats()
+        started = time.monotonic()
+
+        loop = asyncio.new_event_loop()
+        sender = self.sender_factory()
+        try:
+            loop.run_until_complete(sender.__aenter__())
+
+            for chunk in self._iter_chunks(self._build_expiring_query(days_before, today)):
+                stats.selected += len(chunk)
+
+                claimed_ids = self._claim(chunk, days_before)
+                claimed = [row for row in chunk if row[0] in claimed_ids]
+                stats.claimed += len(claimed)
+                if not claimed:
+                    continue
+
+                results = loop.run_until_complete(
+                    sender.send_many(
+                        (telegram_id, self._render_message(end_date, tariff_name))
+                        for _, telegram_id, end_date, tariff_name in claimed
+                    )
+                )
+                paired = list(zip(claimed, results))
+                self._mark(days_before, paired)
+
+                sent = sum(1 for result in results if result.ok)
+                stats.sent += sent
+                stats.failed += len(results) - sent
+                logger.info(
+                    "Напоминания (за %s дн.): обработано %s, отправлено %s, ошибок %s",
+                    days_before,
+                    stats.selected,
+                    stats.sent,
+                    stats.failed,
+                )
+        finally:
+            loop.run_until_complete(sender.__aexit__(None, None, None))
+            loop.close()
+
+        stats.elapsed = time.monotonic() - started
+        return stats
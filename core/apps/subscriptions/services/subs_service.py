@@ -3,29 +3,65 @@ import uuid
 from typing import (
     Iterable,
     Optional,
+    Sequence,
 )
 
 from dateutil.relativedelta import relativedelta
-from django.db import transaction
-from django.db.models import Q
+from django.conf import settings
+from django.db import (
+    models,
+    transaction,
+)
+from django.db.models import (
+    ExpressionWrapper,
+    F,
+    Func,
+    Q,
+    Value,
+)
+from django.db.models.functions import Greatest
 from django.utils import timezone
 from psycopg2 import IntegrityError
 
 from core.api.schemas.pagination import PaginationIn
 from core.api.v1.subscriptions.schemas.filters import SubscriptionFilter
+from core.apps.common.cache_bus import ENTITLEMENT_ENTITY
 from core.apps.common.exceptions.subs_exception.subs_exc import (
     SubscriptionCreationError,
     SubscriptionDeleteError,
     SubscriptionNotFoundException,
     SubscriptionUpdateError,
 )
+from core.apps.common.invalidation import invalidate_on_commit
+from core.apps.common.managers import ProgressCallback
+from core.apps.common.tracing import traced_methods
 from core.apps.subscriptions.models import Subscription
 from core.apps.subscriptions.services.base_service import SubscriptionBaseService
 from core.apps.tariff.models import Tariff
+from core.apps.user.models import User
+
+
+class AddMonths(Func):
+    """`дата + N месяцев` в PostgreSQL; конец месяца сдвигается так же, как в relativedelta."""
 
+    template = "(%(expressions)s + make_interval(months => %(months)d))::date"
+    output_field = models.DateField()
 
+    def __init__(self, expression, months: int, **extra):
+        super().__init__(expression, months=int(months), **extra)
+
+
+@traced_methods
 class SubscriptionService(SubscriptionBaseService):
 
+    def _entitlement_changed(self, user_ids: Iterable[uuid.UUID]) -> None:
+        # Пересчёт `User.active_until` идёт в транзакции изменения подписок,
+        # кэши доступа сбрасываются только после её фиксации.
+        user_ids = set(user_ids)
+        User.objects.refresh_active_until(user_ids)
+        for user_id in user_ids:
+            invalidate_on_commit(ENTITLEMENT_ENTITY, user_id)
+
     def _build_query_subs(
         self,
         filters: SubscriptionFilter | None = None,
@@ -78,13 +114,15 @@ class SubscriptionService(SubscriptionBaseService):
             current_datetime = timezone.now()
             end_datetime = current_datetime + relativedelta(months=month_duration)
 
-            subscription = Subscription.objects.create(
-                user_id=user_id,
-                tariff_id=tariff_id,
-                start_date=current_datetime,
-                end_date=end_datetime,
-                is_active=True,
-            )
+            with transaction.atomic():
+                subscription = Subscription.objects.create(
+                    user_id=user_id,
+                    tariff_id=tariff_id,
+                    start_date=current_datetime,
+                    end_date=end_datetime,
+                    is_active=True,
+                )
+                self._entitlement_changed([user_id])
             return subscription
         except IntegrityError as e:
             error_message = str(e)
@@ -133,6 +171,7 @@ class SubscriptionService(SubscriptionBaseService):
 
             sub.full_clean()
             sub.save()
+            self._entitlement_changed([sub.user_id])
             return sub
 
         except IntegrityError as e:
@@ -157,6 +196,7 @@ class SubscriptionService(SubscriptionBaseService):
 
             subscription.full_clean()
             subscription.save()
+            self._entitlement_changed([subscription.user_id])
             return subscription
 
         except IntegrityError as e:
@@ -175,17 +215,20 @@ class SubscriptionService(SubscriptionBaseService):
 
             subscritpion.full_clean()
             subscritpion.save()
+            self._entitlement_changed([subscritpion.user_id])
             return subscritpion
         except IntegrityError as e:
             raise SubscriptionDeleteError(detail=f"Ошибка базы данных при мягком удалении тарифа: {e}")
         except Exception as e:
             raise SubscriptionDeleteError(detail=f"Неизвестная ошибка при мягком удалении тарифа: {e}")
 
+    @transaction.atomic
     def hard_delete_subscription(self, sub_id: uuid.UUID) -> Subscription:
         try:
             subscription = self.get_subscription_by_id(sub_id=sub_id)
 
             subscription.delete()
+            self._entitlement_changed([subscription.user_id])
             return subscription
         except Exception as e:
             raise SubscriptionDeleteError(detail=f"Неизвестная ошибка при мягком удалении тарифа: {e}")
@@ -216,3 +259,68 @@ class SubscriptionService(SubscriptionBaseService):
             )
             .count()
         )
+
+    def _bulk_update(
+        self,
+        subscription_ids: Sequence[uuid.UUID],
+        progress: ProgressCallback | None,
+        **values,
+    ) -> int:
+        def on_chunk(chunk: Sequence[uuid.UUID], updated: int) -> None:
+            self._entitlement_changed(
+                Subscription.objects.unfiltered().filter(pk__in=chunk).values_list("user_id", flat=True)
+            )
+            if progress is not None:
+                progress(len(chunk), updated)
+
+        return Subscription.objects.unfiltered().update_in_chunks(
+            subscription_ids,
+            chunk_size=settings.BULK_ACTION_CHUNK_SIZE,
+            on_chunk=on_chunk,
+            **values,
+        )
+
+    def extend_subscriptions(
+        self,
+        subscription_ids: Sequence[uuid.UUID],
+        months: int,
+        progress: ProgressCallback | None = None,
+    ) -> int:
+        # Истёкшая подписка продлевается от сегодняшнего дня, а не от даты окончания в прошлом.
+        new_end_date = AddMonths(Greatest(F("end_date"), Value(timezone.localdate())), months=months)
+        return self._bulk_update(subscription_ids, progress, end_date=new_end_date)
+
+    def deactivate_subscriptions(
+        self,
+        subscription_ids: Sequence[uuid.UUID],
+        progress: ProgressCallback | None = None,
+    ) -> int:
+        return self._bulk_update(subscription_ids, progress, is_active=False)
+
+    def soft_delete_subscriptions(
+        self,
+        subscription_ids: Sequence[uuid.UUID],
+        progress: ProgressCallback | None = None,
+    ) -> int:
+        return self._bulk_update(
+            subscription_ids,
+            progress,
+            is_deleted=True,
+            is_active=False,
+            deleted_at=timezone.now(),
+        )
+
+    def restore_subscriptions(
+        self,
+        subscription_ids: Sequence[uuid.UUID],
+        progress: ProgressCallback | None = None,
+    ) -> int:
+        # Восстановленная подписка снова активна, только если ещё не истекла.
+        is_current = ExpressionWrapper(Q(end_date__gte=timezone.localdate()), output_field=models.BooleanField())
+        return self._bulk_update(
+            subscription_ids,
+            progress,
+            is_deleted=False,
+            is_active=is_current,
+            deleted_at=None,
+        )
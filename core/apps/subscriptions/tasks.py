@@ -0,0 +1,92 @@
+import logging
+import uuid
+
+from celery import shared_task
+from django.conf import settings
+
+from core.apps.common.telegram_sender import AsyncTelegramSender
+from core.apps.subscriptions.models import (
+    BulkOperation,
+    TariffBroadcast,
+)
+from core.apps.subscriptions.services.base_broadcast_service import BroadcastBaseService
+from core.apps.subscriptions.services.bulk_operation_service import BulkOperationService
+from core.apps.subscriptions.services.reminder_service import ExpiryReminderService
+from core.project.containers import get_container
+
+
+logger = logging.getLogger(__name__)
+
+
+def build_telegram_sender() -> AsyncTelegramSender:
+    return AsyncTelegramSender(
+        bot_token=settings.TELEGRAM_BOT_TOKEN,
+        api_base_url=settings.TELEGRAM_API_BASE_URL,
+        rate_per_second=settings.TELEGRAM_SEND_RATE_PER_SECOND,
+        max_concurrency=settings.TELEGRAM_SEND_MAX_CONCURRENCY,
+    )
+
+
+@shared_task(ignore_result=True)
+def send_subscription_expiry_reminders(days_before: int):
+    service = ExpiryReminderService(
+        sender_factory=build_telegram_sender,
+        chunk_size=settings.SUBSCRIPTION_REMINDER_CHUNK_SIZE,
+    )
+    stats = service.run_campaign(days_before=days_before)
+    logger.info(
+        "Кампания напоминаний за %s дн. завершена: выбрано %s, захвачено %s, отправлено %s, ошибок %s, %.1f с",
+        days_before,
+        stats.selected,
+        stats.claimed,
+        stats.sent,
+        stats.failed,
+        stats.elapsed,
+    )
+    return stats.__dict__
+
+
+@shared_task(ignore_result=True)
+def run_tariff_broadcast(broadcast_id: str):
+    service: BroadcastBaseService = get_container().resolve(BroadcastBaseService)
+    broadcast = service.run_broadcast(
+        broadcast_id=uuid.UUID(broadcast_id),
+        sender_factory=build_telegram_sender,
+        chunk_size=settings.TARIFF_BROADCAST_CHUNK_SIZE,
+        max_duration=settings.TARIFF_BROADCAST_SLICE_SECONDS,
+    )
+    if broadcast.status == TariffBroadcast.STATUS_QUEUED:
+        # Отведённое задаче время истекло: продолжение с контрольной точки — новой задачей.
+        logger.info(
+            "Рассылка %s: обработано %s из %s, продолжение поставлено в очередь",
+            broadcast.id,
+            broadcast.processed,
+            broadcast.total,
+        )
+        run_tariff_broadcast.delay(broadcast_id=broadcast_id)
+        return
+    if broadcast.status != TariffBroadcast.STATUS_COMPLETED:
+        return
+    logger.info(
+        "Рассылка %s завершена: получателей %s, отправлено %s, ошибок %s",
+        broadcast.id,
+        broadcast.total,
+        broadcast.sent,
+        broadcast.failed,
+    )
+
+
+@shared_task(ignore_result=True)
+def run_bulk_operation(operation_id: str):
+    service: BulkOperationService = get_container().resolve(BulkOperationService)
+    operation = service.run_operation(operation_id=uuid.UUID(operation_id))
+    if operation.status != BulkOperation.STATUS_COMPLETED:
+        return
+    logger.info(
+        "Массовая операция %s (%s) завершена: обработано %s из %s, обновлено строк %s",
+        operation.id,
+        operation.action,
+        operation.processed,
+        operation.total,
+        operation.updated,
+    )
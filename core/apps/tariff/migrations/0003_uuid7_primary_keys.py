@@ -0,0 +1,25 @@
+# Generated by Django 5.2 on 2026-10-19 10:15
+
+from django.db import (
+    migrations,
+    models,
+)
+
+import core.apps.common.uuid7
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tariff", "0002_alter_tariff_table"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="tariff",
+            name="id",
+            field=models.UUIDField(
+                default=core.apps.common.uuid7.uuid7, editable=False, primary_key=True, serialize=False
+            ),
+        ),
+    ]
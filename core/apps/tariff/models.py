@@ -1,14 +1,13 @@
-import uuid
-
 from django.db import models
 
 from core.apps.common.models import TimedBaseModel
+from core.apps.common.uuid7 import uuid7
 
 
 class Tariff(TimedBaseModel):
     id = models.UUIDField(
         primary_key=True,
-        default=uuid.uuid4,
+        default=uuid7,
         editable=False,
     )
     name = models.CharField(
@@ -13,6 +13,7 @@ from psycopg2 import IntegrityError
 from core.api.schemas.pagination import PaginationIn
 from core.api.v1.tariff.schemas.filters import TariffFilter
 from core.api.v1.tariff.schemas.schemas import TariffUpdateSchema
+from core.apps.common.cache_bus import ENTITLEMENT_ENTITY
 from core.apps.common.exceptions.base_exception import ServiceException
 from core.apps.common.exceptions.tariff_custom_exceptions.tariff_exc import (
     EmptyTariffDataError,
@@ -22,10 +23,15 @@ from core.apps.common.exceptions.tariff_custom_exceptions.tariff_exc import (
     TariffNotFoundError,
     TariffUpdateError,
 )
+from core.apps.common.invalidation import invalidate_on_commit
+from core.apps.common.tracing import traced_methods
+from core.apps.subscriptions.models import Subscription
 from core.apps.tariff.models import Tariff
 from core.apps.tariff.services.tariff_base_service import TariffBaseService
+from core.apps.user.models import User
 
 
+@traced_methods
 class TariffService(TariffBaseService):
     def _build_tariff_query(self, filters: TariffFilter | None = None) -> Q:
         """Строит объект Q для фильтрации тарифов на основе заданных фильтров.
@@ -262,7 +268,15 @@ class TariffService(TariffBaseService):
             if tariff.is_deleted is False:
                 raise TariffActiveDeleteError(tariff_id=tariff_uuid)
 
-            tariff.hard_delete()
+            # Подписки тарифа удаляются каскадом: доступ их владельцев пересчитывается в той же транзакции.
+            with transaction.atomic():
+                user_ids = set(
+                    Subscription.objects.unfiltered().filter(tariff_id=tariff.id).values_list("user_id", flat=True)
+                )
+                tariff.hard_delete()
+                User.objects.refresh_active_until(user_ids)
+                for user_id in user_ids:
+                    invalidate_on_commit(ENTITLEMENT_ENTITY, user_id)
             return None
         except ServiceException as e:
             raise e
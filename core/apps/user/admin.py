@@ -2,7 +2,15 @@ from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.forms import UserCreationForm
 
-from core.apps.subscriptions.models import Subscription
+from core.apps.common.admin import ScalableAdminMixin
+from core.apps.common.cache_bus import USER_ENTITY
+from core.apps.common.invalidation import invalidate_on_commit
+from core.apps.subscriptions.bulk_actions import bulk_action
+from core.apps.subscriptions.models import (
+    BulkOperation,
+    Subscription,
+)
+from core.apps.user.revocation import revoke_users_on_commit
 
 from .models import User
 
@@ -29,18 +37,23 @@ class SubscriptionInline(admin.TabularInline):
 
 
 @admin.register(User)
-class UserAdmin(BaseUserAdmin):
+class UserAdmin(ScalableAdminMixin, BaseUserAdmin):
     inlines = (SubscriptionInline,)
     add_form = CustomUserCreationForm
     list_display = ("email", "first_name", "last_name", "phone", "is_staff", "subscriptions_overview", "is_active")
-    list_filter = ("is_staff", "is_superuser", "is_active", "groups")
+    list_filter = ("is_staff", "is_superuser", "is_active", "is_deleted", "groups")
+    actions = [
+        bulk_action(BulkOperation.ACTION_SOFT_DELETE_USERS, "Удалить (мягко)"),
+        bulk_action(BulkOperation.ACTION_RESTORE_USERS, "Восстановить"),
+    ]
 
     fieldsets = (
         (None, {"fields": ("email", "password")}),
         ("Личная информация", {"fields": ("first_name", "last_name", "phone")}),
         ("Права доступа", {"fields": ("is_active", "is_staff", "is_superuser", "groups", "user_permissions")}),
-        ("Даты", {"fields": ("last_login", "date_joined")}),
+        ("Даты", {"fields": ("last_login", "date_joined", "active_until")}),
     )
+    readonly_fields = ("active_until",)
     add_fieldsets = (
         (
             None,
@@ -50,7 +63,8 @@ class UserAdmin(BaseUserAdmin):
             },
         ),
     )
-    search_fields = ("email", "first_name", "last_name", "phone")
+    search_fields = ("^email",)
+    search_help_text = "UUID пользователя или начало email"
     ordering = ("email",)
 
     def subscriptions_overview(self, obj):
@@ -61,6 +75,27 @@ class UserAdmin(BaseUserAdmin):
 
     subscriptions_overview.short_description = "Подписки"
 
+    def get_queryset(self, request):
+        # Удалённые пользователи видны в админке, чтобы их можно было восстановить.
+        return self.model.objects.unfiltered()
+
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        # Пользователь и подписки из инлайна сохраняются мимо сервисов: пересчёт и инвалидация здесь.
+        self.model.objects.refresh_active_until([form.instance.pk])
+        invalidate_on_commit(USER_ENTITY, form.instance.pk)
+        if change and self.access_revoked(form):
+            # Выданные токены несут прежние права: отзываем их, как при деактивации через сервис.
+            revoke_users_on_commit([form.instance.pk])
+
+    @staticmethod
+    def access_revoked(form) -> bool:
+        """Сняты ли в форме флаги `is_active` или `is_staff`."""
+        return any(
+            field in form.changed_data and form.initial.get(field) and not form.cleaned_data.get(field)
+            for field in ("is_active", "is_staff")
+        )
+
 
 class SubscriptionInline(admin.TabularInline):
     model = Subscription
@@ -0,0 +1,123 @@
+from functools import lru_cache
+
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from core.apps.common.cache_bus import (
+    ENTITLEMENT_ENTITY,
+    USER_ENTITY,
+)
+from core.apps.common.invalidation import get_cache_bus
+from core.apps.common.ttl_cache import TTLCache
+from core.apps.user.models import User
+from core.apps.user.revocation import get_revocation_store
+from core.apps.user.tokens import (
+    EntitlementTokenUser,
+    get_entitlement_change_log,
+    has_entitlement_claims,
+)
+from core.project.metrics import record_cache_lookup
+
+
+# Поля снимка пользователя: всё, что читают мидлвари, классы разрешений и обработчики API.
+# Остальные поля у восстановленного из снимка объекта отложены и при обращении загрузятся из БД.
+USER_SNAPSHOT_FIELDS = (
+    "id",
+    "email",
+    "first_name",
+    "last_name",
+    "is_active",
+    "is_staff",
+    "is_superuser",
+    "active_until",
+)
+
+
+@lru_cache(1)
+def get_user_snapshot_cache() -> TTLCache:
+    """Кэш снимков пользователей; записи сбрасываются событиями шины инвалидации."""
+    cache = TTLCache(ttl=settings.JWT_USER_CACHE_TTL_SECONDS, max_size=settings.JWT_USER_CACHE_MAX_SIZE)
+    bus = get_cache_bus()
+    bus.subscribe(USER_ENTITY, cache.evict)
+    bus.subscribe(ENTITLEMENT_ENTITY, cache.evict)
+    return cache
+
+
+def load_user_snapshot(user_id: str) -> User | None:
+    """
+    Пользователь для JWT-аутентификации из локального кэша или из БД.
+
+    В кэше лежит кортеж значений `USER_SNAPSHOT_FIELDS`, а не модель: объект собирается
+    заново на каждый запрос, поэтому изменения одного запроса не видны другим.
+    """
+    cache = get_user_snapshot_cache() if settings.JWT_USER_CACHE_TTL_SECONDS > 0 else None
+    values = cache.get(user_id) if cache is not None else None
+    if cache is not None:
+        record_cache_lookup("jwt_user", hit=values is not None)
+
+    if values is None:
+        values = User.objects.filter(id=user_id).values_list(*USER_SNAPSHOT_FIELDS).first()
+        if values is None:
+            return None
+        if cache is not None:
+            cache.set(user_id, values)
+
+    return User.from_db(User.objects.db, USER_SNAPSHOT_FIELDS, values)
+
+
+class EntitlementJWTAuthentication(JWTAuthentication):
+    """
+    JWT-аутентификация, которая доверяет утверждениям о правах в токене.
+
+    Токен с утверждениями, выданный после последнего изменения прав пользователя,
+    превращается в `EntitlementTokenUser` без запроса к БД. Отозванные токены отклоняются
+    по фильтру Блума `RevocationStore`, тоже без запроса к БД. Остальные токены
+    (старые, без утверждений, устаревшие, режим выключен) получают пользователя
+    из кэша снимков `load_user_snapshot`.
+    """
+
+    def get_validated_token(self, raw_token):
+        validated_token = super().get_validated_token(raw_token)
+        if get_revocation_store().is_revoked(validated_token):
+            raise InvalidToken({"detail": "Токен отозван.", "code": "token_revoked"})
+        return validated_token
+
+    def get_user(self, validated_token):
+        if (
+            not settings.JWT_ENTITLEMENT_CLAIMS
+            or api_settings.USER_ID_CLAIM not in validated_token
+            or not has_entitlement_claims(validated_token)
+        ):
+            return self.get_stored_user(validated_token)
+
+        user = EntitlementTokenUser(validated_token)
+        if get_entitlement_change_log().is_stale(str(user.id), validated_token.get("iat", 0)):
+            return self.get_stored_user(validated_token)
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
+
+    def get_stored_user(self, validated_token) -> User:
+        """`JWTAuthentication.get_user`, но с загрузкой через кэш снимков."""
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        user = load_user_snapshot(str(user_id))
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            # Пароля нет в снимке: проверка отзыва по смене пароля идёт старым путём.
+            return super().get_user(validated_token)
+
+        return user
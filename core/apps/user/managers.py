@@ -1,6 +1,14 @@
 from django.contrib.auth.base_user import BaseUserManager
 from django.core.exceptions import ValidationError
 from django.core.validators import validate_email
+from django.db import (
+    models,
+    transaction,
+)
+from django.db.models import (
+    OuterRef,
+    Subquery,
+)
 
 from core.apps.common.managers import IsDeletedManager
 
@@ -55,3 +63,30 @@ class CustomUserManager(IsDeletedManager, BaseUserManager):
             return self.get(**kwargs)
         except self.model.DoesNotExist:
             return None
+
+    def active_until_subquery(self) -> Subquery:
+        """Последняя дата окончания активных неудалённых подписок пользователя (NULL, если их нет)."""
+        subscription_model = self.model._meta.get_field("user_subscription").related_model
+        return Subquery(
+            subscription_model.objects.filter(user_id=OuterRef("pk"), is_active=True)
+            .order_by("-end_date")
+            .values("end_date")[:1],
+            output_field=models.DateField(),
+        )
+
+    def refresh_active_until(self, user_ids) -> int:
+        """
+        Пересчитывает `active_until` пользователей по их подпискам.
+
+        Вызывается в транзакции, изменившей подписки. Строки пользователей сначала блокируются
+        (в порядке id, чтобы не было взаимоблокировок), и только потом выполняется UPDATE:
+        в READ COMMITTED он получает новый снимок и видит подписки конкурентной транзакции,
+        которая держала блокировку до нас.
+        """
+        user_ids = sorted(set(user_ids))
+        if not user_ids:
+            return 0
+        with transaction.atomic(using=self.db):
+            queryset = self.unfiltered().filter(pk__in=user_ids)
+            list(queryset.order_by("pk").select_for_update().values_list("pk", flat=True))
+            return queryset.update(active_until=self.active_until_subquery())
@@ -0,0 +1,27 @@
+# Generated by Django 5.2 on 2026-10-19 09:35
+
+from django.db import (
+    migrations,
+    models,
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("user", "0003_user_telegram_id_alter_user_is_active"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="phone_e164",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                max_length=16,
+                null=True,
+                verbose_name="Телефон (E.164)",
+            ),
+        ),
+    ]
@@ -0,0 +1,64 @@
+from django.db import migrations
+
+from core.apps.common.phone import normalize_phone
+
+
+BATCH_SIZE = 2000
+
+
+def backfill_phone_e164(apps, schema_editor):
+    """
+    Заполняет phone_e164 пачками по первичному ключу (keyset-пагинация),
+    каждая пачка коммитится отдельно, чтобы не держать долгих блокировок.
+    """
+    User = apps.get_model("user", "User")
+    manager = User._base_manager
+
+    last_id = None
+    while True:
+        batch_qs = manager.exclude(phone__isnull=True).order_by("id")
+        if last_id is not None:
+            batch_qs = batch_qs.filter(id__gt=last_id)
+
+        batch = list(batch_qs.only("id", "phone")[:BATCH_SIZE])
+        if not batch:
+            break
+
+        for user in batch:
+            user.phone_e164 = normalize_phone(user.phone)
+        manager.bulk_update(batch, ["phone_e164"])
+
+        last_id = batch[-1].id
+
+
+def reset_duplicate_phones(apps, schema_editor):
+    """
+    Оставляет канонический номер только у самого раннего пользователя,
+    чтобы уникальный индекс можно было построить на существующих данных.
+    """
+    schema_editor.execute(
+        """
+        UPDATE users SET phone_e164 = NULL
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, ROW_NUMBER() OVER (PARTITION BY phone_e164 ORDER BY date_joined, id) AS rn
+                FROM users
+                WHERE phone_e164 IS NOT NULL
+            ) ranked
+            WHERE ranked.rn > 1
+        )
+        """
+    )
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("user", "0004_user_phone_e164"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_phone_e164, migrations.RunPython.noop),
+        migrations.RunPython(reset_duplicate_phones, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2 on 2026-10-19 09:40
+
+from django.db import (
+    migrations,
+    models,
+)
+
+
+# Имя, которое Django дал бы ограничению уникальности для `unique=True`.
+CONSTRAINT_NAME = "users_phone_e164_6b3808f3_uniq"
+
+
+class Migration(migrations.Migration):
+    # Обычный AlterField строит уникальный индекс под блокировкой, запрещающей запись в users,
+    # на всё время построения. Индекс строится CONCURRENTLY (вне транзакции), а ограничение
+    # затем присоединяется к готовому индексу, что занимает мгновение. Поиск по phone_e164
+    # только точный, поэтому индекс `_like`, который создал бы AlterField, не нужен.
+    atomic = False
+
+    dependencies = [
+        ("user", "0005_backfill_user_phone_e164"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name="user",
+                    name="phone_e164",
+                    field=models.CharField(
+                        blank=True,
+                        editable=False,
+                        max_length=16,
+                        null=True,
+                        unique=True,
+                        verbose_name="Телефон (E.164)",
+                    ),
+                ),
+            ],
+            database_operations=[
+                migrations.RunSQL(
+                    sql=f"CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS {CONSTRAINT_NAME} ON users (phone_e164)",
+                    reverse_sql=f"DROP INDEX CONCURRENTLY IF EXISTS {CONSTRAINT_NAME}",
+                ),
+                migrations.RunSQL(
+                    sql=f"ALTER TABLE users ADD CONSTRAINT {CONSTRAINT_NAME} UNIQUE USING INDEX {CONSTRAINT_NAME}",
+                    reverse_sql=f"ALTER TABLE users DROP CONSTRAINT IF EXISTS {CONSTRAINT_NAME}",
+                ),
+            ],
+        ),
+    ]
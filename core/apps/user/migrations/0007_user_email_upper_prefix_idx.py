@@ -0,0 +1,30 @@
+# Generated by Django 5.2 on 2026-10-19 10:11
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import (
+    migrations,
+    models,
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("subscriptions", "0005_tariffbroadcast"),
+        ("tariff", "0002_alter_tariff_table"),
+        ("user", "0006_alter_user_phone_e164"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("email"), name="text_pattern_ops"
+                ),
+                name="user_email_upper_prefix_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2 on 2026-10-19 10:15
+
+from django.db import (
+    migrations,
+    models,
+)
+
+import core.apps.common.uuid7
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("user", "0007_user_email_upper_prefix_idx"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="user",
+            name="id",
+            field=models.UUIDField(
+                default=core.apps.common.uuid7.uuid7, editable=False, primary_key=True, serialize=False
+            ),
+        ),
+    ]
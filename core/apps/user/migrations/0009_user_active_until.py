@@ -0,0 +1,27 @@
+# Generated by Django 5.2 on 2026-10-19 10:18
+
+from django.db import (
+    migrations,
+    models,
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("user", "0008_uuid7_primary_keys"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="active_until",
+            field=models.DateField(
+                blank=True,
+                editable=False,
+                help_text="Последняя дата окончания действующих подписок. Обновляется сервисом подписок.",
+                null=True,
+                verbose_name="Подписка действует до",
+            ),
+        ),
+    ]
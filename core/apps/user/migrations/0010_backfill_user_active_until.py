@@ -0,0 +1,34 @@
+from django.db import migrations
+
+
+def backfill_active_until(apps, schema_editor):
+    """
+    Заполняет active_until одним UPDATE по агрегату подписок.
+
+    Пользователи без действующих подписок остаются с NULL. Расхождения, появившиеся
+    позже, исправляет `manage.py repair_active_until`.
+    """
+    schema_editor.execute(
+        """
+        UPDATE users SET active_until = latest.end_date
+        FROM (
+            SELECT user_id, MAX(end_date) AS end_date
+            FROM subscriptions_subscription
+            WHERE is_active AND NOT is_deleted
+            GROUP BY user_id
+        ) latest
+        WHERE latest.user_id = users.id
+        """
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("user", "0009_user_active_until"),
+        ("subscriptions", "0007_uuid7_primary_keys"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_active_until, migrations.RunPython.noop),
+    ]
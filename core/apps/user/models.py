@@ -1,23 +1,25 @@
-import uuid
-
 from django.contrib.auth.models import (
     AbstractUser,
     Group,
     Permission,
 )
+from django.contrib.postgres.indexes import OpClass
 from django.core.validators import RegexValidator
 from django.db import models
+from django.db.models.functions import Upper
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from core.apps.common.models import TimedBaseModel
+from core.apps.common.phone import normalize_phone
+from core.apps.common.uuid7 import uuid7
 from core.apps.user.managers import CustomUserManager
 
 
 class User(AbstractUser, TimedBaseModel):
     id = models.UUIDField(
         primary_key=True,
-        default=uuid.uuid4,
+        default=uuid7,
         editable=False,
     )
     username = None
@@ -65,6 +67,22 @@ class User(AbstractUser, TimedBaseModel):
         blank=True,
         null=True,
     )
+    phone_e164 = models.CharField(
+        max_length=16,
+        unique=True,
+        verbose_name="Телефон (E.164)",
+        blank=True,
+        null=True,
+        editable=False,
+    )
+
+    active_until = models.DateField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name="Подписка действует до",
+        help_text="Последняя дата окончания действующих подписок. Обновляется сервисом подписок.",
+    )
 
     subscriptions = models.ManyToManyField(
         "tariff.Tariff",
@@ -98,6 +116,41 @@ class User(AbstractUser, TimedBaseModel):
         verbose_name_plural = "Пользователи"
         ordering = ["-id"]
         db_table = "users"
+        indexes = [
+            # Поиск по началу email в админке и автодополнении (`email__istartswith` → UPPER(email) LIKE 'X%').
+            models.Index(
+                OpClass(Upper("email"), name="text_pattern_ops"),
+                name="user_email_upper_prefix_idx",
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_phone = instance.__dict__.get("phone", models.DEFERRED)
+        return instance
+
+    def phone_changed(self) -> bool:
+        """Изменён ли номер с момента загрузки из БД (для новой записи — всегда)."""
+        if self._state.adding:
+            return True
+        if "phone" not in self.__dict__:
+            # Отложенное поле не загружалось и не присваивалось.
+            return False
+        return self.phone != getattr(self, "_loaded_phone", models.DEFERRED)
+
+    def save(self, *args, **kwargs):
+        # Неизменённый номер не нормализуется заново: у дубликатов, которым миграция 0005
+        # обнулила phone_e164, повторная нормализация нарушила бы уникальность при любом сохранении.
+        update_fields = kwargs.get("update_fields")
+        if self.phone_changed():
+            self.phone_e164 = normalize_phone(self.phone)
+            if update_fields is not None and "phone" in update_fields:
+                kwargs["update_fields"] = {*update_fields, "phone_e164"}
+
+        super().save(*args, **kwargs)
+        if update_fields is None or "phone" in update_fields:
+            self._loaded_phone = self.__dict__.get("phone", models.DEFERRED)
 
     @property
     def full_name(self):
@@ -110,9 +163,8 @@ class User(AbstractUser, TimedBaseModel):
     def has_active_subscription(self) -> bool:
         """
         Проверяет, есть ли у пользователя действующая активная подписка.
+
+        Читает денормализованное поле `active_until`, без запроса к подпискам: истечение
+        подписки не требует записи, дата просто остаётся в прошлом.
         """
-        return self.user_subscription.filter(
-            is_active=True,
-            end_date__gte=timezone.now(),
-            is_deleted=False,
-        ).exists()
+        return self.active_until is not None and self.active_until >= timezone.localdate()
@@ -0,0 +1,188 @@
+"""
+Отзыв JWT без запроса к БД на каждый запрос.
+
+Отозванные токены (по `jti`) и пользователи (все токены, выданные до момента отзыва)
+хранятся в Redis с истечением, когда такие токены и так перестали бы действовать,
+и в индексе `jwt:revoked:index` (sorted set, score — время истечения). Каждый процесс
+держит фильтр Блума по индексу: отрицательный ответ фильтра окончателен, в Redis идут
+только срабатывания фильтра. Новые отзывы доходят до других процессов через шину
+инвалидации, пропущенные события подхватывает периодическая пересборка фильтра.
+"""
+
+import logging
+import math
+import threading
+import time
+from functools import lru_cache
+from typing import (
+    Iterable,
+    List,
+)
+
+import redis
+from django.conf import settings
+from django.db import transaction
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import Token
+
+from core.apps.common.bloom import BloomFilter
+from core.apps.common.cache_bus import (
+    CacheInvalidationBus,
+    REVOCATION_ENTITY,
+)
+from core.apps.common.exceptions.user_custom_exceptions.user_exc import TokenRevocationError
+from core.apps.common.invalidation import get_cache_bus
+from core.project.metrics import record_cache_lookup
+
+
+logger = logging.getLogger(__name__)
+
+REVOKED_KEY = "jwt:revoked:{member}"
+INDEX_KEY = "jwt:revoked:index"
+
+
+def token_member(jti: str) -> str:
+    return f"jti:{jti}"
+
+
+def user_member(user_id) -> str:
+    return f"user:{user_id}"
+
+
+class RevocationStore:
+    def __init__(
+        self,
+        redis_url: str,
+        bus: CacheInvalidationBus,
+        sync_interval: float,
+        capacity: int,
+        error_rate: float,
+    ):
+        self.client = redis.Redis.from_url(redis_url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        self.bus = bus
+        self.sync_interval = sync_interval
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._bloom = BloomFilter(capacity, error_rate)
+        # Отзывы, полученные из шины после начала последней пересборки фильтра.
+        self._recent: List[str] = []
+        self._synced_at = 0.0
+        # Пока фильтр ни разу не собран, его отрицательный ответ ничего не значит.
+        self._bloom_ready = False
+        self._lock = threading.Lock()
+
+    def revoke_token(self, token: Token) -> None:
+        """Отзывает один токен до истечения его срока действия."""
+        self._store({token_member(token[api_settings.JTI_CLAIM]): "1"}, expires_at=token["exp"])
+
+    def revoke_users(self, user_ids: Iterable) -> None:
+        """Отзывает все токены пользователей, выданные до текущего момента."""
+        now = time.time()
+        members = {user_member(user_id): repr(now) for user_id in user_ids}
+        if members:
+            self._store(members, expires_at=now + api_settings.REFRESH_TOKEN_LIFETIME.total_seconds())
+
+    def _store(self, values: dict, expires_at: float) -> None:
+        ttl = max(1, math.ceil(expires_at - time.time()))
+        try:
+            with self.client.pipeline() as pipe:
+                for member, value in values.items():
+                    pipe.set(REVOKED_KEY.format(member=member), value, ex=ttl)
+                pipe.zadd(INDEX_KEY, {member: expires_at for member in values})
+                pipe.execute()
+        except redis.RedisError as e:
+            logger.error("Не удалось сохранить отзыв токенов (%s шт.): %s", len(values), e)
+            raise TokenRevocationError()
+
+        # `publish` сначала доставляет событие локальным подписчикам, то есть и нашему фильтру.
+        for member in values:
+            self.bus.publish(REVOCATION_ENTITY, member)
+
+    def on_event(self, member: str | None) -> None:
+        """Колбэк шины инвалидации: новый отзыв или полный сброс (пересобрать фильтр при следующей проверке)."""
+        if member is None:
+            self._synced_at = 0.0
+            return
+        with self._lock:
+            self._bloom.add(member)
+            self._recent.append(member)
+
+    def is_revoked(self, token: Token) -> bool:
+        self._maybe_sync()
+
+        jti = token_member(token.get(api_settings.JTI_CLAIM))
+        user = user_member(token.get(api_settings.USER_ID_CLAIM))
+        if self._bloom_ready:
+            bloom = self._bloom
+            candidates = [member for member in (jti, user) if member in bloom]
+            record_cache_lookup("jwt_revocation_bloom", hit=not candidates)
+            if not candidates:
+                return False
+        else:
+            # Фильтр не собран (Redis был недоступен при пересборке): проверяем в Redis всё.
+            candidates = [jti, user]
+
+        try:
+            values = self.client.mget([REVOKED_KEY.format(member=member) for member in candidates])
+        except redis.RedisError as e:
+            logger.warning("Не удалось проверить отзыв токена в Redis: %s", e)
+            # Фильтр указал на отзыв, а проверить нельзя: надёжнее отказать. Без фильтра отказ
+            # означал бы отказ всем запросам, пока Redis недоступен, — как и с устаревшим фильтром,
+            # пропускаем.
+            return self._bloom_ready
+
+        for member, value in zip(candidates, values):
+            if value is None:
+                continue
+            if member == jti or token.get("iat", 0) <= float(value):
+                return True
+        return False
+
+    def _maybe_sync(self) -> None:
+        if time.monotonic() - self._synced_at < self.sync_interval:
+            return
+        with self._lock:
+            if time.monotonic() - self._synced_at < self.sync_interval:
+                return
+            # Следующая попытка не раньше чем через интервал, даже если эта не удастся.
+            self._synced_at = time.monotonic()
+            self._recent = []
+        try:
+            self.sync()
+        except redis.RedisError as e:
+            logger.warning("Не удалось пересобрать фильтр отозванных токенов: %s", e)
+
+    def sync(self) -> None:
+        """Пересобирает фильтр по индексу в Redis, попутно удаляя из индекса истёкшие отзывы."""
+        now = time.time()
+        with self.client.pipeline() as pipe:
+            pipe.zremrangebyscore(INDEX_KEY, "-inf", now)
+            pipe.zrangebyscore(INDEX_KEY, now, "+inf")
+            _, members = pipe.execute()
+
+        bloom = BloomFilter.from_items((member.decode() for member in members), self.capacity, self.error_rate)
+        with self._lock:
+            for member in self._recent:
+                bloom.add(member)
+            self._bloom = bloom
+            self._bloom_ready = True
+
+
+@lru_cache(1)
+def get_revocation_store() -> RevocationStore:
+    bus = get_cache_bus()
+    store = RevocationStore(
+        redis_url=settings.JWT_REVOCATION_REDIS_URL,
+        bus=bus,
+        sync_interval=settings.JWT_REVOCATION_SYNC_SECONDS,
+        capacity=settings.JWT_REVOCATION_BLOOM_CAPACITY,
+        error_rate=settings.JWT_REVOCATION_BLOOM_ERROR_RATE,
+    )
+    bus.subscribe(REVOCATION_ENTITY, store.on_event)
+    return store
+
+
+def revoke_users_on_commit(user_ids: Iterable) -> None:
+    """Отзывает токены пользователей после фиксации текущей транзакции; ошибка Redis только логируется."""
+    user_ids = list(user_ids)
+    transaction.on_commit(lambda: get_revocation_store().revoke_users(user_ids), robust=True)
@@ -82,3 +82,10 @@ class UserSerializer(serializers.ModelSerializer):
             "full_name",
             "subscriptions_details",
         )
+
+
+class LogoutSerializer(serializers.Serializer):
+    refresh = serializers.CharField(
+        required=False,
+        help_text="Refresh-токен, который тоже нужно отозвать.",
+    )
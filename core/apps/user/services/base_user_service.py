@@ -7,10 +7,12 @@ from typing import (
     Iterable,
     Iterator,
     Optional,
+    Sequence,
 )
 
 from core.api.schemas.pagination import PaginationIn
 from core.api.v1.users.schemas.filters import UserFilter
+from core.apps.common.managers import ProgressCallback
 from core.apps.user.models import User
 
 
@@ -123,3 +125,31 @@ class BaseUserService(ABC):
             Iterable[User]: Итерируемый объект по всем пользователям.
         """
         pass
+
+    @abstractmethod
+    def soft_delete_users(self, user_ids: Sequence[uuid.UUID], progress: ProgressCallback | None = None) -> int:
+        """
+        "Мягко" удаляет пользователей пачками одним UPDATE на пачку.
+
+        Args:
+            user_ids (Sequence[uuid.UUID]): Идентификаторы пользователей.
+            progress (ProgressCallback | None): Колбэк, вызываемый в транзакции каждой пачки.
+
+        Returns:
+            int: Число обновлённых строк.
+        """
+        pass
+
+    @abstractmethod
+    def restore_users(self, user_ids: Sequence[uuid.UUID], progress: ProgressCallback | None = None) -> int:
+        """
+        Восстанавливает "мягко" удаленных пользователей пачками одним UPDATE на пачку.
+
+        Args:
+            user_ids (Sequence[uuid.UUID]): Идентификаторы пользователей.
+            progress (ProgressCallback | None): Колбэк, вызываемый в транзакции каждой пачки.
+
+        Returns:
+            int: Число обновлённых строк.
+        """
+        pass
@@ -1,17 +1,26 @@
 import uuid
-from typing import Iterable
+from typing import (
+    Iterable,
+    Sequence,
+)
 
-from django.db import transaction
+from django.conf import settings
+from django.db import (
+    IntegrityError,
+    transaction,
+)
 from django.db.models import (
+    BooleanField,
+    ExpressionWrapper,
     Prefetch,
     Q,
 )
 from django.utils import timezone
-from psycopg2 import IntegrityError
 
 from core.api.schemas.pagination import PaginationIn
 from core.api.v1.users.schemas.filters import UserFilter
 from core.api.v1.users.schemas.user_schemas import UserUpdateIn
+from core.apps.common.cache_bus import USER_ENTITY
 from core.apps.common.exceptions.base_exception import ServiceException
 from core.apps.common.exceptions.user_custom_exceptions.user_exc import (
     EmptyUpdateDataError,
@@ -21,13 +30,20 @@ from core.apps.common.exceptions.user_custom_exceptions.user_exc import (
     UserEmailNotFoundException,
     UserExistsError,
     UserNotFoundException,
+    UserPhoneExistsError,
     UserUpdateError,
 )
+from core.apps.common.invalidation import invalidate_on_commit
+from core.apps.common.managers import ProgressCallback
+from core.apps.common.phone import normalize_phone
+from core.apps.common.tracing import traced_methods
 from core.apps.subscriptions.models import Subscription
 from core.apps.user.models import User
+from core.apps.user.revocation import revoke_users_on_commit
 from core.apps.user.services.base_user_service import BaseUserService
 
 
+@traced_methods
 class UserService(BaseUserService):
     def _build_user_query(
         self,
@@ -167,6 +183,29 @@ class UserService(BaseUserService):
         query = self._build_user_query(filters)
         return User.objects.unfiltered().filter(query, is_deleted=True, is_active=False).count()
 
+    def _ensure_phone_available(self, phone: str | None, user_id: uuid.UUID | None = None) -> None:
+        """
+        Проверяет, что номер телефона не принадлежит другому пользователю.
+
+        Номера сравниваются в формате E.164 по уникальному полю phone_e164, поэтому
+        `8 (912) 345-67-89` и `+79123456789` считаются одним номером.
+
+        Args:
+            phone (str | None): Номер телефона в произвольном формате.
+            user_id (uuid.UUID | None): ID пользователя, которому номер присваивается (при обновлении).
+
+        Raises:
+            UserPhoneExistsError: Если номер уже занят другим пользователем.
+        """
+        phone_e164 = normalize_phone(phone)
+        if phone_e164 is None:
+            return
+        duplicates = User.objects.filter(phone_e164=phone_e164)
+        if user_id is not None:
+            duplicates = duplicates.exclude(id=user_id)
+        if duplicates.exists():
+            raise UserPhoneExistsError()
+
     def create_user(self, email: str, password: str, first_name: str, last_name: str, phone: str) -> User:
         """
         Создает нового пользователя.
@@ -182,10 +221,12 @@ class UserService(BaseUserService):
             User: Созданный объект пользователя.
 
         Raises:
+            UserPhoneExistsError: Если номер телефона уже принадлежит другому пользователю.
             UserCreationError: Если произошла ошибка при создании пользователя (например,
                                пользователь с таким email уже существует или ошибка БД).
         """
         try:
+            self._ensure_phone_available(phone)
             user = User.objects.create_user(
                 email=email,
                 first_name=first_name,
@@ -194,9 +235,13 @@ class UserService(BaseUserService):
                 password=password,
             )
             return user
+        except UserPhoneExistsError:
+            raise
         except IntegrityError as e:
             if "unique constraint" in str(e).lower() and "email" in str(e).lower():
                 raise UserCreationError(detail="Пользователь с таким email уже существует.")
+            if "phone_e164" in str(e).lower():
+                raise UserPhoneExistsError()
             raise UserCreationError(detail=f"Ошибка базы данных при создании пользователя: {e}")
         except Exception as e:
             raise UserCreationError(detail=f"Неизвестная ошибка при создании пользователя: {e}")
@@ -220,11 +265,14 @@ class UserService(BaseUserService):
 
         Raises:
             UserNotFoundException: Если пользователь не найден.
+            UserPhoneExistsError: Если номер телефона уже принадлежит другому пользователю.
             UserCreationError: Если произошла ошибка базы данных (например, дубликат email)
                                или другая непредвиденная ошибка.
         """
         try:
             user = self.get_user_by_id(user_id=user_id)
+            if user_data.phone != user.phone:
+                self._ensure_phone_available(user_data.phone, user_id=user.id)
             user.email = user_data.email
             user.first_name = user_data.first_name
             user.last_name = user_data.last_name
@@ -233,10 +281,15 @@ class UserService(BaseUserService):
 
             user.full_clean()
             user.save()
+            invalidate_on_commit(USER_ENTITY, user.id)
             return user
+        except UserPhoneExistsError:
+            raise
         except IntegrityError as e:
             if "unique constraint" in str(e).lower() and "email" in str(e).lower():
                 raise UserUpdateError(detail="Пользователь с таким email уже существует.")
+            if "phone_e164" in str(e).lower():
+                raise UserPhoneExistsError()
             raise UserUpdateError(detail=f"Ошибка базы данных при полном обновлении пользователя: {e}")
         except Exception as e:
             raise UserUpdateError(detail=f"Неизвестная ошибка при полном обновлении пользователя: {e}")
@@ -257,6 +310,7 @@ class UserService(BaseUserService):
         Raises:
             EmptyUpdateDataError: Если в user_data не было предоставлено данных для обновления.
             UserNotFoundException: Если пользователь не найден.
+            UserPhoneExistsError: Если номер телефона уже принадлежит другому пользователю.
             UserCreationError: Если произошла ошибка базы данных (например, дубликат email)
                                или другая непредвиденная ошибка.
         """
@@ -273,7 +327,8 @@ class UserService(BaseUserService):
                 user.first_name = update_data["first_name"]
             if "last_name" in update_data:
                 user.last_name = update_data["last_name"]
-            if "phone" in update_data:
+            if "phone" in update_data and update_data["phone"] != user.phone:
+                self._ensure_phone_available(update_data["phone"], user_id=user.id)
                 user.phone = update_data["phone"]
 
             if "password" in update_data:
@@ -281,12 +336,15 @@ class UserService(BaseUserService):
 
             user.full_clean()
             user.save()
+            invalidate_on_commit(USER_ENTITY, user.id)
             return user
-        except UserNotFoundException:
+        except (UserNotFoundException, UserPhoneExistsError):
             raise
         except IntegrityError as e:
             if "unique constraint" in str(e).lower() and "email" in str(e).lower():
                 raise UserCreationError(detail="Пользователь с таким email уже существует.")
+            if "phone_e164" in str(e).lower():
+                raise UserPhoneExistsError()
             raise UserUpdateError(detail=f"Ошибка базы данных при частичном обновлении пользователя: {e}")
         except Exception as e:
             raise UserUpdateError(detail=f"Неизвестная ошибка при частичном обновлении пользователя: {e}")
@@ -294,6 +352,7 @@ class UserService(BaseUserService):
     def soft_delete_user(self, user_id: uuid.UUID) -> User:
         """
         Выполняет "мягкое" удаление пользователя, помечая его как удаленного и неактивного.
+        Все выданные пользователю токены отзываются после фиксации транзакции.
 
         Args:
             user_id (uuid.UUID): Уникальный идентификатор пользователя для мягкого удаления.
@@ -314,6 +373,8 @@ class UserService(BaseUserService):
 
             user.full_clean()
             user.save()
+            invalidate_on_commit(USER_ENTITY, user.id)
+            revoke_users_on_commit([user.id])
             return user
         except IntegrityError as e:
             raise UserNotFoundException(detail=f"Ошибка базы данных при мягком удалении пользователя: {e}")
@@ -343,6 +404,8 @@ class UserService(BaseUserService):
                 raise UserActiveDeleteError()
 
             user.hard_delete()
+            invalidate_on_commit(USER_ENTITY, user_id)
+            revoke_users_on_commit([user_id])
             return None
         except ServiceException as e:
             raise e
@@ -352,12 +415,26 @@ class UserService(BaseUserService):
     def get_user_by_phone(self, phone_number: str) -> User:
         """
         Получает пользователя по номеру телефона.
-        Поднимает UserNotFoundException, если пользователь не найден.
+
+        Номер приводится к формату E.164, поиск идёт по уникальному индексу phone_e164.
+
+        Args:
+            phone_number (str): Номер телефона в произвольном формате.
+
+        Returns:
+            User: Объект пользователя.
+
+        Raises:
+            UserNotFoundException: Если номер некорректен или пользователь не найден.
         """
-        try:
-            return User.objects.get(phone_number=phone_number)
-        except User.DoesNotExist:
-            raise UserNotFoundException(f"User with phone number {phone_number} not found.")
+        phone_e164 = normalize_phone(phone_number)
+        if phone_e164 is None:
+            raise UserNotFoundException()
+
+        user = User.objects.get_or_none(phone_e164=phone_e164)
+        if user is None:
+            raise UserNotFoundException()
+        return user
 
     def activate_user_and_set_telegram_id(self, phone_number: str, telegram_id: int) -> bool:
         """
@@ -382,5 +459,66 @@ class UserService(BaseUserService):
                 update_fields.append("is_active")
 
             user.save(update_fields=update_fields)
+            invalidate_on_commit(USER_ENTITY, user.id)
 
             return was_inactive
+
+    def _bulk_update(
+        self,
+        user_ids: Sequence[uuid.UUID],
+        progress: ProgressCallback | None,
+        revoke_tokens: bool = False,
+        **values,
+    ) -> int:
+        def on_chunk(chunk: Sequence[uuid.UUID], updated: int) -> None:
+            for user_id in chunk:
+                invalidate_on_commit(USER_ENTITY, user_id)
+            if revoke_tokens:
+                revoke_users_on_commit(chunk)
+            if progress is not None:
+                progress(len(chunk), updated)
+
+        return User.objects.unfiltered().update_in_chunks(
+            user_ids,
+            chunk_size=settings.BULK_ACTION_CHUNK_SIZE,
+            on_chunk=on_chunk,
+            **values,
+        )
+
+    def soft_delete_users(self, user_ids: Sequence[uuid.UUID], progress: ProgressCallback | None = None) -> int:
+        """
+        "Мягко" удаляет пользователей пачками: один UPDATE на пачку вместо сохранения каждой модели.
+        Выданные пользователям токены отзываются после фиксации каждой пачки.
+
+        Args:
+            user_ids (Sequence[uuid.UUID]): Идентификаторы пользователей.
+            progress (ProgressCallback | None): Колбэк, вызываемый в транзакции каждой пачки.
+
+        Returns:
+            int: Число обновлённых строк.
+        """
+        return self._bulk_update(
+            user_ids,
+            progress,
+            revoke_tokens=True,
+            is_deleted=True,
+            is_active=False,
+            deleted_at=timezone.now(),
+        )
+
+    def restore_users(self, user_ids: Sequence[uuid.UUID], progress: ProgressCallback | None = None) -> int:
+        """
+        Восстанавливает "мягко" удаленных пользователей пачками.
+
+        Активными снова становятся только пользователи, активированные через Telegram,
+        и сотрудники: мягкое удаление не должно активировать неподтверждённые аккаунты.
+
+        Args:
+            user_ids (Sequence[uuid.UUID]): Идентификаторы пользователей.
+            progress (ProgressCallback | None): Колбэк, вызываемый в транзакции каждой пачки.
+
+        Returns:
+            int: Число обновлённых строк.
+        """
+        is_activated = ExpressionWrapper(Q(telegram_id__isnull=False) | Q(is_staff=True), output_field=BooleanField())
+        return self._bulk_update(user_ids, progress, is_deleted=False, is_active=is_activated, deleted_at=None)
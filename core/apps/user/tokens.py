@@ -0,0 +1,222 @@
+"""
+JWT с утверждениями о правах доступа.
+
+В режиме JWT_ENTITLEMENT_CLAIMS токены при выдаче и обновлении получают подписанные
+утверждения `is_staff`, `is_active` и `subscription_active_until`, а аутентификация
+строит по ним `EntitlementTokenUser` без запроса к БД. Токен с утверждениями живёт
+JWT_ENTITLEMENT_ACCESS_TOKEN_LIFETIME: после изменения подписки клиент быстро обновит
+его и получит свежие утверждения.
+"""
+
+import datetime
+import threading
+import time
+import uuid
+from functools import (
+    cached_property,
+    lru_cache,
+)
+from typing import (
+    Any,
+    Dict,
+)
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+    TokenVerifySerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import (
+    AccessToken,
+    RefreshToken,
+    UntypedToken,
+)
+
+from core.apps.common.cache_bus import (
+    ENTITLEMENT_ENTITY,
+    USER_ENTITY,
+)
+from core.apps.common.invalidation import get_cache_bus
+from core.apps.user.revocation import get_revocation_store
+
+
+IS_STAFF_CLAIM = "is_staff"
+IS_ACTIVE_CLAIM = "is_active"
+ACTIVE_UNTIL_CLAIM = "subscription_active_until"
+ENTITLEMENT_CLAIMS = (IS_STAFF_CLAIM, IS_ACTIVE_CLAIM, ACTIVE_UNTIL_CLAIM)
+
+# Сколько изменений хранить, прежде чем выбрасывать записи старше срока жизни токенов.
+MAX_TRACKED_CHANGES = 10_000
+
+
+def entitlement_claims(user) -> Dict[str, Any]:
+    return {
+        IS_STAFF_CLAIM: user.is_staff,
+        IS_ACTIVE_CLAIM: user.is_active,
+        ACTIVE_UNTIL_CLAIM: user.active_until.isoformat() if user.active_until else None,
+    }
+
+
+def has_entitlement_claims(token) -> bool:
+    return all(claim in token for claim in ENTITLEMENT_CLAIMS)
+
+
+class EntitlementRefreshToken(RefreshToken):
+    """Refresh-токен, который передаёт access-токену утверждения о правах и сокращает его срок жизни."""
+
+    @classmethod
+    def for_user(cls, user) -> "EntitlementRefreshToken":
+        token = super().for_user(user)
+        token.set_entitlement_claims(user)
+        return token
+
+    def set_entitlement_claims(self, user) -> None:
+        for claim in ENTITLEMENT_CLAIMS:
+            self.payload.pop(claim, None)
+        if settings.JWT_ENTITLEMENT_CLAIMS:
+            self.payload.update(entitlement_claims(user))
+
+    @property
+    def access_token(self) -> AccessToken:
+        access = super().access_token
+        if has_entitlement_claims(access):
+            lifetime = min(settings.JWT_ENTITLEMENT_ACCESS_TOKEN_LIFETIME, api_settings.ACCESS_TOKEN_LIFETIME)
+            access.set_exp(from_time=access.current_time, lifetime=lifetime)
+        return access
+
+
+class EntitlementTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = EntitlementRefreshToken
+
+
+class EntitlementTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Обновление токена с пересчётом утверждений.
+
+    Повторяет `TokenRefreshSerializer.validate`, но загруженный пользователь не отбрасывается:
+    по нему обновляются утверждения, которые попадут в новый access-токен. Вместо приложения
+    token_blacklist отзыв проверяется и записывается в `RevocationStore`.
+    """
+
+    token_class = EntitlementRefreshToken
+
+    def validate(self, attrs: Dict[str, Any]) -> Dict[str, str]:
+        refresh = self.token_class(attrs["refresh"])
+        if get_revocation_store().is_revoked(refresh):
+            raise InvalidToken({"detail": "Токен отозван.", "code": "token_revoked"})
+
+        user_model = get_user_model()
+        user = user_model.objects.filter(
+            **{api_settings.USER_ID_FIELD: refresh.payload.get(api_settings.USER_ID_CLAIM)}
+        ).first()
+        if not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(self.error_messages["no_active_account"], "no_active_account")
+        refresh.set_entitlement_claims(user)
+
+        data = {"access": str(refresh.access_token)}
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                get_revocation_store().revoke_token(refresh)
+
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            refresh.outstand()
+
+            data["refresh"] = str(refresh)
+
+        return data
+
+
+class RevocationTokenVerifySerializer(TokenVerifySerializer):
+    """
+    Проверка токена с учётом отзыва.
+
+    Стандартный `TokenVerifySerializer` проверяет только подпись и срок действия
+    (и token_blacklist, который не используется), поэтому отозванный токен считался бы действительным.
+    """
+
+    def validate(self, attrs: Dict[str, Any]) -> Dict[Any, Any]:
+        token = UntypedToken(attrs["token"])
+        if get_revocation_store().is_revoked(token):
+            raise InvalidToken({"detail": "Токен отозван.", "code": "token_revoked"})
+        return {}
+
+
+class EntitlementTokenUser(TokenUser):
+    """Пользователь, восстановленный из утверждений токена; повторяет нужную API часть модели `User`."""
+
+    @cached_property
+    def id(self) -> uuid.UUID:
+        return uuid.UUID(str(self.token[api_settings.USER_ID_CLAIM]))
+
+    @cached_property
+    def pk(self) -> uuid.UUID:
+        return self.id
+
+    @cached_property
+    def is_active(self) -> bool:
+        return self.token.get(IS_ACTIVE_CLAIM, False)
+
+    @cached_property
+    def active_until(self) -> datetime.date | None:
+        value = self.token.get(ACTIVE_UNTIL_CLAIM)
+        return datetime.date.fromisoformat(value) if value else None
+
+    @property
+    def has_active_subscription(self) -> bool:
+        return self.active_until is not None and self.active_until >= timezone.localdate()
+
+
+class EntitlementChangeLog:
+    """
+    Время последнего изменения прав пользователей, полученное из шины инвалидации.
+
+    Токен, выданный до изменения, считается устаревшим: аутентификация загружает такого
+    пользователя из БД, пока клиент не обновит токен. После переподключения шины события
+    могли потеряться, поэтому устаревшими считаются все токены, выданные раньше.
+    Первое подключение при старте процесса не в счёт: истории изменений ещё нет,
+    и устаревание таких токенов ограничено их коротким сроком жизни.
+    """
+
+    def __init__(self, horizon: float):
+        self.horizon = horizon
+        self._changed_at: Dict[str, float] = {}
+        self._flushed_at = 0.0
+        self._connected = False
+        self._lock = threading.Lock()
+
+    def record(self, user_id: str | None) -> None:
+        now = time.time()
+        with self._lock:
+            if user_id is None:
+                if self._connected:
+                    self._flushed_at = now
+                    self._changed_at.clear()
+                self._connected = True
+                return
+            self._changed_at[user_id] = now
+            if len(self._changed_at) > MAX_TRACKED_CHANGES:
+                self._changed_at = {key: at for key, at in self._changed_at.items() if at > now - self.horizon}
+
+    def is_stale(self, user_id: str, issued_at: float) -> bool:
+        # `iat` округлён вниз до секунды, поэтому токен той же секунды тоже считается устаревшим.
+        return issued_at < max(self._flushed_at, self._changed_at.get(user_id, 0.0))
+
+
+@lru_cache(1)
+def get_entitlement_change_log() -> EntitlementChangeLog:
+    change_log = EntitlementChangeLog(horizon=api_settings.ACCESS_TOKEN_LIFETIME.total_seconds())
+    bus = get_cache_bus()
+    bus.subscribe(USER_ENTITY, change_log.record)
+    # Полный сброс шина передаёт каждому колбэку: учитываем его один раз, через подписку на USER_ENTITY.
+    bus.subscribe(ENTITLEMENT_ENTITY, lambda user_id: user_id is not None and change_log.record(user_id))
+    return change_log
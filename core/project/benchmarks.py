@@ -0,0 +1,265 @@
+"""
+Набор бенчмарков сервисного слоя и HTTP-стека.
+
+Бенчмарки запускаются на заранее заполненной БД (`manage.py generate_dataset`)
+командой `manage.py benchmark_services`, результаты сохраняются в JSON и сравниваются
+с базовой линией командой `manage.py compare_benchmarks`.
+"""
+
+import datetime
+import platform
+import statistics
+import subprocess
+import time
+from dataclasses import dataclass
+from typing import (
+    Callable,
+    Dict,
+    List,
+)
+
+import django
+from django.db import connection
+from django.test import (
+    Client,
+    override_settings,
+)
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.api.schemas.pagination import PaginationIn
+from core.api.v1.products.schemas.filters import OrderFilter
+from core.api.v1.subscriptions.schemas.filters import SubscriptionFilter
+from core.api.v1.tariff.schemas.filters import TariffFilter
+from core.api.v1.users.schemas.filters import UserFilter
+from core.apps.products.models import Order
+from core.apps.products.services.base_order_service import OrderBaseService
+from core.apps.subscriptions.models import Subscription
+from core.apps.subscriptions.services.base_service import SubscriptionBaseService
+from core.apps.tariff.models import Tariff
+from core.apps.tariff.services.tariff_base_service import TariffBaseService
+from core.apps.user.models import User
+from core.apps.user.services.base_user_service import BaseUserService
+from core.apps.user.tokens import EntitlementRefreshToken
+from core.project.containers import get_container
+
+
+@dataclass
+class BenchmarkCase:
+    name: str
+    func: Callable[[], object]
+
+
+@dataclass
+class BenchmarkFixtures:
+    admin: User
+    subscriber: User
+    client: Client
+    admin_client: Client
+    # Токен без утверждений о правах: пользователь загружается через кэш снимков.
+    plain_client: Client
+
+
+def load_fixtures() -> BenchmarkFixtures:
+    """Выбирает из заполненной БД администратора и пользователя с активной подпиской."""
+    admin = User.objects.filter(is_staff=True, is_active=True).order_by("email").first()
+    subscriber_id = (
+        Subscription.objects.filter(is_active=True, end_date__gte=timezone.localdate(), user__is_active=True)
+        .values_list("user_id", flat=True)
+        .order_by("user_id")
+        .first()
+    )
+    if admin is None or subscriber_id is None:
+        raise RuntimeError(
+            "В БД нет активного администратора или пользователя с активной подпиской: "
+            "заполните её командой generate_dataset."
+        )
+    subscriber = User.objects.get(id=subscriber_id)
+
+    client = Client(HTTP_AUTHORIZATION=f"Bearer {EntitlementRefreshToken.for_user(subscriber).access_token}")
+    admin_client = Client(HTTP_AUTHORIZATION=f"Bearer {EntitlementRefreshToken.for_user(admin).access_token}")
+    plain_client = Client(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(subscriber).access_token}")
+    return BenchmarkFixtures(
+        admin=admin,
+        subscriber=subscriber,
+        client=client,
+        admin_client=admin_client,
+        plain_client=plain_client,
+    )
+
+
+def build_cases(fixtures: BenchmarkFixtures) -> List[BenchmarkCase]:
+    container = get_container()
+    subscriptions: SubscriptionBaseService = container.resolve(SubscriptionBaseService)
+    users: BaseUserService = container.resolve(BaseUserService)
+    orders: OrderBaseService = container.resolve(OrderBaseService)
+    tariffs: TariffBaseService = container.resolve(TariffBaseService)
+
+    page = PaginationIn(offset=0, limit=20)
+    deep_page = PaginationIn(offset=10_000, limit=20)
+    subscriber_id = fixtures.subscriber.id
+
+    def http_get(client: Client, path: str) -> Callable[[], object]:
+        def request():
+            response = client.get(path)
+            if response.status_code != 200:
+                raise RuntimeError(f"GET {path} вернул {response.status_code}")
+            return response
+
+        return request
+
+    return [
+        BenchmarkCase(
+            "subscriptions.list.admin",
+            lambda: list(subscriptions.get_subscription_list(SubscriptionFilter(), page, is_admin=True)),
+        ),
+        BenchmarkCase(
+            "subscriptions.list.admin.deep_offset",
+            lambda: list(subscriptions.get_subscription_list(SubscriptionFilter(), deep_page, is_admin=True)),
+        ),
+        BenchmarkCase(
+            "subscriptions.list.user",
+            lambda: list(subscriptions.get_subscription_list(SubscriptionFilter(), page, user_id=subscriber_id)),
+        ),
+        BenchmarkCase(
+            "subscriptions.list.admin.search",
+            lambda: list(
+                subscriptions.get_subscription_list(SubscriptionFilter(search="Тариф 1"), page, is_admin=True)
+            ),
+        ),
+        BenchmarkCase(
+            "subscriptions.count.admin",
+            lambda: subscriptions.get_subscription_count(SubscriptionFilter(), is_admin=True),
+        ),
+        BenchmarkCase(
+            "subscriptions.count.user",
+            lambda: subscriptions.get_subscription_count(SubscriptionFilter(), user_id=subscriber_id),
+        ),
+        BenchmarkCase("users.list", lambda: list(users.get_users_list(UserFilter(), page))),
+        BenchmarkCase("users.list.search", lambda: list(users.get_users_list(UserFilter(search="user1"), page))),
+        BenchmarkCase("orders.list.admin", lambda: list(orders.get_order_list(OrderFilter(), page, is_admin=True))),
+        BenchmarkCase(
+            "orders.list.user",
+            lambda: list(orders.get_order_list(OrderFilter(), page, user_id=subscriber_id)),
+        ),
+        BenchmarkCase("tariffs.list", lambda: list(tariffs.get_tariff_list(TariffFilter(), page))),
+        BenchmarkCase("user.has_active_subscription", lambda: fixtures.subscriber.has_active_subscription),
+        BenchmarkCase("http.subscriptions.list.user", http_get(fixtures.client, "/api/v1/subscriptions/")),
+        BenchmarkCase(
+            "http.subscriptions.list.user.no_claims",
+            http_get(fixtures.plain_client, "/api/v1/subscriptions/"),
+        ),
+        BenchmarkCase("http.orders.list.user", http_get(fixtures.client, "/api/v1/orders/")),
+        BenchmarkCase("http.orders.list.user.no_claims", http_get(fixtures.plain_client, "/api/v1/orders/")),
+        BenchmarkCase("http.users.list.admin", http_get(fixtures.admin_client, "/api/v1/users/")),
+        BenchmarkCase("http.tariffs.list.user", http_get(fixtures.client, "/api/v1/tariff/")),
+    ]
+
+
+def run_case(case: BenchmarkCase, iterations: int, warmup: int) -> Dict[str, float]:
+    """Выполняет кейс `warmup` раз без замера, затем `iterations` раз с замером времени и числа SQL-запросов."""
+    for _ in range(warmup):
+        case.func()
+
+    timings = []
+    with CaptureQueriesContext(connection) as queries:
+        for _ in range(iterations):
+            started = time.perf_counter()
+            case.func()
+            timings.append((time.perf_counter() - started) * 1000)
+
+    timings.sort()
+    return {
+        "iterations": iterations,
+        "min_ms": round(timings[0], 3),
+        "median_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(timings[max(0, int(len(timings) * 0.95) - 1)], 3),
+        "max_ms": round(timings[-1], 3),
+        "stdev_ms": round(statistics.stdev(timings), 3) if len(timings) > 1 else 0.0,
+        "queries": len(queries.captured_queries) / iterations,
+    }
+
+
+def describe_environment() -> Dict[str, object]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "commit": commit,
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "dataset": {
+            "users": User.objects.unfiltered().count(),
+            "tariffs": Tariff.objects.unfiltered().count(),
+            "subscriptions": Subscription.objects.unfiltered().count(),
+            "orders": Order.objects.unfiltered().count(),
+        },
+    }
+
+
+def run_suite(iterations: int, warmup: int, only: str | None = None, report: Callable[[str], None] = print) -> dict:
+    # Запросы к HTTP-стеку идут через тестовый клиент: его хост должен быть разрешён,
+    # а бюджет SQL, ограничитель частоты запросов и сброс нагрузки не должны прерывать замер.
+    with override_settings(
+        ALLOWED_HOSTS=["testserver"],
+        SQL_QUERY_BUDGET_STRICT=False,
+        RATE_LIMIT_ENABLED=False,
+        LOAD_SHEDDING_ENABLED=False,
+    ):
+        fixtures = load_fixtures()
+        results = {}
+        for case in build_cases(fixtures):
+            if only and only not in case.name:
+                continue
+            results[case.name] = run_case(case, iterations=iterations, warmup=warmup)
+            report(f"{case.name}: median {results[case.name]['median_ms']} мс, p95 {results[case.name]['p95_ms']} мс")
+
+    return {"environment": describe_environment(), "results": results}
+
+
+def compare_results(baseline: dict, current: dict, threshold: float, metric: str = "median_ms") -> List[dict]:
+    """
+    Сравнивает результаты по метрике `metric`.
+
+    Кейс считается регрессией, если метрика выросла больше чем на `threshold` (доля)
+    или если выросло число SQL-запросов на итерацию.
+    """
+    rows = []
+    for name, current_stats in current["results"].items():
+        baseline_stats = baseline["results"].get(name)
+        if baseline_stats is None:
+            rows.append({"name": name, "status": "new", "current": current_stats[metric]})
+            continue
+
+        change = current_stats[metric] / baseline_stats[metric] - 1 if baseline_stats[metric] else 0.0
+        queries_grew = current_stats["queries"] > baseline_stats["queries"]
+        if change > threshold or queries_grew:
+            status = "regression"
+        elif change < -threshold:
+            status = "improvement"
+        else:
+            status = "ok"
+        rows.append(
+            {
+                "name": name,
+                "status": status,
+                "baseline": baseline_stats[metric],
+                "current": current_stats[metric],
+                "change": change,
+                "baseline_queries": baseline_stats["queries"],
+                "current_queries": current_stats["queries"],
+            }
+        )
+
+    for name in baseline["results"].keys() - current["results"].keys():
+        rows.append({"name": name, "status": "missing", "baseline": baseline["results"][name][metric]})
+    return rows
@@ -1,6 +1,14 @@
 import os
 
 from celery import Celery
+from celery.signals import (
+    after_task_publish,
+    before_task_publish,
+    task_failure,
+    task_postrun,
+    task_prerun,
+    worker_process_init,
+)
 from django.conf import settings
 
 
@@ -12,3 +20,57 @@ app.config_from_object("django.conf:settings", namespace="CELERY")
 app.conf.broker_url = settings.CELERY_BROKER_URL
 
 app.autodiscover_tasks()
+
+
+@worker_process_init.connect
+def reset_cache_bus(**kwargs):
+    from core.apps.common.invalidation import get_cache_bus
+
+    get_cache_bus().reset_after_fork()
+
+
+@worker_process_init.connect
+def init_worker_tracing(**kwargs):
+    # Процессор спанов работает в фоновом потоке, поэтому настраивается в каждом процессе после fork.
+    from core.project.tracing import setup_tracing
+
+    setup_tracing(service_name=settings.TRACING_CELERY_SERVICE_NAME)
+
+
+@before_task_publish.connect
+def start_publish_timer(headers=None, routing_key=None, **kwargs):
+    from core.project.metrics import celery_publish_timer
+    from core.project.tracing import celery_spans
+
+    celery_publish_timer.start(headers=headers)
+    celery_spans.before_publish(headers=headers, routing_key=routing_key)
+
+
+@after_task_publish.connect
+def stop_publish_timer(headers=None, **kwargs):
+    from core.project.metrics import celery_publish_timer
+    from core.project.tracing import celery_spans
+
+    celery_publish_timer.stop(headers=headers)
+    celery_spans.after_publish(headers=headers)
+
+
+@task_prerun.connect
+def start_task_span(task_id=None, task=None, **kwargs):
+    from core.project.tracing import celery_spans
+
+    celery_spans.task_started(task_id=task_id, task=task)
+
+
+@task_failure.connect
+def record_task_failure(task_id=None, exception=None, **kwargs):
+    from core.project.tracing import celery_spans
+
+    celery_spans.task_failed(task_id=task_id, exception=exception)
+
+
+@task_postrun.connect
+def finish_task_span(task_id=None, state=None, **kwargs):
+    from core.project.tracing import celery_spans
+
+    celery_spans.task_finished(task_id=task_id, state=state)
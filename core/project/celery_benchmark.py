@@ -0,0 +1,42 @@
+"""
+Задачи-зонды для `manage.py benchmark_celery`.
+
+Модуль не попадает в autodiscover: воркеры бенчмарка подключают его через `--include`,
+а команда публикует задачи по имени, поэтому рабочие воркеры эти задачи не регистрируют.
+"""
+
+import time
+
+import redis
+from celery import shared_task
+from django.conf import settings
+
+
+PROBE_TASK_NAME = "core.project.celery_benchmark.probe"
+SLOW_TASK_NAME = "core.project.celery_benchmark.slow"
+
+
+def latency_key(run_id: str) -> str:
+    return f"celery-benchmark:{run_id}"
+
+
+_client: redis.Redis | None = None
+
+
+def _get_client() -> redis.Redis:
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(settings.CELERY_BROKER_URL)
+    return _client
+
+
+@shared_task(name=PROBE_TASK_NAME, ignore_result=True)
+def probe(run_id: str, published_at: float):
+    """Записывает сквозную задержку (публикация → начало выполнения) в список Redis."""
+    _get_client().rpush(latency_key(run_id), time.time() - published_at)
+
+
+@shared_task(name=SLOW_TASK_NAME, ignore_result=True)
+def slow(duration: float):
+    """Имитирует долгую массовую задачу."""
+    time.sleep(duration)
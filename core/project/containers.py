@@ -4,7 +4,10 @@ import punq
 
 from core.apps.products.services.base_order_service import OrderBaseService
 from core.apps.products.services.order_service import OrderService
+from core.apps.subscriptions.services.base_broadcast_service import BroadcastBaseService
 from core.apps.subscriptions.services.base_service import SubscriptionBaseService
+from core.apps.subscriptions.services.broadcast_service import BroadcastService
+from core.apps.subscriptions.services.bulk_operation_service import BulkOperationService
 from core.apps.subscriptions.services.subs_service import SubscriptionService
 from core.apps.tariff.services.tarif_service import TariffService
 from core.apps.tariff.services.tariff_base_service import TariffBaseService
@@ -36,5 +39,16 @@ def _initialize_container():
         OrderBaseService,
         factory=lambda: OrderService(),
     )
+    container.register(
+        BroadcastBaseService,
+        factory=lambda: BroadcastService(),
+    )
+    container.register(
+        BulkOperationService,
+        factory=lambda: BulkOperationService(
+            subscription_service=container.resolve(SubscriptionBaseService),
+            user_service=container.resolve(BaseUserService),
+        ),
+    )
 
     return container
@@ -0,0 +1,142 @@
+"""
+Сброс нагрузки и сроки выполнения запросов.
+
+`LoadTracker` считает запросы, выполняющиеся в процессе, и среднее время обработки
+по url_name (экспоненциальное скользящее среднее). По ним `LoadSheddingMiddleware`
+оценивает, уложится ли новый запрос в бюджет задержки, и отклоняет его заранее.
+`RequestDeadline` переносит оставшееся до срока время в `statement_timeout` Postgres
+и не даёт запросу начинать новые SQL-запросы после истечения срока.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict
+
+from django.db import (
+    DatabaseError,
+    OperationalError,
+)
+
+
+logger = logging.getLogger("load_shedding")
+
+# Вес нового замера в скользящем среднем времени обработки.
+EWMA_ALPHA = 0.2
+
+# Первые слова SQL-запросов, которые ничего не записывают. Остальное считается записью:
+# ошибиться в сторону записи безопасно — ответ представления просто не будет заменён на 503.
+READ_ONLY_STATEMENTS = ("SELECT", "SHOW", "SET", "RESET", "EXPLAIN", "SAVEPOINT", "RELEASE", "ROLLBACK")
+
+
+class DeadlineExceeded(DatabaseError):
+    """Срок выполнения HTTP-запроса истёк до начала очередного SQL-запроса."""
+
+
+def is_query_canceled(error: Exception) -> bool:
+    """Postgres отменил запрос по statement_timeout (SQLSTATE 57014)."""
+    return isinstance(error, OperationalError) and getattr(error.__cause__, "pgcode", None) == "57014"
+
+
+class LoadTracker:
+    def __init__(self, default_duration: float):
+        self.default_duration = default_duration
+        self.in_flight = 0
+        self._durations: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def estimate(self, url_name: str | None) -> float:
+        """Ожидаемое время обработки запроса к `url_name` в секундах."""
+        return self._durations.get(url_name, self.default_duration)
+
+    @contextmanager
+    def track(self, url_name: str | None):
+        started = time.perf_counter()
+        with self._lock:
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - started
+            with self._lock:
+                self.in_flight -= 1
+                previous = self._durations.get(url_name)
+                self._durations[url_name] = (
+                    duration if previous is None else previous + EWMA_ALPHA * (duration - previous)
+                )
+
+
+class RequestDeadline:
+    """
+    Обёртка `connection.execute_wrapper`, ограничивающая SQL-запросы сроком HTTP-запроса.
+
+    Перед первым SQL-запросом устанавливает `statement_timeout` в оставшееся время; последующие
+    запросы лишь проверяют срок, не тратя обращение к БД на новый SET. Так ни один SQL-запрос
+    не переживёт срок больше чем на время, прошедшее с первого запроса. Истечение срока внутри
+    транзакции помечает её к откату, даже если представление перехватит исключение.
+    `committed_write` становится True, когда зафиксирована хотя бы одна запись: после этого
+    ответ представления нельзя подменять отказом.
+    """
+
+    def __init__(self, deadline: float):
+        self.deadline = deadline
+        self.exceeded = False
+        self.committed_write = False
+        self._applied = False
+
+    def remaining(self) -> float:
+        return self.deadline - time.monotonic()
+
+    def remaining_ms(self) -> int:
+        """Оставшееся время в миллисекундах; если срок истёк, выбрасывает `DeadlineExceeded`."""
+        remaining_ms = int(self.remaining() * 1000)
+        if remaining_ms <= 0:
+            self.exceeded = True
+            raise DeadlineExceeded("Срок выполнения запроса истёк")
+        return remaining_ms
+
+    def apply(self, connection) -> None:
+        """Устанавливает `statement_timeout` соединения в оставшееся время, если ещё не установлен."""
+        remaining_ms = self.remaining_ms()
+        if self._applied or connection.vendor != "postgresql":
+            return
+        connection.ensure_connection()
+        # Курсор драйвера: SET не должен проходить через обёртки и попадать в статистику.
+        with connection.wrap_database_errors, connection.connection.cursor() as raw_cursor:
+            raw_cursor.execute("SET statement_timeout = %s", [remaining_ms])
+        self._applied = True
+
+    def __call__(self, execute, sql, params, many, context):
+        connection = context["connection"]
+        try:
+            self.apply(connection)
+            result = execute(sql, params, many, context)
+        except DatabaseError as e:
+            if isinstance(e, DeadlineExceeded) or is_query_canceled(e):
+                self.exceeded = True
+                if connection.in_atomic_block:
+                    connection.set_rollback(True)
+            raise
+
+        if not sql.lstrip()[:9].upper().startswith(READ_ONLY_STATEMENTS):
+            if connection.in_atomic_block:
+                connection.on_commit(self._mark_committed)
+            else:
+                self.committed_write = True
+        return result
+
+    def _mark_committed(self) -> None:
+        self.committed_write = True
+
+    def reset(self, connection) -> None:
+        """Возвращает соединению таймаут по умолчанию: оно может быть переиспользовано (CONN_MAX_AGE)."""
+        if not self._applied or connection.connection is None:
+            return
+        try:
+            with connection.wrap_database_errors, connection.connection.cursor() as raw_cursor:
+                raw_cursor.execute("RESET statement_timeout")
+        except DatabaseError as e:
+            # Соединение в прерванной транзакции Django закроет сам; новое получит таймаут по умолчанию.
+            logger.debug("Не удалось сбросить statement_timeout: %s", e)
+        self._applied = False
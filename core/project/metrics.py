@@ -0,0 +1,136 @@
+"""
+Метрики Prometheus приложения.
+
+Метрики HTTP и БД пишет `MetricsMiddleware`, задержку публикации задач Celery —
+обработчики сигналов в `core.project.celery`, попадания в локальные кэши — `record_cache_lookup`,
+решения ограничителя запросов — `RateLimitMiddleware`, отклонённые при перегрузке
+запросы — `LoadSheddingMiddleware`, отменённые по таймауту SQL-запросы — `statement_timeout`.
+При запуске под несколькими процессами (gunicorn, uwsgi) задайте переменную
+окружения `PROMETHEUS_MULTIPROC_DIR`, и `/metrics` будет агрегировать значения всех процессов.
+"""
+
+import hmac
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.http import (
+    HttpRequest,
+    HttpResponse,
+)
+from prometheus_client import (
+    CollectorRegistry,
+    CONTENT_TYPE_LATEST,
+    Counter,
+    generate_latest,
+    Histogram,
+    multiprocess,
+    REGISTRY,
+)
+
+
+UNRESOLVED_URL_NAME = "<unresolved>"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0)
+DB_QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200, 500)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "django_http_request_duration_seconds",
+    "Длительность обработки HTTP-запроса.",
+    ["method", "url_name", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_REQUEST_DB_QUERIES = Histogram(
+    "django_http_request_db_queries",
+    "Количество SQL-запросов на HTTP-запрос.",
+    ["url_name"],
+    buckets=DB_QUERY_COUNT_BUCKETS,
+)
+HTTP_REQUEST_DB_DURATION = Histogram(
+    "django_http_request_db_duration_seconds",
+    "Суммарное время SQL-запросов на HTTP-запрос.",
+    ["url_name"],
+    buckets=LATENCY_BUCKETS,
+)
+CACHE_LOOKUPS = Counter(
+    "app_cache_lookups_total",
+    "Обращения к локальным кэшам приложения.",
+    ["cache", "result"],
+)
+RATE_LIMIT_DECISIONS = Counter(
+    "app_rate_limit_decisions_total",
+    "Решения ограничителя частоты запросов.",
+    ["rule", "tier", "result"],
+)
+LOAD_SHED_REQUESTS = Counter(
+    "app_load_shed_requests_total",
+    "Запросы, отклонённые из-за перегрузки или истечения срока выполнения.",
+    ["url_name", "priority", "reason"],
+)
+DB_STATEMENT_TIMEOUTS = Counter(
+    "app_db_statement_timeouts_total",
+    "SQL-запросы, отменённые Postgres по statement_timeout эндпоинта или сервиса.",
+    ["scope", "status"],
+)
+CELERY_PUBLISH_DURATION = Histogram(
+    "celery_task_publish_duration_seconds",
+    "Время публикации задачи Celery в брокер.",
+    ["task"],
+    buckets=LATENCY_BUCKETS,
+)
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    """Учитывает обращение к кэшу `cache`; доля попаданий считается по меткам result=hit/miss."""
+    CACHE_LOOKUPS.labels(cache=cache, result="hit" if hit else "miss").inc()
+
+
+class CeleryPublishTimer:
+    """Замеряет время публикации задачи между сигналами before_task_publish и after_task_publish."""
+
+    def __init__(self):
+        self._started: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def start(self, headers: dict | None = None, **kwargs) -> None:
+        if headers and headers.get("id"):
+            with self._lock:
+                self._started[headers["id"]] = time.perf_counter()
+
+    def stop(self, headers: dict | None = None, **kwargs) -> None:
+        if not headers or not headers.get("id"):
+            return
+        with self._lock:
+            started = self._started.pop(headers["id"], None)
+        if started is not None:
+            CELERY_PUBLISH_DURATION.labels(task=headers.get("task", "unknown")).observe(time.perf_counter() - started)
+
+
+celery_publish_timer = CeleryPublishTimer()
+
+
+def render_metrics() -> tuple[bytes, str]:
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def metrics_view(request: HttpRequest) -> HttpResponse:
+    """
+    Отдаёт метрики в текстовом формате Prometheus по Bearer-токену METRICS_AUTH_TOKEN.
+
+    Без токена метрики открыты только при DEBUG; в остальных окружениях эндпоинт отвечает 404.
+    """
+    token = settings.METRICS_AUTH_TOKEN
+    if not token:
+        if not settings.DEBUG:
+            return HttpResponse(status=404)
+    elif not hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {token}"):
+        return HttpResponse(status=401)
+
+    payload, content_type = render_metrics()
+    return HttpResponse(payload, content_type=content_type)
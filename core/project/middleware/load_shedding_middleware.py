@@ -0,0 +1,136 @@
+import logging
+import math
+import time
+
+from django.conf import settings
+from django.db import connection
+from django.http import JsonResponse
+from rest_framework.status import HTTP_503_SERVICE_UNAVAILABLE
+
+from core.project.load_shedding import (
+    LoadTracker,
+    RequestDeadline,
+)
+from core.project.metrics import (
+    LOAD_SHED_REQUESTS,
+    UNRESOLVED_URL_NAME,
+)
+from core.project.middleware.utils import get_url_name
+
+
+logger = logging.getLogger("load_shedding")
+
+HIGH_PRIORITY = "high"
+NORMAL_PRIORITY = "normal"
+LOW_PRIORITY = "low"
+
+# Доля бюджета задержки и лимита одновременных запросов, доступная уровню приоритета:
+# при росте нагрузки сначала отклоняются дорогие запросы, затем обычные.
+PRIORITY_SHARES = {HIGH_PRIORITY: 1.0, NORMAL_PRIORITY: 0.75, LOW_PRIORITY: 0.5}
+
+SHED_REASON_OVERLOAD = "overload"
+SHED_REASON_DEADLINE = "deadline"
+
+
+def parse_request_start(value: str, now: float) -> float | None:
+    """
+    Время поступления запроса на балансировщик из заголовка вида `t=1700000000.123`
+    (nginx `$msec`); значения в миллисекундах и микросекундах тоже распознаются.
+    """
+    value = value.strip().removeprefix("t=")
+    try:
+        started = float(value)
+    except ValueError:
+        return None
+    # Приводим к секундам по порядку величины относительно текущего времени.
+    while started > now * 100:
+        started /= 1000
+    return started
+
+
+class LoadSheddingMiddleware:
+    """
+    Отклоняет запросы с 503 и Retry-After, если процесс не успеет обработать их в срок.
+
+    Ожидаемая задержка — время в очереди перед приложением (заголовок LOAD_SHEDDING_REQUEST_START_HEADER,
+    который ставит балансировщик) плюс среднее время обработки url_name с поправкой на число
+    выполняющихся в процессе запросов. Уровень приоритета из LOAD_SHEDDING_ROUTE_PRIORITIES
+    (ключи `"<METHOD> <url_name>"` или `"<url_name>"`) определяет долю бюджета и лимита
+    одновременных запросов, доступную запросу. Принятый запрос получает срок: бюджет минус
+    время в очереди; срок переносится в `statement_timeout` Postgres, а запрос, не уложившийся
+    в него, завершается 503, если представление ещё ничего не зафиксировало в БД. Срок
+    доступен следующим слоям как `request.deadline`. Пути из LOAD_SHEDDING_EXCLUDED_PATHS
+    (админка: массовые действия фиксируют изменения пачками и работают дольше бюджета)
+    не ограничиваются. Должна стоять сразу после MetricsMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = settings.LOAD_SHEDDING_ENABLED
+        self.budget = settings.LOAD_SHEDDING_LATENCY_BUDGET_MS / 1000
+        self.max_in_flight = settings.LOAD_SHEDDING_MAX_IN_FLIGHT
+        self.concurrency = settings.LOAD_SHEDDING_CONCURRENCY
+        self.priorities = settings.LOAD_SHEDDING_ROUTE_PRIORITIES
+        self.excluded_paths = tuple(settings.LOAD_SHEDDING_EXCLUDED_PATHS)
+        self.request_start_header = "HTTP_" + settings.LOAD_SHEDDING_REQUEST_START_HEADER.upper().replace("-", "_")
+        self.tracker = LoadTracker(default_duration=settings.LOAD_SHEDDING_DEFAULT_DURATION_MS / 1000)
+
+    def __call__(self, request):
+        if not self.enabled or request.path.startswith(self.excluded_paths):
+            return self.get_response(request)
+
+        queue_time = self._get_queue_time(request)
+        url_name = get_url_name(request)
+        priority = self._get_priority(request.method, url_name)
+        share = PRIORITY_SHARES[priority]
+
+        in_flight = self.tracker.in_flight
+        expected = queue_time + self.tracker.estimate(url_name) * max(1.0, (in_flight + 1) / self.concurrency)
+        if in_flight >= self.max_in_flight * share or expected > self.budget * share:
+            logger.info(
+                "Запрос к '%s' отклонён: ожидаемая задержка %.0f мс, в очереди %.0f мс, выполняется %s.",
+                url_name,
+                expected * 1000,
+                queue_time * 1000,
+                in_flight,
+            )
+            return self._reject(url_name, priority, SHED_REASON_OVERLOAD, retry_after=expected)
+
+        deadline = RequestDeadline(time.monotonic() + self.budget - queue_time)
+        request.deadline = deadline
+        with self.tracker.track(url_name), connection.execute_wrapper(deadline):
+            try:
+                response = self.get_response(request)
+            finally:
+                deadline.reset(connection)
+
+        if deadline.exceeded:
+            logger.warning("Запрос к '%s' не уложился в срок %.0f мс.", url_name, self.budget * 1000)
+            if deadline.committed_write:
+                # Часть изменений уже зафиксирована: 503 предложил бы клиенту повторить выполненное.
+                return response
+            # Представление могло перехватить ошибку БД и вернуть 500: для клиента это перегрузка.
+            return self._reject(url_name, priority, SHED_REASON_DEADLINE, retry_after=self.budget)
+        return response
+
+    def _get_queue_time(self, request) -> float:
+        value = request.META.get(self.request_start_header)
+        if not value:
+            return 0.0
+        now = time.time()
+        started = parse_request_start(value, now)
+        return max(0.0, now - started) if started is not None else 0.0
+
+    def _get_priority(self, method: str, url_name: str | None) -> str:
+        if url_name is None:
+            return NORMAL_PRIORITY
+        return self.priorities.get(f"{method} {url_name}") or self.priorities.get(url_name, NORMAL_PRIORITY)
+
+    @staticmethod
+    def _reject(url_name: str | None, priority: str, reason: str, retry_after: float) -> JsonResponse:
+        LOAD_SHED_REQUESTS.labels(url_name=url_name or UNRESOLVED_URL_NAME, priority=priority, reason=reason).inc()
+        response = JsonResponse(
+            {"message": "Сервис перегружен. Повторите попытку позже."}, status=HTTP_503_SERVICE_UNAVAILABLE
+        )
+        response["Retry-After"] = str(max(1, math.ceil(retry_after)))
+        return response
@@ -0,0 +1,37 @@
+import time
+
+from core.project.metrics import (
+    HTTP_REQUEST_DB_DURATION,
+    HTTP_REQUEST_DB_QUERIES,
+    HTTP_REQUEST_DURATION,
+    UNRESOLVED_URL_NAME,
+)
+from core.project.middleware.utils import get_url_name
+
+
+class MetricsMiddleware:
+    """
+    Записывает метрики Prometheus по каждому запросу: длительность (по имени URL и статусу),
+    число и суммарное время SQL-запросов (из `request.sql_stats`, см. SqlInstrumentationMiddleware).
+    Должна стоять первой в MIDDLEWARE, чтобы учитывать время всех остальных мидлварей.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        status = "500"
+        try:
+            response = self.get_response(request)
+            status = str(response.status_code)
+            return response
+        finally:
+            url_name = get_url_name(request) or UNRESOLVED_URL_NAME
+            HTTP_REQUEST_DURATION.labels(method=request.method, url_name=url_name, status=status).observe(
+                time.perf_counter() - started
+            )
+            sql_stats = getattr(request, "sql_stats", None)
+            if sql_stats is not None:
+                HTTP_REQUEST_DB_QUERIES.labels(url_name=url_name).observe(sql_stats.count)
+                HTTP_REQUEST_DB_DURATION.labels(url_name=url_name).observe(sql_stats.duration)
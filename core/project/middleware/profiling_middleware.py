@@ -0,0 +1,87 @@
+import logging
+import random
+
+from django.conf import settings
+from rest_framework.exceptions import APIException
+from rest_framework_simplejwt.exceptions import TokenError
+
+from core.apps.common.sampling_profiler import SamplingProfiler
+from core.apps.user.authentication import EntitlementJWTAuthentication
+from core.project.middleware.utils import get_url_name
+from core.project.profiling import get_profile_store
+
+
+logger = logging.getLogger("profiling")
+
+TRIGGER_HEADER = "header"
+TRIGGER_SAMPLING = "sampling"
+
+
+class ProfilingMiddleware:
+    """
+    Снимает сэмплирующий профиль запроса: всей цепочки от SubscriptionMiddleware до view.
+
+    Профиль снимается, если сотрудник прислал заголовок PROFILING_HEADER (`X-Profile: 1`),
+    или случайно с вероятностью из PROFILING_SAMPLE_RATES для url_name запроса.
+    Идентификатор сохранённого профиля возвращается в заголовке X-Profile-Id.
+    Должна стоять после AuthenticationMiddleware и перед SubscriptionMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.header = settings.PROFILING_HEADER
+        self.sample_rates = settings.PROFILING_SAMPLE_RATES
+        self.interval = settings.PROFILING_INTERVAL_MS / 1000
+        self.jwt_authenticator = EntitlementJWTAuthentication()
+
+    def __call__(self, request):
+        trigger = self._get_trigger(request)
+        if trigger is None:
+            return self.get_response(request)
+
+        profiler = SamplingProfiler(interval=self.interval)
+        profiler.start()
+        status = 500
+        try:
+            response = self.get_response(request)
+            status = response.status_code
+        finally:
+            result = profiler.stop()
+            profile_id = get_profile_store().save(
+                {
+                    "url_name": get_url_name(request),
+                    "method": request.method,
+                    "path": request.path,
+                    "status": status,
+                    "trigger": trigger,
+                },
+                result,
+            )
+
+        if profile_id:
+            response["X-Profile-Id"] = profile_id
+        return response
+
+    def _get_trigger(self, request) -> str | None:
+        if request.headers.get(self.header) == "1":
+            if self._is_staff(request):
+                return TRIGGER_HEADER
+            logger.info("Заголовок %s от не-сотрудника проигнорирован: %s", self.header, request.path)
+
+        if self.sample_rates:
+            rate = self.sample_rates.get(get_url_name(request))
+            if rate and random.random() < rate:
+                return TRIGGER_SAMPLING
+        return None
+
+    def _is_staff(self, request) -> bool:
+        # Сессия (админка) или JWT; JWT проверяется только при наличии заголовка профилирования.
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated and user.is_staff:
+            return True
+        try:
+            auth = self.jwt_authenticator.authenticate(request)
+        except (APIException, TokenError):
+            # Недействительный токен, неактивный или удалённый пользователь — не сотрудник.
+            return False
+        return bool(auth and auth[0].is_staff)
@@ -0,0 +1,112 @@
+import logging
+import math
+from functools import lru_cache
+from typing import Dict
+
+from django.conf import settings
+from django.http import JsonResponse
+from rest_framework.status import HTTP_429_TOO_MANY_REQUESTS
+
+from core.apps.common.rate_limit import (
+    Rate,
+    RateLimitDecision,
+    RedisGCRA,
+)
+from core.project.metrics import RATE_LIMIT_DECISIONS
+from core.project.middleware.utils import get_url_name
+
+
+logger = logging.getLogger("rate_limit")
+
+STAFF_TIER = "staff"
+SUBSCRIBED_TIER = "subscribed"
+ANONYMOUS_TIER = "anonymous"
+DEFAULT_RULE = "*"
+
+
+@lru_cache(1)
+def get_rate_limiter() -> RedisGCRA:
+    return RedisGCRA(settings.RATE_LIMIT_REDIS_URL)
+
+
+def parse_rate_limits(config: Dict[str, Dict[str, str | None]]) -> Dict[str, Dict[str, Rate | None]]:
+    """Разбирает RATE_LIMITS заранее, чтобы ошибка в настройках проявилась при старте, а не на запросе."""
+    return {
+        rule: {tier: Rate.parse(value) if value else None for tier, value in tiers.items()}
+        for rule, tiers in config.items()
+    }
+
+
+def get_client_ip(request, trusted_proxies: int) -> str:
+    """
+    IP клиента: REMOTE_ADDR или, за `trusted_proxies` доверенными прокси, адрес из X-Forwarded-For,
+    добавленный самым дальним из них. Адреса левее него клиент мог подставить сам.
+    """
+    if trusted_proxies:
+        forwarded = [part.strip() for part in request.META.get("HTTP_X_FORWARDED_FOR", "").split(",") if part.strip()]
+        if len(forwarded) >= trusted_proxies:
+            return forwarded[-trusted_proxies]
+    return request.META.get("REMOTE_ADDR", "")
+
+
+class RateLimitMiddleware:
+    """
+    Ограничивает частоту запросов к API по url_name и уровню клиента (GCRA в Redis).
+
+    Уровни: `staff`, `subscribed` (активная подписка) и `anonymous` (без токена или без подписки).
+    Лимит берётся из RATE_LIMITS для url_name, иначе из правила `*`; None — без ограничения.
+    Аутентифицированные клиенты считаются по ID пользователя, анонимные — по IP. Запросы,
+    попавшие под правило `*`, расходуют один общий лимит на все такие эндпоинты.
+    Ответ получает заголовки RateLimit-Limit, RateLimit-Remaining, RateLimit-Reset и RateLimit-Policy,
+    превышение лимита — 429 с Retry-After.
+    Должна стоять после SubscriptionMiddleware, которая аутентифицирует пользователя по JWT.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.api_prefix = "/api/"
+        self.enabled = settings.RATE_LIMIT_ENABLED
+        self.trusted_proxies = settings.RATE_LIMIT_TRUSTED_PROXIES
+        self.rules = parse_rate_limits(settings.RATE_LIMITS)
+
+    def __call__(self, request):
+        if not self.enabled or not request.path.startswith(self.api_prefix):
+            return self.get_response(request)
+
+        url_name = get_url_name(request)
+        tier, identity = self._get_client(request)
+        rule = url_name if url_name in self.rules and tier in self.rules[url_name] else DEFAULT_RULE
+        rate = self.rules.get(rule, {}).get(tier)
+        if rate is None:
+            return self.get_response(request)
+
+        decision = get_rate_limiter().hit(f"{rule}:{identity}", rate)
+        RATE_LIMIT_DECISIONS.labels(rule=rule, tier=tier, result="allowed" if decision.allowed else "limited").inc()
+        if decision.allowed:
+            response = self.get_response(request)
+        else:
+            logger.info("Превышен лимит запросов к '%s' (%s, %s).", url_name, tier, identity)
+            response = JsonResponse(
+                {"message": "Слишком много запросов. Повторите попытку позже."}, status=HTTP_429_TOO_MANY_REQUESTS
+            )
+            response["Retry-After"] = str(max(1, math.ceil(decision.retry_after)))
+
+        self._set_headers(response, decision, rate)
+        return response
+
+    def _get_client(self, request) -> tuple[str, str]:
+        user = getattr(request, "user", None)
+        if user is None or not user.is_authenticated:
+            return ANONYMOUS_TIER, f"ip:{get_client_ip(request, self.trusted_proxies)}"
+        if user.is_staff:
+            return STAFF_TIER, f"user:{user.id}"
+        if user.has_active_subscription:
+            return SUBSCRIBED_TIER, f"user:{user.id}"
+        return ANONYMOUS_TIER, f"user:{user.id}"
+
+    @staticmethod
+    def _set_headers(response, decision: RateLimitDecision, rate: Rate) -> None:
+        response["RateLimit-Limit"] = str(decision.limit)
+        response["RateLimit-Remaining"] = str(decision.remaining)
+        response["RateLimit-Reset"] = str(math.ceil(decision.reset))
+        response["RateLimit-Policy"] = rate.policy
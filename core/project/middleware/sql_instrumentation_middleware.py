@@ -0,0 +1,63 @@
+import logging
+
+from django.conf import settings
+from django.db import connection
+
+from core.project.middleware.utils import get_url_name
+from core.project.sql_instrumentation import (
+    QueryBudgetExceeded,
+    QueryRecorder,
+)
+
+
+logger = logging.getLogger("sql_instrumentation")
+
+
+class SqlInstrumentationMiddleware:
+    """
+    Считает SQL-запросы и время БД для каждого запроса и проверяет бюджет запросов по `url_name`.
+
+    Бюджеты задаются в `SQL_QUERY_BUDGETS`; при превышении в production пишется предупреждение,
+    а при `SQL_QUERY_BUDGET_STRICT = True` (настройки тестов) выбрасывается `QueryBudgetExceeded`.
+    В режиме DEBUG статистика возвращается в заголовках X-DB-Query-*.
+    Собранная статистика доступна следующим слоям как `request.sql_stats`.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.budgets = settings.SQL_QUERY_BUDGETS
+        self.default_budget = settings.SQL_QUERY_BUDGET_DEFAULT
+        self.strict = settings.SQL_QUERY_BUDGET_STRICT
+        self.slow_query_threshold = settings.SQL_SLOW_QUERY_MS / 1000 if settings.SQL_SLOW_QUERY_MS else None
+
+    def __call__(self, request):
+        recorder = QueryRecorder(
+            slow_query_threshold=self.slow_query_threshold,
+            explain_slow_queries=settings.SQL_EXPLAIN_SLOW_QUERIES,
+        )
+        request.sql_stats = recorder
+
+        with connection.execute_wrapper(recorder):
+            response = self.get_response(request)
+
+        url_name = get_url_name(request)
+        budget = self.budgets.get(url_name, self.default_budget) if url_name else None
+        if budget is not None and recorder.count > budget:
+            self._report_budget_exceeded(request, url_name, budget, recorder)
+
+        if settings.DEBUG:
+            response["X-DB-Query-Count"] = str(recorder.count)
+            response["X-DB-Query-Time-Ms"] = f"{recorder.duration * 1000:.1f}"
+            if budget is not None:
+                response["X-DB-Query-Budget"] = str(budget)
+        return response
+
+    def _report_budget_exceeded(self, request, url_name: str, budget: int, recorder: QueryRecorder) -> None:
+        repeated = "; ".join(f"{count}× {sql}" for sql, count in recorder.most_repeated())
+        message = (
+            f"{request.method} {url_name}: выполнено {recorder.count} SQL-запросов при бюджете {budget}"
+            f"{f'. Повторяющиеся запросы: {repeated}' if repeated else ''}"
+        )
+        if self.strict:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
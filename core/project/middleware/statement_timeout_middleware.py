@@ -0,0 +1,55 @@
+from django.conf import settings
+from django.db import connection
+
+from core.apps.common.exceptions.database_exceptions.database_exc import (
+    DatabaseOverloadedException,
+    DatabaseTimeoutException,
+)
+from core.project.middleware.utils import get_url_name
+from core.project.statement_timeouts import statement_timeout
+
+
+class StatementTimeoutMiddleware:
+    """
+    Выполняет представление в транзакции с `SET LOCAL statement_timeout` из STATEMENT_TIMEOUTS_MS.
+
+    Таймаут задаётся по `"<METHOD> <url_name>"` или `"<url_name>"` (STATEMENT_TIMEOUT_DEFAULT_MS
+    для остальных, None — без таймаута) и не превышает остаток срока запроса `request.deadline`
+    (LoadSheddingMiddleware). Отменённый по таймауту эндпоинта SQL-запрос даёт 504, по сроку
+    запроса — 503 с Retry-After; ответ
+    в формате `build_api_response` строит обработчик исключений DRF.
+    Должна стоять последней в MIDDLEWARE: представление вызывается из `process_view`,
+    и `process_view` следующих мидлварей уже не выполнится.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.timeouts = settings.STATEMENT_TIMEOUTS_MS
+        self.default_timeout = settings.STATEMENT_TIMEOUT_DEFAULT_MS
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        url_name = get_url_name(request)
+        timeout_ms = self._get_timeout(request.method, url_name)
+        if timeout_ms is None:
+            return None
+
+        exception_class = DatabaseTimeoutException
+        deadline = getattr(request, "deadline", None)
+        if deadline is not None:
+            # Сначала таймаут сессии по сроку запроса: SET LOCAL ниже должен его перекрыть.
+            deadline.apply(connection)
+            remaining_ms = deadline.remaining_ms()
+            if remaining_ms < timeout_ms:
+                timeout_ms, exception_class = remaining_ms, DatabaseOverloadedException
+
+        with statement_timeout(timeout_ms, scope=url_name, exception_class=exception_class):
+            return view_func(request, *view_args, **view_kwargs)
+
+    def _get_timeout(self, method: str, url_name: str | None) -> int | None:
+        if url_name is None:
+            return None
+        timeout_ms = self.timeouts.get(f"{method} {url_name}")
+        return timeout_ms if timeout_ms is not None else self.timeouts.get(url_name, self.default_timeout)
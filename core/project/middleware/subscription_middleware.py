@@ -2,17 +2,15 @@ import logging
 
 from django.contrib.auth.models import AnonymousUser
 from django.http import JsonResponse
-from django.urls import (
-    resolve,
-    Resolver404,
-)
 from rest_framework.status import HTTP_403_FORBIDDEN
-from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.exceptions import (
     InvalidToken,
     TokenError,
 )
 
+from core.apps.user.authentication import EntitlementJWTAuthentication
+from core.project.middleware.utils import get_url_name
+
 
 logger = logging.getLogger("subscription_middleware")
 
@@ -26,6 +24,7 @@ class SubscriptionMiddleware:
             "v1:token_obtain_pair",
             "v1:token_refresh",
             "v1:token_verify",
+            "v1:logout",
             "swagger-ui",
             "redoc",
             "schema",
@@ -35,14 +34,14 @@ class SubscriptionMiddleware:
             "v1:subscriptions:",
             "v1:users:",
         ]
-        self.jwt_authenticator = JWTAuthentication()
+        self.jwt_authenticator = EntitlementJWTAuthentication()
         logger.info("SubscriptionMiddleware инициализирован.")
 
     def __call__(self, request):
-        logger.debug(f"Получен запрос для пути: {request.path}")
+        logger.debug("Получен запрос для пути: %s", request.path)
 
         if not request.path.startswith(self.api_prefix):
-            logger.debug(f"Путь '{request.path}' не начинается с префикса API, пропускаем.")
+            logger.debug("Путь '%s' не начинается с префикса API, пропускаем.", request.path)
             return self.get_response(request)
 
         try:
@@ -50,46 +49,33 @@ class SubscriptionMiddleware:
             if user_auth_tuple:
                 authenticated_user, token = user_auth_tuple
                 request.user = authenticated_user
-                logger.debug(
-                    f"Пользователь '{authenticated_user.email}' (ID: {authenticated_user.id}) аутентифицирован через JWT в мидлваре."
-                )
+                logger.debug("Пользователь ID %s аутентифицирован через JWT в мидлваре.", authenticated_user.id)
             else:
                 request.user = AnonymousUser()
         except (InvalidToken, TokenError) as e:
-            logger.warning(f"Ошибка JWT аутентификации в мидлваре для '{request.path}': {e}")
+            logger.warning("Ошибка JWT аутентификации в мидлваре для '%s': %s", request.path, e)
             request.user = AnonymousUser()
         except Exception as e:
-            logger.error(f"Неожиданная ошибка во время JWT аутентификации в мидлваре: {e}")
+            logger.error("Неожиданная ошибка во время JWT аутентификации в мидлваре: %s", e)
             request.user = AnonymousUser()
 
         if hasattr(request, "user") and request.user.is_authenticated and request.user.is_staff:
-            logger.info(
-                f"Пользователь '{request.user.email}' (ID: {request.user.id}) является сотрудником, проверка подписки пропущена."
-            )
+            # Запросы сотрудников идут на каждый вызов админских API: это отладочное, а не информационное событие.
+            logger.debug("Пользователь ID %s является сотрудником, проверка подписки пропущена.", request.user.id)
             return self.get_response(request)
 
-        url_name = None
-        try:
-            match = resolve(request.path_info)
-            if match.app_names:
-                full_url_name_parts = match.app_names + [match.url_name]
-                url_name = ":".join(full_url_name_parts)
-            else:
-                url_name = match.url_name
-            logger.debug(f"Имя URL разрешено для пути '{request.path_info}': '{url_name}'")
-        except Resolver404:
-            logger.warning(f"URL '{request.path_info}' не может быть разрешен (Resolver404), пропускаем.")
-            return self.get_response(request)
+        url_name = get_url_name(request)
+        logger.debug("Имя URL разрешено для пути '%s': '%s'", request.path_info, url_name)
 
         if url_name is None:
-            logger.warning(f"Имя URL не было определено для пути: {request.path_info}, пропускаем.")
+            logger.warning("Имя URL не было определено для пути: %s, пропускаем.", request.path_info)
             return self.get_response(request)
 
         is_exempt_from_subscription = False
         for pattern in self.public_api_urls:
             if url_name == pattern:
                 is_exempt_from_subscription = True
-                logger.debug(f"Имя URL '{url_name}' соответствует шаблону публичного API '{pattern}'.")
+                logger.debug("Имя URL '%s' соответствует шаблону публичного API '%s'.", url_name, pattern)
                 break
 
         if not is_exempt_from_subscription:
@@ -97,27 +83,32 @@ class SubscriptionMiddleware:
                 if url_name.startswith(pattern_prefix):
                     is_exempt_from_subscription = True
                     logger.debug(
-                        f"Имя URL '{url_name}' соответствует шаблону префикса, исключенного из проверки подписки '{pattern_prefix}'."
+                        "Имя URL '%s' соответствует шаблону префикса, исключенного из проверки подписки '%s'.",
+                        url_name,
+                        pattern_prefix,
                     )
                     break
 
         if is_exempt_from_subscription:
-            logger.info(f"Запрос к '{url_name}' разрешен без проверки подписки (в белом списке).")
+            logger.debug("Запрос к '%s' разрешен без проверки подписки (в белом списке).", url_name)
             return self.get_response(request)
 
         if not (hasattr(request, "user") and request.user.is_authenticated):
-            logger.warning(f"Доступ к '{url_name}' заблокирован: требуется аутентификация.")
+            logger.warning("Доступ к '%s' заблокирован: требуется аутентификация.", url_name)
             return JsonResponse(
                 {"message": "Для доступа к этому ресурсу требуется аутентификация."}, status=HTTP_403_FORBIDDEN
             )
 
         if not request.user.has_active_subscription:
-            user_info = f"Пользователь '{request.user.email}' (ID: {request.user.id})"
-            logger.warning(f"Доступ к '{url_name}' заблокирован для {user_info}: требуется активная подписка.")
+            logger.warning(
+                "Доступ к '%s' заблокирован для пользователя ID %s: требуется активная подписка.",
+                url_name,
+                request.user.id,
+            )
             return JsonResponse(
                 {"message": "Для доступа к этому ресурсу требуется активная подписка."}, status=HTTP_403_FORBIDDEN
             )
 
-        logger.debug(f"Запрос к '{url_name}' разрешен, пользователь имеет активную подписку.")
+        logger.debug("Запрос к '%s' разрешен, пользователь имеет активную подписку.", url_name)
         response = self.get_response(request)
         return response
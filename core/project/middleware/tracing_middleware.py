@@ -0,0 +1,47 @@
+from opentelemetry.trace import (
+    format_trace_id,
+    SpanKind,
+    Status,
+    StatusCode,
+)
+
+from core.apps.common.tracing import (
+    get_tracer,
+    use_context,
+)
+from core.project.middleware.utils import get_url_name
+from core.project.tracing import setup_tracing
+
+
+class TracingMiddleware:
+    """
+    Открывает серверный спан на каждый HTTP-запрос, продолжая трассу из заголовка `traceparent`.
+
+    Спан называется по методу и `url_name`, а идентификатор трассы возвращается
+    в заголовке X-Trace-Id, чтобы по ответу можно было найти трассу в экспортированных данных.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        setup_tracing()
+
+    def __call__(self, request):
+        with use_context(request.headers):
+            with get_tracer().start_as_current_span(request.method, kind=SpanKind.SERVER) as span:
+                span.set_attribute("http.request.method", request.method)
+                span.set_attribute("url.path", request.path)
+
+                response = self.get_response(request)
+
+                url_name = get_url_name(request)
+                if url_name:
+                    span.update_name(f"{request.method} {url_name}")
+                    span.set_attribute("http.route", url_name)
+                span.set_attribute("http.response.status_code", response.status_code)
+                if response.status_code >= 500:
+                    span.set_status(Status(StatusCode.ERROR))
+
+                span_context = span.get_span_context()
+                if span_context.is_valid:
+                    response["X-Trace-Id"] = format_trace_id(span_context.trace_id)
+                return response
@@ -0,0 +1,30 @@
+from django.http import HttpRequest
+from django.urls import (
+    resolve,
+    Resolver404,
+)
+
+
+def get_url_name(request: HttpRequest) -> str | None:
+    """
+    Возвращает полное имя URL запроса с пространствами имён (например, `v1:orders:order-list-create`).
+
+    Результат кэшируется на объекте запроса, чтобы мидлвари не разрешали один и тот же путь
+    повторно; после выполнения view используется уже найденный Django `resolver_match`.
+    """
+    if hasattr(request, "_url_name"):
+        return request._url_name
+
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            match = None
+
+    url_name = None
+    if match is not None and match.url_name:
+        url_name = ":".join(match.app_names + [match.url_name]) if match.app_names else match.url_name
+
+    request._url_name = url_name
+    return url_name
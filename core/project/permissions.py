@@ -35,7 +35,8 @@ class IsResourceOwner(permissions.BasePermission):
     message = "Вы не являетесь владельцем этого ресурса."
 
     def has_object_permission(self, request, view, obj):
-        return obj.user == request.user
+        # Сравнение по id: `request.user` может быть пользователем из токена, а не моделью.
+        return obj.user_id == request.user.id
 
 
 class IsUserOwnerOrAdmin(permissions.BasePermission):
@@ -0,0 +1,120 @@
+"""
+Хранилище профилей запросов в Redis и страница администратора со списком профилей.
+
+Профиль — метаданные запроса и стеки в свёрнутом формате (`a;b;c 12`): файл можно открыть
+в speedscope.app или передать в flamegraph.pl. Хранится не более PROFILING_MAX_PROFILES
+последних профилей, каждый живёт PROFILING_TTL_SECONDS.
+"""
+
+import json
+import logging
+import uuid
+from functools import lru_cache
+
+import redis
+from django.conf import settings
+from django.contrib import admin
+from django.http import (
+    Http404,
+    HttpRequest,
+    HttpResponse,
+)
+from django.shortcuts import render
+from django.utils import timezone
+
+from core.apps.common.sampling_profiler import ProfileResult
+
+
+logger = logging.getLogger(__name__)
+
+INDEX_KEY = "profiles:index"
+PROFILE_KEY = "profiles:{profile_id}"
+
+
+class ProfileStore:
+    def __init__(self, redis_url: str, ttl: int, max_profiles: int):
+        self.client = redis.Redis.from_url(redis_url, socket_timeout=1, socket_connect_timeout=1)
+        self.ttl = ttl
+        self.max_profiles = max_profiles
+
+    def save(self, meta: dict, result: ProfileResult) -> str | None:
+        profile_id = uuid.uuid4().hex
+        meta = {
+            **meta,
+            "id": profile_id,
+            "created_at": timezone.now().isoformat(),
+            "duration_ms": round(result.duration * 1000, 1),
+            "samples": result.sample_count,
+            "interval_ms": result.interval * 1000,
+        }
+        key = PROFILE_KEY.format(profile_id=profile_id)
+        try:
+            with self.client.pipeline() as pipe:
+                pipe.hset(key, mapping={"meta": json.dumps(meta, ensure_ascii=False), "folded": result.folded()})
+                pipe.expire(key, self.ttl)
+                pipe.lpush(INDEX_KEY, profile_id)
+                pipe.ltrim(INDEX_KEY, 0, self.max_profiles - 1)
+                pipe.execute()
+        except redis.RedisError as e:
+            logger.warning("Не удалось сохранить профиль запроса %s: %s", meta.get("url_name"), e)
+            return None
+        return profile_id
+
+    def recent(self) -> list[dict]:
+        profile_ids = [value.decode() for value in self.client.lrange(INDEX_KEY, 0, -1)]
+        with self.client.pipeline() as pipe:
+            for profile_id in profile_ids:
+                pipe.hget(PROFILE_KEY.format(profile_id=profile_id), "meta")
+            raw_metas = pipe.execute()
+
+        return [json.loads(raw) for raw in raw_metas if raw]
+
+    def get_folded(self, profile_id: str) -> str | None:
+        value = self.client.hget(PROFILE_KEY.format(profile_id=profile_id), "folded")
+        return value.decode() if value is not None else None
+
+
+@lru_cache(1)
+def get_profile_store() -> ProfileStore:
+    return ProfileStore(
+        redis_url=settings.PROFILING_REDIS_URL,
+        ttl=settings.PROFILING_TTL_SECONDS,
+        max_profiles=settings.PROFILING_MAX_PROFILES,
+    )
+
+
+def profile_list_view(request: HttpRequest) -> HttpResponse:
+    """Страница администратора: последние профили, с фильтром по url_name."""
+    url_name = request.GET.get("url_name") or None
+    try:
+        profiles = get_profile_store().recent()
+        error = None
+    except redis.RedisError as e:
+        profiles, error = [], str(e)
+
+    endpoints = sorted({profile.get("url_name") or "" for profile in profiles})
+    if url_name:
+        profiles = [profile for profile in profiles if profile.get("url_name") == url_name]
+
+    return render(
+        request,
+        "admin/profiling/profile_list.html",
+        {
+            **admin.site.each_context(request),
+            "title": "Профили запросов",
+            "profiles": profiles,
+            "endpoints": endpoints,
+            "selected_url_name": url_name,
+            "error": error,
+        },
+    )
+
+
+def profile_download_view(request: HttpRequest, profile_id: str) -> HttpResponse:
+    folded = get_profile_store().get_folded(profile_id)
+    if folded is None:
+        raise Http404("Профиль не найден или устарел.")
+
+    response = HttpResponse(folded, content_type="text/plain; charset=utf-8")
+    response["Content-Disposition"] = f'attachment; filename="profile-{profile_id}.folded"'
+    return response
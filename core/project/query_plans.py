@@ -0,0 +1,290 @@
+"""
+Снимки планов выполнения SQL-запросов сервисного слоя.
+
+Каждый кейс вызывает метод сервиса (список, количество, детальная запись) или построитель
+запроса `_build_*_query`; все выполненные SELECT перехватываются обёрткой `execute_wrapper`
+и повторяются под `EXPLAIN (ANALYZE, FORMAT JSON)`. План сводится к «форме» — дереву узлов
+с таблицами, индексами и типами соединений без стоимостей и числа строк, — которая хранится
+в JSON и сравнивается со снимком при следующем запуске. Дополнительно план проверяется
+на последовательное сканирование больших таблиц, сортировку с выгрузкой на диск
+и вложенные циклы с большим числом повторов внутренней стороны.
+"""
+
+import datetime
+import difflib
+import json
+import uuid
+from dataclasses import dataclass
+from typing import (
+    Callable,
+    Dict,
+    List,
+)
+
+from django.db import (
+    connection,
+    transaction,
+)
+from django.utils import timezone
+
+from core.api.schemas.pagination import PaginationIn
+from core.api.v1.products.schemas.filters import OrderFilter
+from core.api.v1.subscriptions.schemas.filters import SubscriptionFilter
+from core.api.v1.tariff.schemas.filters import TariffFilter
+from core.api.v1.users.schemas.filters import UserFilter
+from core.apps.products.models import Order
+from core.apps.products.services.base_order_service import OrderBaseService
+from core.apps.subscriptions.models import Subscription
+from core.apps.subscriptions.services.base_broadcast_service import BroadcastBaseService
+from core.apps.subscriptions.services.base_service import SubscriptionBaseService
+from core.apps.subscriptions.services.reminder_service import ExpiryReminderService
+from core.apps.tariff.models import Tariff
+from core.apps.tariff.services.tariff_base_service import TariffBaseService
+from core.apps.user.models import User
+from core.apps.user.services.base_user_service import BaseUserService
+from core.project.containers import get_container
+
+
+SEQ_SCAN_MIN_ROWS = 10_000
+NESTED_LOOP_MAX_LOOPS = 1_000
+
+
+@dataclass
+class PlanCase:
+    name: str
+    func: Callable[[], object]
+
+
+def build_cases() -> List[PlanCase]:
+    container = get_container()
+    subscriptions: SubscriptionBaseService = container.resolve(SubscriptionBaseService)
+    users: BaseUserService = container.resolve(BaseUserService)
+    orders: OrderBaseService = container.resolve(OrderBaseService)
+    tariffs: TariffBaseService = container.resolve(TariffBaseService)
+    broadcasts: BroadcastBaseService = container.resolve(BroadcastBaseService)
+    reminders = ExpiryReminderService(sender_factory=None)
+
+    subscription = Subscription.objects.filter(is_active=True).order_by("id").first()
+    order = Order.objects.order_by("id").first()
+    tariff = Tariff.objects.order_by("id").first()
+    if subscription is None or order is None or tariff is None:
+        raise RuntimeError("В БД нет подписок, заказов или тарифов: заполните её командой generate_dataset.")
+
+    page = PaginationIn(offset=0, limit=20)
+    deep_page = PaginationIn(offset=10_000, limit=20)
+    user_id = subscription.user_id
+    today = timezone.localdate()
+
+    return [
+        PlanCase(
+            "subscriptions.list.admin",
+            lambda: list(subscriptions.get_subscription_list(SubscriptionFilter(), page, is_admin=True)),
+        ),
+        PlanCase(
+            "subscriptions.list.admin.deep_offset",
+            lambda: list(subscriptions.get_subscription_list(SubscriptionFilter(), deep_page, is_admin=True)),
+        ),
+        PlanCase(
+            "subscriptions.list.admin.search",
+            lambda: list(
+                subscriptions.get_subscription_list(SubscriptionFilter(search="Тариф 1"), page, is_admin=True)
+            ),
+        ),
+        PlanCase(
+            "subscriptions.list.user",
+            lambda: list(subscriptions.get_subscription_list(SubscriptionFilter(), page, user_id=user_id)),
+        ),
+        PlanCase(
+            "subscriptions.count.admin",
+            lambda: subscriptions.get_subscription_count(SubscriptionFilter(), is_admin=True),
+        ),
+        PlanCase(
+            "subscriptions.count.user",
+            lambda: subscriptions.get_subscription_count(SubscriptionFilter(), user_id=user_id),
+        ),
+        PlanCase(
+            "subscriptions.detail",
+            lambda: subscriptions.get_subscription_by_id(subscription.id, user_id=user_id),
+        ),
+        PlanCase("users.list", lambda: list(users.get_users_list(UserFilter(), page))),
+        PlanCase("users.list.search", lambda: list(users.get_users_list(UserFilter(search="user1"), page))),
+        PlanCase("users.count", lambda: users.get_users_count(UserFilter())),
+        PlanCase("users.detail", lambda: users.get_user_by_id(user_id)),
+        PlanCase("orders.list.admin", lambda: list(orders.get_order_list(OrderFilter(), page, is_admin=True))),
+        PlanCase(
+            "orders.list.admin.search",
+            lambda: list(orders.get_order_list(OrderFilter(search="Продукт 1"), page, is_admin=True)),
+        ),
+        PlanCase("orders.list.user", lambda: list(orders.get_order_list(OrderFilter(), page, user_id=user_id))),
+        PlanCase("orders.count.admin", lambda: orders.get_order_count(OrderFilter(), is_admin=True)),
+        PlanCase("orders.detail", lambda: orders.get_order_by_id(order.id, user_id=order.user_id)),
+        PlanCase("tariffs.list", lambda: list(tariffs.get_tariff_list(TariffFilter(), page))),
+        PlanCase("tariffs.count", lambda: tariffs.get_tariff_count(TariffFilter())),
+        PlanCase("tariffs.detail", lambda: tariffs.get_tariff_by_id(tariff.id)),
+        PlanCase(
+            "broadcasts.recipients",
+            lambda: list(broadcasts._build_recipients_query(tariff.id)[:1000]),
+        ),
+        PlanCase(
+            "broadcasts.recipients.next_page",
+            lambda: list(broadcasts._build_recipients_query(tariff.id, after_user_id=uuid.UUID(int=2**127))[:1000]),
+        ),
+        PlanCase(
+            "reminders.expiring",
+            lambda: list(reminders._build_expiring_query(days_before=3, today=today)[:1000]),
+        ),
+    ]
+
+
+class StatementCollector:
+    """Обёртка `execute_wrapper`, запоминающая выполненные SELECT вместе с параметрами."""
+
+    def __init__(self):
+        self.statements: List[tuple] = []
+
+    def __call__(self, execute, sql, params, many, context):
+        if not many and sql.lstrip().upper().startswith(("SELECT", "WITH")):
+            self.statements.append((sql, params))
+        return execute(sql, params, many, context)
+
+
+def explain(sql: str, params) -> dict:
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    # psycopg2 сам разбирает json, другие драйверы могут вернуть строку.
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+def plan_shape(node: dict, depth: int = 0) -> List[str]:
+    """Форма плана: по строке на узел, с отступом по глубине, без стоимостей и числа строк."""
+    parts = [node["Node Type"]]
+    if node.get("Strategy") and node["Node Type"] in ("Aggregate", "SetOp"):
+        parts.append(f"[{node['Strategy']}]")
+    if node.get("Join Type") and node["Node Type"] in ("Nested Loop", "Hash Join", "Merge Join"):
+        parts.append(f"[{node['Join Type']}]")
+    if node.get("Index Name"):
+        parts.append(f"using {node['Index Name']}")
+    if node.get("Relation Name"):
+        parts.append(f"on {node['Relation Name']}")
+    if node.get("Parent Relationship") in ("SubPlan", "InitPlan"):
+        parts.append(f"({node['Parent Relationship']})")
+
+    lines = ["  " * depth + " ".join(parts)]
+    for child in node.get("Plans", []):
+        lines.extend(plan_shape(child, depth + 1))
+    return lines
+
+
+def plan_warnings(
+    node: dict,
+    seq_scan_min_rows: int = SEQ_SCAN_MIN_ROWS,
+    nested_loop_max_loops: int = NESTED_LOOP_MAX_LOOPS,
+) -> List[str]:
+    """Подозрительные узлы плана, выполненного с ANALYZE."""
+    warnings = []
+    node_type = node["Node Type"]
+    loops = node.get("Actual Loops", 1)
+
+    if node_type == "Seq Scan":
+        scanned = (node.get("Actual Rows", 0) + node.get("Rows Removed by Filter", 0)) * loops
+        if scanned >= seq_scan_min_rows:
+            warnings.append(f"seq_scan: {node['Relation Name']} ({scanned} строк)")
+
+    if node_type in ("Sort", "Incremental Sort") and node.get("Sort Space Type") == "Disk":
+        warnings.append(f"sort_spill: {node.get('Sort Method')} ({node.get('Sort Space Used')} КБ на диске)")
+
+    if node_type == "Nested Loop" and len(node.get("Plans", [])) == 2:
+        inner = node["Plans"][1]
+        inner_loops = inner.get("Actual Loops", 1)
+        if inner_loops >= nested_loop_max_loops:
+            target = inner.get("Relation Name") or inner["Node Type"]
+            warnings.append(f"nested_loop: {target} ({inner_loops} повторов внутренней стороны)")
+
+    for child in node.get("Plans", []):
+        warnings.extend(plan_warnings(child, seq_scan_min_rows, nested_loop_max_loops))
+    return warnings
+
+
+def capture_plans(
+    only: str | None = None,
+    seq_scan_min_rows: int = SEQ_SCAN_MIN_ROWS,
+    nested_loop_max_loops: int = NESTED_LOOP_MAX_LOOPS,
+) -> Dict[str, dict]:
+    """
+    Выполняет кейсы и возвращает планы их запросов.
+
+    Ключ — имя кейса, для кейсов с несколькими запросами к имени добавляется `#<номер>`.
+    Всё выполняется в транзакции, которая откатывается: EXPLAIN ANALYZE действительно
+    выполняет запрос.
+    """
+    plans = {}
+    with transaction.atomic():
+        for case in build_cases():
+            if only and only not in case.name:
+                continue
+
+            collector = StatementCollector()
+            with connection.execute_wrapper(collector):
+                case.func()
+
+            for index, (sql, params) in enumerate(collector.statements, start=1):
+                key = case.name if len(collector.statements) == 1 else f"{case.name}#{index}"
+                plan = explain(sql, params)
+                plans[key] = {
+                    "sql": sql,
+                    "shape": plan_shape(plan),
+                    "warnings": plan_warnings(plan, seq_scan_min_rows, nested_loop_max_loops),
+                }
+        transaction.set_rollback(True)
+    return plans
+
+
+def diff_plans(baseline: Dict[str, dict], current: Dict[str, dict]) -> List[dict]:
+    """Сравнивает формы планов и список предупреждений со снимком."""
+    changes = []
+    for name in sorted(baseline.keys() | current.keys()):
+        if name not in baseline:
+            changes.append({"name": name, "status": "new", "new_warnings": current[name]["warnings"]})
+            continue
+        if name not in current:
+            changes.append({"name": name, "status": "missing"})
+            continue
+
+        old, new = baseline[name], current[name]
+        shape_diff = list(difflib.unified_diff(old["shape"], new["shape"], "снимок", "сейчас", lineterm="", n=1))
+        new_warnings = [warning for warning in new["warnings"] if _warning_kind(warning) not in _kinds(old)]
+        if shape_diff or new_warnings:
+            changes.append(
+                {
+                    "name": name,
+                    "status": "changed",
+                    "diff": shape_diff,
+                    "new_warnings": new_warnings,
+                }
+            )
+    return changes
+
+
+def _warning_kind(warning: str) -> str:
+    # Число строк в тексте предупреждения меняется от запуска к запуску, сравниваем только тип и объект.
+    return warning.split(" (", 1)[0]
+
+
+def _kinds(entry: dict) -> set:
+    return {_warning_kind(warning) for warning in entry["warnings"]}
+
+
+def snapshot_metadata(label: str) -> dict:
+    return {
+        "label": label,
+        "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "server_version": connection.pg_version,
+        "dataset": {
+            "users": User.objects.unfiltered().count(),
+            "subscriptions": Subscription.objects.unfiltered().count(),
+            "orders": Order.objects.unfiltered().count(),
+        },
+    }
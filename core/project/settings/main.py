@@ -2,6 +2,8 @@ from datetime import timedelta
 from pathlib import Path
 
 import environ
+from celery.schedules import crontab
+from kombu import Queue
 
 
 # Базовые пути
@@ -16,6 +18,7 @@ BOT_API_KEY = env("BOT_API_KEY")
 BOT_WEB_SERVER_PORT = env("BOT_WEB_SERVER_PORT")
 BOT_WEB_SERVER_SECRET_KEY = env("BOT_WEB_SERVER_SECRET_KEY")
 TELEGRAM_BOT_TOKEN = env("TELEGRAM_BOT_TOKEN")
+TELEGRAM_API_BASE_URL = env("TELEGRAM_API_BASE_URL", default="https://api.telegram.org")
 
 DEBUG = False
 ALLOWED_HOSTS = []
@@ -43,14 +46,21 @@ INSTALLED_APPS = [
 
 # Настройки Middleware
 MIDDLEWARE = [
+    "core.project.middleware.metrics_middleware.MetricsMiddleware",
+    "core.project.middleware.load_shedding_middleware.LoadSheddingMiddleware",
+    "core.project.middleware.sql_instrumentation_middleware.SqlInstrumentationMiddleware",
+    "core.project.middleware.tracing_middleware.TracingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "core.project.middleware.profiling_middleware.ProfilingMiddleware",
     "core.project.middleware.subscription_middleware.SubscriptionMiddleware",
+    "core.project.middleware.rate_limit_middleware.RateLimitMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "core.project.middleware.statement_timeout_middleware.StatementTimeoutMiddleware",
 ]
 
 X_FRAME_OPTIONS = "SAMEORIGIN"
@@ -61,7 +71,7 @@ ROOT_URLCONF = "core.project.urls"
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
-        "DIRS": [],
+        "DIRS": [BASE_DIR / "core" / "project" / "templates"],
         "APP_DIRS": True,
         "OPTIONS": {
             "context_processors": [
@@ -127,7 +137,7 @@ AUTH_USER_MODEL = "user.User"
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "core.apps.user.authentication.EntitlementJWTAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
@@ -138,6 +148,7 @@ REST_FRAMEWORK = {
         "rest_framework.renderers.JSONRenderer",
         "rest_framework.renderers.BrowsableAPIRenderer",
     ],
+    "EXCEPTION_HANDLER": "core.api.utils.exception_handler.api_exception_handler",
 }
 
 # Настройки Simple JWT
@@ -161,11 +172,23 @@ SIMPLE_JWT = {
     "USER_AUTHENTICATION_RULE": "rest_framework_simplejwt.authentication.default_user_authentication_rule",
     "AUTH_TOKEN_CLASSES": ("rest_framework_simplejwt.tokens.AccessToken",),
     "TOKEN_TYPE_CLAIM": "token_type",
-    "TOKEN_USER_CLASS": "rest_framework_simplejwt.models.TokenUser",
+    "TOKEN_USER_CLASS": "core.apps.user.tokens.EntitlementTokenUser",
+    "TOKEN_OBTAIN_SERIALIZER": "core.apps.user.tokens.EntitlementTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "core.apps.user.tokens.EntitlementTokenRefreshSerializer",
+    "TOKEN_VERIFY_SERIALIZER": "core.apps.user.tokens.RevocationTokenVerifySerializer",
     "JTI_CLAIM": "jti",
     "SLIDING_TOKEN_LIFETIME": timedelta(minutes=30),
     "SLIDING_TOKEN_REFRESH_LIFETIME": timedelta(days=1),
 }
+# Утверждения о правах (is_staff, is_active, subscription_active_until) в access-токене:
+# авторизация без запроса к БД. Такой токен живёт меньше обычного, чтобы изменения подписки
+# быстро доходили до клиента через обновление токена.
+JWT_ENTITLEMENT_CLAIMS = env.bool("JWT_ENTITLEMENT_CLAIMS", default=True)
+JWT_ENTITLEMENT_ACCESS_TOKEN_LIFETIME = timedelta(minutes=env.int("JWT_ENTITLEMENT_ACCESS_TOKEN_MINUTES", default=5))
+# Локальный кэш снимков пользователей для токенов без утверждений (0 — выключен).
+# Записи сбрасываются событиями шины инвалидации, TTL ограничивает устаревание при потере событий.
+JWT_USER_CACHE_TTL_SECONDS = env.int("JWT_USER_CACHE_TTL_SECONDS", default=60)
+JWT_USER_CACHE_MAX_SIZE = env.int("JWT_USER_CACHE_MAX_SIZE", default=10_000)
 
 # Настройки DRF Spectacular (Swagger/OpenAPI)
 SPECTACULAR_SETTINGS = {
@@ -193,4 +216,230 @@ CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = "Europe/Moscow"
 CELERY_ENABLE_UTC = True
 
-CELERY_WORKER_CONCURRENCY = 4
+CELERY_WORKER_CONCURRENCY = env.int("CELERY_WORKER_CONCURRENCY", default=4)
+
+# Топология очередей: уведомления не должны ждать за массовыми рассылками.
+# Каждую очередь обслуживает свой пул воркеров (см. docker_compose/app.yaml).
+CELERY_NOTIFICATIONS_QUEUE = "notifications"
+CELERY_BULK_QUEUE = "bulk"
+CELERY_MAINTENANCE_QUEUE = "maintenance"
+
+CELERY_TASK_QUEUES = (
+    Queue(CELERY_NOTIFICATIONS_QUEUE),
+    Queue(CELERY_BULK_QUEUE),
+    Queue(CELERY_MAINTENANCE_QUEUE),
+)
+CELERY_TASK_DEFAULT_QUEUE = CELERY_MAINTENANCE_QUEUE
+CELERY_TASK_ROUTES = {
+    "core.apps.products.tasks.send_order_creation_telegram_message": {"queue": CELERY_NOTIFICATIONS_QUEUE},
+    "core.apps.subscriptions.tasks.send_subscription_expiry_reminders": {"queue": CELERY_BULK_QUEUE},
+    "core.apps.subscriptions.tasks.run_tariff_broadcast": {"queue": CELERY_BULK_QUEUE},
+    "core.apps.subscriptions.tasks.run_bulk_operation": {"queue": CELERY_BULK_QUEUE},
+}
+
+# Подтверждение после выполнения: задача, прерванная падением воркера, будет выполнена повторно.
+# Массовые задачи возобновляемы (журнал напоминаний, контрольные точки рассылок).
+CELERY_TASK_ACKS_LATE = True
+CELERY_TASK_REJECT_ON_WORKER_LOST = True
+CELERY_WORKER_PREFETCH_MULTIPLIER = env.int("CELERY_WORKER_PREFETCH_MULTIPLIER", default=1)
+# Redis повторно выдаёт неподтверждённую задачу по истечении visibility_timeout, поэтому одна задача
+# должна укладываться в него: рассылка выполняется частями по TARIFF_BROADCAST_SLICE_SECONDS и ставит
+# продолжение в очередь. Повторная выдача всё равно возможна (падение воркера, двойная постановка),
+# поэтому рассылки и массовые операции захватываются арендой (core.apps.common.leases) и не выполняются
+# параллельно.
+CELERY_BROKER_TRANSPORT_OPTIONS = {
+    "visibility_timeout": env.int("CELERY_VISIBILITY_TIMEOUT", default=6 * 60 * 60),
+}
+
+# Результаты нужны только задачам, которые их явно запрашивают; fire-and-forget задачи
+# объявлены с ignore_result=True, остальные результаты живут ограниченное время.
+CELERY_RESULT_EXPIRES = env.int("CELERY_RESULT_EXPIRES", default=60 * 60)
+
+CELERY_BEAT_SCHEDULE = {
+    f"subscription-expiry-reminders-{days_before}d": {
+        "task": "core.apps.subscriptions.tasks.send_subscription_expiry_reminders",
+        "schedule": crontab(hour=10, minute=0),
+        "kwargs": {"days_before": days_before},
+    }
+    for days_before in (3, 1)
+}
+
+
+# Массовые рассылки через Telegram
+TELEGRAM_SEND_RATE_PER_SECOND = env.float("TELEGRAM_SEND_RATE_PER_SECOND", default=25)
+TELEGRAM_SEND_MAX_CONCURRENCY = env.int("TELEGRAM_SEND_MAX_CONCURRENCY", default=20)
+SUBSCRIPTION_REMINDER_CHUNK_SIZE = env.int("SUBSCRIPTION_REMINDER_CHUNK_SIZE", default=1000)
+TARIFF_BROADCAST_CHUNK_SIZE = env.int("TARIFF_BROADCAST_CHUNK_SIZE", default=1000)
+# Аренда рассылки или массовой операции продлевается после каждой пачки; не продлённая дольше
+# этого срока считается брошенной (воркер упал), и повторно доставленная задача её перехватывает.
+# Больше времени одной пачки.
+BACKGROUND_TASK_LEASE_SECONDS = env.int("BACKGROUND_TASK_LEASE_SECONDS", default=10 * 60)
+# Время одной задачи рассылки; должно быть заметно меньше CELERY_VISIBILITY_TIMEOUT.
+TARIFF_BROADCAST_SLICE_SECONDS = env.int("TARIFF_BROADCAST_SLICE_SECONDS", default=30 * 60)
+
+
+# Метрики Prometheus (/metrics). Без токена эндпоинт работает только при DEBUG.
+METRICS_AUTH_TOKEN = env("METRICS_AUTH_TOKEN", default="")
+
+
+# Инструментирование SQL: бюджет запросов по url_name и журнал медленных запросов.
+# Бюджет учитывает обе JWT-аутентификации (SubscriptionMiddleware и DRF) и проверку подписки.
+SQL_QUERY_BUDGETS = {
+    "v1:users:user-list-create": 6,
+    "v1:orders:order-list-create": 6,
+    "v1:orders:order-detail-action": 6,
+}
+SQL_QUERY_BUDGET_DEFAULT = None
+# Включено в core.project.settings.test, чтобы превышение бюджета роняло тест.
+SQL_QUERY_BUDGET_STRICT = env.bool("SQL_QUERY_BUDGET_STRICT", default=False)
+SQL_SLOW_QUERY_MS = env.int("SQL_SLOW_QUERY_MS", default=200)
+SQL_EXPLAIN_SLOW_QUERIES = env.bool("SQL_EXPLAIN_SLOW_QUERIES", default=True)
+# Таймауты SQL-запросов по "<METHOD> <url_name>" или url_name (мс): представление выполняется
+# в транзакции с SET LOCAL statement_timeout, отменённый запрос возвращает 504. None — без таймаута.
+# Создание объектов в транзакцию не оборачивается: ответ по Idempotency-Key сохраняется после коммита.
+STATEMENT_TIMEOUTS_MS = {
+    "GET v1:users:user-list-create": 2000,
+    "GET v1:users:user-archive-list": 2000,
+    "GET v1:orders:order-list-create": 2000,
+    "GET v1:subscriptions:subscriptions-list-create": 2000,
+    "GET v1:subscriptions:subscription-archive-list": 2000,
+    "GET v1:tariff:tariff-list-create": 2000,
+    "GET v1:tariff:tariff-archive-list": 2000,
+}
+STATEMENT_TIMEOUT_DEFAULT_MS = None
+
+
+# Трассировка OpenTelemetry: none | console | file (JSON-строки, по одному спану на строку)
+TRACING_EXPORTER = env("TRACING_EXPORTER", default="none")
+TRACING_FILE_PATH = env("TRACING_FILE_PATH", default=str(BASE_DIR / "traces.jsonl"))
+TRACING_SAMPLE_RATIO = env.float("TRACING_SAMPLE_RATIO", default=1.0)
+TRACING_SERVICE_NAME = env("TRACING_SERVICE_NAME", default="subscriptions-api")
+TRACING_CELERY_SERVICE_NAME = env("TRACING_CELERY_SERVICE_NAME", default="subscriptions-celery")
+
+
+# Сэмплирующий профайлер запросов (страница /admin/profiles/)
+PROFILING_HEADER = "X-Profile"
+# Доля профилируемых запросов по url_name, например {"v1:orders:order-list-create": 0.01}
+PROFILING_SAMPLE_RATES = {}
+PROFILING_INTERVAL_MS = env.float("PROFILING_INTERVAL_MS", default=5)
+PROFILING_REDIS_URL = env("PROFILING_REDIS_URL", default=CELERY_BROKER_URL)
+PROFILING_TTL_SECONDS = env.int("PROFILING_TTL_SECONDS", default=7 * 24 * 60 * 60)
+PROFILING_MAX_PROFILES = env.int("PROFILING_MAX_PROFILES", default=500)
+
+
+# Транзакционный outbox (побочные эффекты, выполняемые после коммита)
+OUTBOX_HANDLERS = {
+    "order.created": "core.apps.products.outbox.handle_order_created",
+}
+OUTBOX_RELAY_BATCH_SIZE = env.int("OUTBOX_RELAY_BATCH_SIZE", default=100)
+OUTBOX_RELAY_POLL_INTERVAL = env.float("OUTBOX_RELAY_POLL_INTERVAL", default=1.0)
+OUTBOX_MAX_ATTEMPTS = env.int("OUTBOX_MAX_ATTEMPTS", default=10)
+OUTBOX_RELAY_METRICS_PORT = env.int("OUTBOX_RELAY_METRICS_PORT", default=0)
+
+
+# Шина инвалидации кэшей (Django, Celery, Telegram-бот)
+CACHE_INVALIDATION_REDIS_URL = env("CACHE_INVALIDATION_REDIS_URL", default=CELERY_BROKER_URL)
+CACHE_INVALIDATION_CHANNEL = env("CACHE_INVALIDATION_CHANNEL", default="cache-invalidation")
+
+
+# Логирование: записи уходят в очередь, в stderr их пишет фоновый поток (core.project.structured_logging).
+LOG_LEVEL = env("LOG_LEVEL", default="INFO")
+LOG_FORMAT = env("LOG_FORMAT", default="json")  # json | text
+# Доля записей уровня INFO и ниже, которые остаются в шумных логгерах,
+# например LOG_SAMPLE_RATES=subscription_middleware=0.01,core.apps.products.tasks=0.1
+LOG_SAMPLE_RATES = {name: float(rate) for name, rate in env.dict("LOG_SAMPLE_RATES", default={}).items()}
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "queue": {
+            "()": "core.project.structured_logging.QueueLogHandler",
+            "fmt": LOG_FORMAT,
+            "sample_rates": LOG_SAMPLE_RATES,
+        },
+    },
+    "root": {
+        "handlers": ["queue"],
+        "level": LOG_LEVEL,
+    },
+    "loggers": {
+        # Каждый SQL-запрос на DEBUG не нужен: медленные запросы пишет журнал SQL_SLOW_QUERY_MS.
+        "django.db.backends": {"level": "WARNING"},
+    },
+}
+
+
+# Отзыв JWT (выход, удаление пользователя): отозванные jti в Redis, в процессе — фильтр Блума
+# по ним, который пересобирается раз в JWT_REVOCATION_SYNC_SECONDS.
+JWT_REVOCATION_REDIS_URL = env("JWT_REVOCATION_REDIS_URL", default=CELERY_BROKER_URL)
+JWT_REVOCATION_SYNC_SECONDS = env.int("JWT_REVOCATION_SYNC_SECONDS", default=30)
+JWT_REVOCATION_BLOOM_CAPACITY = env.int("JWT_REVOCATION_BLOOM_CAPACITY", default=100_000)
+JWT_REVOCATION_BLOOM_ERROR_RATE = env.float("JWT_REVOCATION_BLOOM_ERROR_RATE", default=0.001)
+
+
+# Ограничение частоты запросов к API (GCRA в Redis, при недоступности Redis — в памяти процесса).
+# Лимиты по url_name и уровню клиента: staff, subscribed, anonymous (без токена или без подписки);
+# "*" — общий лимит для остальных эндпоинтов, None — без ограничения. Формат: "100/m", "1000/h", "20/10s".
+RATE_LIMIT_ENABLED = env.bool("RATE_LIMIT_ENABLED", default=True)
+RATE_LIMIT_REDIS_URL = env("RATE_LIMIT_REDIS_URL", default=CELERY_BROKER_URL)
+# Число доверенных прокси перед приложением: IP клиента берётся из X-Forwarded-For только за ними.
+RATE_LIMIT_TRUSTED_PROXIES = env.int("RATE_LIMIT_TRUSTED_PROXIES", default=0)
+RATE_LIMITS = {
+    "*": {"staff": None, "subscribed": "600/m", "anonymous": "120/m"},
+    # Хеширование пароля
+    "v1:register": {"anonymous": "5/m"},
+    "v1:token_obtain_pair": {"anonymous": "10/m", "subscribed": "10/m"},
+    # Поиск через icontains
+    "v1:orders:order-list-create": {"subscribed": "120/m"},
+    "v1:subscriptions:subscriptions-list-create": {"subscribed": "120/m", "anonymous": "60/m"},
+    "v1:tariff:tariff-list-create": {"anonymous": "60/m"},
+}
+
+
+# Сброс нагрузки (LoadSheddingMiddleware): запрос отклоняется с 503, если ожидаемая задержка
+# (очередь перед приложением + среднее время обработки url_name) превысит долю бюджета его приоритета.
+# Срок выполнения принятого запроса передаётся в statement_timeout Postgres.
+LOAD_SHEDDING_ENABLED = env.bool("LOAD_SHEDDING_ENABLED", default=True)
+LOAD_SHEDDING_LATENCY_BUDGET_MS = env.int("LOAD_SHEDDING_LATENCY_BUDGET_MS", default=5000)
+# Лимит одновременно выполняющихся запросов на процесс и число запросов, которые процесс
+# обрабатывает параллельно без замедления (потоки упираются в GIL).
+LOAD_SHEDDING_MAX_IN_FLIGHT = env.int("LOAD_SHEDDING_MAX_IN_FLIGHT", default=32)
+LOAD_SHEDDING_CONCURRENCY = env.int("LOAD_SHEDDING_CONCURRENCY", default=2)
+# Оценка времени обработки url_name, для которого ещё нет замеров.
+LOAD_SHEDDING_DEFAULT_DURATION_MS = env.int("LOAD_SHEDDING_DEFAULT_DURATION_MS", default=50)
+# Заголовок балансировщика со временем поступления запроса, например в nginx:
+# proxy_set_header X-Request-Start "t=${msec}";
+LOAD_SHEDDING_REQUEST_START_HEADER = env("LOAD_SHEDDING_REQUEST_START_HEADER", default="X-Request-Start")
+# Префиксы путей без сброса нагрузки и срока выполнения.
+LOAD_SHEDDING_EXCLUDED_PATHS = ("/admin/",)
+# Приоритеты: high (дешёвые и публичные), normal (по умолчанию), low (списки с поиском).
+LOAD_SHEDDING_ROUTE_PRIORITIES = {
+    "metrics": "high",
+    "v1:token_refresh": "high",
+    "v1:token_verify": "high",
+    "v1:logout": "high",
+    "GET v1:users:user-list-create": "low",
+    "GET v1:users:user-archive-list": "low",
+    "GET v1:orders:order-list-create": "low",
+    "GET v1:subscriptions:subscriptions-list-create": "low",
+    "GET v1:subscriptions:subscription-archive-list": "low",
+    "GET v1:tariff:tariff-list-create": "low",
+    "GET v1:tariff:tariff-archive-list": "low",
+    "GET v1:broadcasts:broadcast-list-create": "low",
+}
+
+
+# Заголовок Idempotency-Key на создании заказов и подписок: первый успешный ответ хранится
+# в Redis IDEMPOTENCY_TTL_SECONDS, параллельные повторы ждут блокировку не дольше IDEMPOTENCY_LOCK_WAIT_SECONDS.
+IDEMPOTENCY_REDIS_URL = env("IDEMPOTENCY_REDIS_URL", default=CELERY_BROKER_URL)
+IDEMPOTENCY_TTL_SECONDS = env.int("IDEMPOTENCY_TTL_SECONDS", default=24 * 60 * 60)
+IDEMPOTENCY_LOCK_TIMEOUT_SECONDS = env.float("IDEMPOTENCY_LOCK_TIMEOUT_SECONDS", default=30)
+IDEMPOTENCY_LOCK_WAIT_SECONDS = env.float("IDEMPOTENCY_LOCK_WAIT_SECONDS", default=5)
+
+
+# Админка на больших таблицах: выше этого порога число строк в списке берётся из оценки планировщика
+ADMIN_EXACT_COUNT_THRESHOLD = env.int("ADMIN_EXACT_COUNT_THRESHOLD", default=10_000)
+# Массовые действия админки: строк в одном UPDATE и размер выборки, выше которого действие уходит в Celery
+BULK_ACTION_CHUNK_SIZE = env.int("BULK_ACTION_CHUNK_SIZE", default=1000)
+BULK_ACTION_SYNC_LIMIT = env.int("BULK_ACTION_SYNC_LIMIT", default=2000)
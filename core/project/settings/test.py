@@ -0,0 +1,9 @@
+"""
+Настройки для запуска тестов: `python manage.py test --settings=core.project.settings.test`.
+"""
+
+from core.project.settings.main import *  # noqa: F401,F403
+
+
+# Превышение бюджета SQL-запросов роняет тест, а не только пишется в журнал.
+SQL_QUERY_BUDGET_STRICT = True
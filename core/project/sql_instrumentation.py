@@ -0,0 +1,78 @@
+"""
+Инструментирование SQL в рамках одного HTTP-запроса.
+
+`QueryRecorder` подключается через `connection.execute_wrapper` в `SqlInstrumentationMiddleware`
+и собирает число запросов, их суммарное время и самые повторяющиеся выражения (признак N+1).
+Медленные запросы логируются вместе с планом выполнения (EXPLAIN).
+"""
+
+import logging
+import time
+from collections import Counter
+
+
+logger = logging.getLogger("sql_instrumentation")
+
+EXPLAINABLE_PREFIXES = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Запрос выполнил больше SQL-запросов, чем разрешено бюджетом его url_name."""
+
+
+class QueryRecorder:
+    def __init__(self, slow_query_threshold: float | None = None, explain_slow_queries: bool = True):
+        self.slow_query_threshold = slow_query_threshold
+        self.explain_slow_queries = explain_slow_queries
+        self.count = 0
+        self.duration = 0.0
+        self.statements: Counter[str] = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        result = execute(sql, params, many, context)
+        elapsed = time.perf_counter() - started
+
+        self.count += 1
+        self.duration += elapsed
+        self.statements[sql] += 1
+
+        if self.slow_query_threshold is not None and elapsed >= self.slow_query_threshold:
+            self._log_slow_query(sql, params, many, elapsed, context)
+        return result
+
+    def _log_slow_query(self, sql, params, many, elapsed, context) -> None:
+        plan = None
+        if self.explain_slow_queries and not many and sql.lstrip().upper().startswith(EXPLAINABLE_PREFIXES):
+            plan = self._explain(sql, params, context)
+        logger.warning(
+            "Медленный SQL-запрос (%.1f мс): %s; параметры: %r%s",
+            elapsed * 1000,
+            sql,
+            params,
+            f"\nПлан выполнения:\n{plan}" if plan else "",
+        )
+
+    @staticmethod
+    def _explain(sql, params, context) -> str | None:
+        # Отдельный курсор драйвера: результат исходного запроса ещё не прочитан вызывающим кодом,
+        # а EXPLAIN не должен снова проходить через обёртки и попадать в статистику.
+        # Внутри транзакции ошибка EXPLAIN не должна переводить её в состояние aborted.
+        in_transaction = context["connection"].in_atomic_block
+        with context["connection"].connection.cursor() as raw_cursor:
+            try:
+                if in_transaction:
+                    raw_cursor.execute("SAVEPOINT sql_instrumentation_explain")
+                raw_cursor.execute(f"EXPLAIN {sql}", params)
+                plan = "\n".join(row[0] for row in raw_cursor.fetchall())
+                if in_transaction:
+                    raw_cursor.execute("RELEASE SAVEPOINT sql_instrumentation_explain")
+                return plan
+            except Exception as e:
+                logger.debug("Не удалось получить EXPLAIN для медленного запроса: %s", e)
+                if in_transaction:
+                    raw_cursor.execute("ROLLBACK TO SAVEPOINT sql_instrumentation_explain")
+                return None
+
+    def most_repeated(self, limit: int = 3) -> list[tuple[str, int]]:
+        return [(sql, count) for sql, count in self.statements.most_common(limit) if count > 1]
@@ -0,0 +1,64 @@
+"""
+Ограничение времени SQL-запросов отдельного эндпоинта или сервиса.
+
+`statement_timeout` выполняет блок в транзакции с `SET LOCAL statement_timeout`: значение
+действует до конца транзакции и не остаётся на соединении. Запрос, отменённый Postgres
+по таймауту, превращается в `DatabaseTimeoutException` (504), а обработчик исключений DRF
+отдаёт его в формате `build_api_response`. По url_name таймауты применяет `StatementTimeoutMiddleware`.
+"""
+
+from contextlib import contextmanager
+from typing import Type
+
+from django.db import (
+    connections,
+    DEFAULT_DB_ALIAS,
+    OperationalError,
+    transaction,
+)
+
+from core.apps.common.exceptions.database_exceptions.database_exc import DatabaseTimeoutException
+from core.project.load_shedding import is_query_canceled
+from core.project.metrics import DB_STATEMENT_TIMEOUTS
+
+
+@contextmanager
+def statement_timeout(
+    timeout_ms: int,
+    scope: str,
+    exception_class: Type[DatabaseTimeoutException] = DatabaseTimeoutException,
+    using: str = DEFAULT_DB_ALIAS,
+):
+    """
+    Выполняет блок в транзакции, где каждый SQL-запрос ограничен `timeout_ms` миллисекундами.
+
+    Внутри уже открытой транзакции таймаут действует до её завершения.
+
+    Args:
+        timeout_ms (int): Таймаут одного SQL-запроса.
+        scope (str): Метка для метрики отменённых запросов (url_name или имя сервиса).
+        exception_class (Type[DatabaseTimeoutException]): Исключение при отмене запроса.
+        using (str): Алиас базы данных.
+
+    Raises:
+        DatabaseTimeoutException: Если Postgres отменил запрос по таймауту.
+    """
+    connection = connections[using]
+
+    def raise_on_cancel(execute, sql, params, many, context):
+        try:
+            return execute(sql, params, many, context)
+        except OperationalError as e:
+            if not is_query_canceled(e):
+                raise
+            DB_STATEMENT_TIMEOUTS.labels(scope=scope, status=exception_class.status_code).inc()
+            # Транзакция уже прервана: даже если исключение перехватят, фиксировать нечего.
+            connection.set_rollback(True)
+            raise exception_class() from e
+
+    with transaction.atomic(using=using), connection.execute_wrapper(raise_on_cancel):
+        if connection.vendor == "postgresql":
+            # Курсор драйвера: SET LOCAL не должен проходить через обёртки и попадать в статистику.
+            with connection.wrap_database_errors, connection.connection.cursor() as raw_cursor:
+                raw_cursor.execute("SET LOCAL statement_timeout = %s", [int(timeout_ms)])
+        yield
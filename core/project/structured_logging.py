@@ -0,0 +1,169 @@
+"""
+Структурированное логирование с записью вне потока запроса.
+
+`QueueLogHandler` кладёт записи в очередь процесса, а `QueueListener` в фоновом потоке
+форматирует их и пишет в stderr: JSON-строкой (LOG_FORMAT=json) или текстом. Сообщение
+собирается из шаблона и аргументов (`logger.info("... %s", value)`) уже в фоновом потоке,
+если аргументы неизменяемые. `SamplingFilter` пропускает долю записей уровня INFO и ниже
+для шумных логгеров (LOG_SAMPLE_RATES), предупреждения и ошибки не отбрасываются никогда.
+"""
+
+import atexit
+import datetime
+import decimal
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import uuid
+from logging.handlers import (
+    QueueHandler,
+    QueueListener,
+)
+from typing import Dict
+
+from opentelemetry import trace
+
+
+# Аргументы этих типов не меняются после вызова логгера, поэтому форматирование
+# сообщения можно отложить до фонового потока.
+IMMUTABLE_ARG_TYPES = (
+    str,
+    int,
+    float,
+    bool,
+    type(None),
+    uuid.UUID,
+    decimal.Decimal,
+    datetime.date,
+    datetime.datetime,
+    datetime.timedelta,
+)
+
+# Стандартные атрибуты LogRecord: всё остальное пришло через `extra=` и попадает в JSON.
+RESERVED_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {
+    "message",
+    "asctime",
+    "trace_id",
+    "span_id",
+    "sample_rate",
+}
+
+TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+
+class JsonFormatter(logging.Formatter):
+    """Одна JSON-строка на запись: время, уровень, логгер, сообщение, трасса и поля из `extra`."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.datetime.fromtimestamp(record.created, tz=datetime.timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for attr in ("trace_id", "span_id", "sample_rate"):
+            value = getattr(record, attr, None)
+            if value is not None:
+                payload[attr] = value
+        for key, value in vars(record).items():
+            if key not in RESERVED_RECORD_ATTRS:
+                payload[key] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            payload["stack_info"] = self.formatStack(record.stack_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Пропускает долю `rate` записей уровня INFO и ниже для логгеров из `rates`.
+
+    Правило ищется по имени логгера и его родителям (`a.b.c` → `a.b` → `a`). Пропущенная
+    запись получает атрибут `sample_rate`, чтобы при подсчёте событий её можно было взвесить.
+    """
+
+    def __init__(self, rates: Dict[str, float] | None = None):
+        super().__init__()
+        self.rates = rates or {}
+        self._resolved: Dict[str, float | None] = {}
+
+    def _rate_for(self, name: str) -> float | None:
+        if name not in self._resolved:
+            rate, parts = None, name.split(".")
+            while parts:
+                rate = self.rates.get(".".join(parts))
+                if rate is not None:
+                    break
+                parts.pop()
+            self._resolved[name] = rate
+        return self._resolved[name]
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO:
+            return True
+        rate = self._rate_for(record.name)
+        if rate is None or rate >= 1:
+            return True
+        if random.random() >= rate:
+            return False
+        record.sample_rate = rate
+        return True
+
+
+class QueueLogHandler(QueueHandler):
+    """
+    Обработчик для LOGGING: запись уходит в очередь, запись в поток — в фоновом `QueueListener`.
+
+    В Python 3.11 dictConfig не умеет настраивать QueueListener, поэтому обработчик сам создаёт
+    итоговый StreamHandler и слушателя. После fork (prefork-воркеры Celery, gunicorn с preload)
+    поток слушателя не наследуется и перезапускается при первой записи в новом процессе.
+    """
+
+    def __init__(self, fmt: str = "json", stream=None, sample_rates: Dict[str, float] | None = None):
+        super().__init__(queue.SimpleQueue())
+        self.target = logging.StreamHandler(stream or sys.stderr)
+        self.target.setFormatter(JsonFormatter() if fmt == "json" else logging.Formatter(TEXT_FORMAT))
+        if sample_rates:
+            self.addFilter(SamplingFilter(sample_rates))
+        self.listener: QueueListener | None = None
+        self._pid = None
+        self._start_listener()
+        atexit.register(self.stop)
+
+    def _start_listener(self) -> None:
+        self.queue = queue.SimpleQueue()
+        self.listener = QueueListener(self.queue, self.target, respect_handler_level=True)
+        self.listener.start()
+        self._pid = os.getpid()
+
+    def stop(self) -> None:
+        """Дожидается записи всего, что уже в очереди (вызывается при выходе из процесса)."""
+        if self.listener is not None and self._pid == os.getpid():
+            self.listener.stop()
+            self.listener = None
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self._pid != os.getpid():
+            self._start_listener()
+        self.queue.put_nowait(record)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Стандартный QueueHandler.prepare форматирует сообщение в потоке вызова;
+        # здесь это делается, только если аргументы могут измениться до записи.
+        args = record.args
+        if args:
+            values = args.values() if isinstance(args, dict) else args
+            if not all(isinstance(value, IMMUTABLE_ARG_TYPES) for value in values):
+                record.msg = record.getMessage()
+                record.args = None
+
+        # Контекст трассы доступен только в потоке запроса.
+        span_context = trace.get_current_span().get_span_context()
+        if span_context.is_valid:
+            record.trace_id = format(span_context.trace_id, "032x")
+            record.span_id = format(span_context.span_id, "016x")
+        return record
@@ -0,0 +1,133 @@
+"""
+Интеграция трассировки OpenTelemetry с Django и Celery.
+
+Спаны SQL-запросов создаются обёрткой `connection.execute_wrapper`, которая подключается
+к каждому новому соединению с БД и пишет спан только внутри уже идущей трассы
+(HTTP-запрос, задача Celery), поэтому фоновые запросы не порождают одиночных корневых трасс.
+"""
+
+import threading
+
+from celery import Task
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from opentelemetry import (
+    context as otel_context,
+    propagate,
+    trace,
+)
+from opentelemetry.propagators.textmap import Getter
+from opentelemetry.trace import SpanKind
+
+from core.apps.common.tracing import (
+    configure_tracing,
+    get_tracer,
+    inject_context,
+    record_exception,
+)
+
+
+MAX_STATEMENT_LENGTH = 2000
+
+
+def setup_tracing(service_name: str | None = None) -> None:
+    """Включает трассировку процесса по настройкам TRACING_*. Безопасно вызывать повторно."""
+    enabled = configure_tracing(
+        service_name=service_name or settings.TRACING_SERVICE_NAME,
+        exporter=settings.TRACING_EXPORTER,
+        file_path=settings.TRACING_FILE_PATH,
+        sample_ratio=settings.TRACING_SAMPLE_RATIO,
+    )
+    if enabled:
+        connection_created.connect(install_db_tracing, dispatch_uid="tracing_db_wrapper")
+
+
+def trace_db_query(execute, sql, params, many, context):
+    if not trace.get_current_span().is_recording():
+        return execute(sql, params, many, context)
+
+    operation = sql.lstrip().split(" ", 1)[0].upper()
+    with get_tracer().start_as_current_span(f"db {operation}", kind=SpanKind.CLIENT) as span:
+        span.set_attribute("db.system", context["connection"].vendor)
+        span.set_attribute("db.operation", operation)
+        span.set_attribute("db.statement", sql[:MAX_STATEMENT_LENGTH])
+        return execute(sql, params, many, context)
+
+
+def install_db_tracing(sender, connection, **kwargs) -> None:
+    if trace_db_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(trace_db_query)
+
+
+class CeleryRequestGetter(Getter):
+    """Celery передаёт пользовательские заголовки сообщения как атрибуты `task.request`."""
+
+    def get(self, carrier, key):
+        value = getattr(carrier, key, None)
+        if value is None:
+            return None
+        return [value] if isinstance(value, str) else list(value)
+
+    def keys(self, carrier):
+        return []
+
+
+class CelerySpans:
+    """Спаны публикации и выполнения задач Celery, связанные через заголовок traceparent."""
+
+    def __init__(self):
+        self._publish_spans: dict[str, trace.Span] = {}
+        self._task_spans: dict[str, tuple[trace.Span, object]] = {}
+        self._lock = threading.Lock()
+        self._getter = CeleryRequestGetter()
+
+    def before_publish(self, headers: dict | None = None, routing_key: str | None = None) -> None:
+        if not headers or not headers.get("id"):
+            return
+        span = get_tracer().start_span(f"celery publish {headers.get('task')}", kind=SpanKind.PRODUCER)
+        span.set_attribute("messaging.system", "celery")
+        span.set_attribute("messaging.destination.name", routing_key or "")
+        span.set_attribute("celery.task_id", headers["id"])
+        token = otel_context.attach(trace.set_span_in_context(span))
+        try:
+            inject_context(headers)
+        finally:
+            otel_context.detach(token)
+        with self._lock:
+            self._publish_spans[headers["id"]] = span
+
+    def after_publish(self, headers: dict | None = None) -> None:
+        if not headers or not headers.get("id"):
+            return
+        with self._lock:
+            span = self._publish_spans.pop(headers["id"], None)
+        if span is not None:
+            span.end()
+
+    def task_started(self, task_id: str, task: Task) -> None:
+        parent = propagate.extract(task.request, getter=self._getter)
+        span = get_tracer().start_span(f"celery run {task.name}", context=parent, kind=SpanKind.CONSUMER)
+        span.set_attribute("messaging.system", "celery")
+        span.set_attribute("celery.task_id", task_id)
+        token = otel_context.attach(trace.set_span_in_context(span))
+        with self._lock:
+            self._task_spans[task_id] = (span, token)
+
+    def task_failed(self, task_id: str, exception: BaseException) -> None:
+        with self._lock:
+            entry = self._task_spans.get(task_id)
+        if entry is not None:
+            record_exception(entry[0], exception)
+
+    def task_finished(self, task_id: str, state: str | None = None) -> None:
+        with self._lock:
+            entry = self._task_spans.pop(task_id, None)
+        if entry is None:
+            return
+        span, token = entry
+        span.set_attribute("celery.state", state or "")
+        span.end()
+        otel_context.detach(token)
+
+
+celery_spans = CelerySpans()
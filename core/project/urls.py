@@ -9,10 +9,23 @@ from drf_spectacular.views import (
     SpectacularSwaggerView,
 )
 
+from core.project.metrics import metrics_view
+from core.project.profiling import (
+    profile_download_view,
+    profile_list_view,
+)
+
 
 urlpatterns = [
     path("api/", include("core.api.urls")),
+    path("admin/profiles/", admin.site.admin_view(profile_list_view), name="admin-profiles"),
+    path(
+        "admin/profiles/<str:profile_id>/",
+        admin.site.admin_view(profile_download_view),
+        name="admin-profile-download",
+    ),
     path("admin/", admin.site.urls),
+    path("metrics", metrics_view, name="metrics"),
 ]
 
 urlpatterns += [
@@ -18,15 +18,27 @@ from aiogram import (
 from aiogram.client.default import DefaultBotProperties
 from aiogram.fsm.storage.memory import MemoryStorage
 from aiohttp import web
+from opentelemetry.trace import SpanKind
 from punq import Container
 from telegram_bot.config import (
     BOT_WEB_SERVER_PORT,
+    CACHE_INVALIDATION_CHANNEL,
+    REDIS_URL,
     TELEGRAM_BOT_TOKEN,
+    TRACING_EXPORTER,
+    TRACING_FILE_PATH,
+    TRACING_SAMPLE_RATIO,
 )
 from telegram_bot.db.session import AsyncSessionLocal
 from telegram_bot.handlers.user_handlers import register_user_handlers
 from telegram_bot.web_server import init_web_server
 
+from core.apps.common.cache_bus import CacheInvalidationBus
+from core.apps.common.tracing import (
+    configure_tracing,
+    get_tracer,
+)
+
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(name)s - %(message)s")
 
@@ -67,12 +79,35 @@ class PunqMiddleware:
             return await handler(event, data)
 
 
+class TracingMiddleware:
+    """Открывает спан на каждое обновление Telegram; вложенные спаны (запросы к API) становятся его детьми."""
+
+    async def __call__(
+        self,
+        handler: Callable[[types.TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: types.Update,
+        data: Dict[str, Any],
+    ) -> Any:
+        with get_tracer().start_as_current_span(f"aiogram {event.event_type}", kind=SpanKind.CONSUMER) as span:
+            span.set_attribute("telegram.update_id", event.update_id)
+            user = data.get("event_from_user")
+            if user is not None:
+                span.set_attribute("telegram.user_id", user.id)
+            return await handler(event, data)
+
+
 def configure_punq_container() -> Container:
     container = Container()
     return container
 
 
 async def main():
+    configure_tracing(
+        service_name="telegram-bot",
+        exporter=TRACING_EXPORTER,
+        file_path=TRACING_FILE_PATH,
+        sample_ratio=TRACING_SAMPLE_RATIO,
+    )
     container = configure_punq_container()
 
     bot = Bot(token=TELEGRAM_BOT_TOKEN, default=DefaultBotProperties(parse_mode="MarkdownV2"))
@@ -81,6 +116,10 @@ async def main():
     dp = Dispatcher(storage=storage)
     dp["punq_container"] = container
 
+    cache_bus = CacheInvalidationBus(redis_url=REDIS_URL, channel=CACHE_INVALIDATION_CHANNEL)
+    dp["cache_bus"] = cache_bus
+
+    dp.update.outer_middleware.register(TracingMiddleware())
     dp.update.middleware.register(PunqMiddleware(container))
 
     register_user_handlers(dp)
@@ -94,7 +133,9 @@ async def main():
     logging.info("Starting bot polling...")
     bot_polling_task = asyncio.create_task(dp.start_polling(bot))
 
-    await asyncio.gather(web_server_task, bot_polling_task)
+    cache_bus_task = asyncio.create_task(cache_bus.listen_async())
+
+    await asyncio.gather(web_server_task, bot_polling_task, cache_bus_task)
 
 
 if __name__ == "__main__":
@@ -41,3 +41,28 @@ BOT_WEB_SERVER_SECRET_KEY = env(
     "BOT_WEB_SERVER_SECRET_KEY",
     default="very-secret-bot-key-for-django",
 )
+
+REDIS_URL = env(
+    "REDIS_BROKER_URL",
+    default="redis://redis:6379/0",
+)
+
+CACHE_INVALIDATION_CHANNEL = env(
+    "CACHE_INVALIDATION_CHANNEL",
+    default="cache-invalidation",
+)
+
+TRACING_EXPORTER = env(
+    "TRACING_EXPORTER",
+    default="none",
+)
+
+TRACING_FILE_PATH = env(
+    "TRACING_FILE_PATH",
+    default=os.path.join(BASE_DIR, "traces.jsonl"),
+)
+
+TRACING_SAMPLE_RATIO = env.float(
+    "TRACING_SAMPLE_RATIO",
+    default=1.0,
+)
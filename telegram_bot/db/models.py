@@ -88,6 +88,11 @@ class User(Base):
         String(20),
         nullable=True,
     )
+    phone_e164 = Column(
+        String(16),
+        unique=True,
+        nullable=True,
+    )
 
     def __repr__(self):
         return f"<User(id='{self.id}', email='{self.email}', " f"phone='{self.phone}', telegram_id={self.telegram_id})>"
@@ -1,5 +1,4 @@
 import logging
-import re
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -18,6 +17,12 @@ from aiogram.fsm.state import (
 from aiogram.utils.keyboard import ReplyKeyboardBuilder
 from telegram_bot.db.models import User
 
+from core.apps.common.cache_bus import (
+    CacheInvalidationBus,
+    USER_ENTITY,
+)
+from core.apps.common.phone import normalize_phone
+
 
 logger = logging.getLogger(__name__)
 
@@ -29,21 +34,6 @@ def escape_markdown_v2(text: str) -> str:
     return text
 
 
-def normalize_phone_number(phone_number_str: str) -> str:
-    if not phone_number_str:
-        return ""
-
-    cleaned_number = re.sub(r"\D", "", phone_number_str)
-
-    if cleaned_number.startswith("8") and len(cleaned_number) == 11:
-        cleaned_number = "7" + cleaned_number[1:]
-
-    if not cleaned_number.startswith("+"):
-        return "+" + cleaned_number
-
-    return cleaned_number
-
-
 class UserActivationStates(StatesGroup):
     waiting_for_phone = State()
 
@@ -67,36 +57,54 @@ async def command_start_handler(message: types.Message, state: FSMContext) -> No
 
 
 @user_router.message(F.contact, UserActivationStates.waiting_for_phone)
-async def process_phone_by_contact_button(message: types.Message, state: FSMContext, db_session: AsyncSession) -> None:
+async def process_phone_by_contact_button(
+    message: types.Message,
+    state: FSMContext,
+    db_session: AsyncSession,
+    cache_bus: CacheInvalidationBus,
+) -> None:
     phone_number_raw = message.contact.phone_number
-    phone_number_normalized = normalize_phone_number(phone_number_raw)
+    phone_number_normalized = normalize_phone(phone_number_raw)
     telegram_id = message.from_user.id
 
+    if phone_number_normalized is None:
+        await process_invalid_phone(message, state)
+        return
+
     escaped_phone_number = escape_markdown_v2(phone_number_normalized)
     await message.answer(
         f"Спасибо, ваш номер: `{escaped_phone_number}`\\. Пытаюсь активировать аккаунт\\.\\.\\.",
         parse_mode="MarkdownV2",
     )
 
-    await _process_activation(message, state, phone_number_normalized, telegram_id, db_session)
+    await _process_activation(message, state, phone_number_normalized, telegram_id, db_session, cache_bus)
 
 
 @user_router.message(
     F.text.regexp(r"^(?:\+)?[\d\s\-()]{7,20}$"),
     UserActivationStates.waiting_for_phone,
 )
-async def process_phone_by_text(message: types.Message, state: FSMContext, db_session: AsyncSession) -> None:
+async def process_phone_by_text(
+    message: types.Message,
+    state: FSMContext,
+    db_session: AsyncSession,
+    cache_bus: CacheInvalidationBus,
+) -> None:
     phone_number_raw = message.text
-    phone_number_normalized = normalize_phone_number(phone_number_raw)
+    phone_number_normalized = normalize_phone(phone_number_raw)
     telegram_id = message.from_user.id
 
+    if phone_number_normalized is None:
+        await process_invalid_phone(message, state)
+        return
+
     escaped_phone_number = escape_markdown_v2(phone_number_normalized)
     await message.answer(
         f"Спасибо, ваш номер: `{escaped_phone_number}`\\. Пытаюсь активировать аккаунт\\.\\.\\.",
         parse_mode="MarkdownV2",
     )
 
-    await _process_activation(message, state, phone_number_normalized, telegram_id, db_session)
+    await _process_activation(message, state, phone_number_normalized, telegram_id, db_session, cache_bus)
 
 
 @user_router.message(
@@ -117,9 +125,10 @@ async def _process_activation(
     phone_number: str,
     telegram_id: int,
     db_session: AsyncSession,
+    cache_bus: CacheInvalidationBus,
 ) -> None:
     try:
-        stmt = select(User).where(User.phone == phone_number)
+        stmt = select(User).where(User.phone_e164 == phone_number)
         result = await db_session.execute(stmt)
         user = result.scalars().first()
 
@@ -148,6 +157,7 @@ async def _process_activation(
         db_session.add(user)
         await db_session.commit()
         await db_session.refresh(user)
+        await cache_bus.publish_async(USER_ENTITY, str(user.id))
 
         if was_inactive:
             await message.answer(
@@ -1,11 +1,26 @@
 from aiohttp import web
+from opentelemetry.trace import SpanKind
 from telegram_bot.config import BOT_WEB_SERVER_SECRET_KEY
 
+from core.apps.common.tracing import (
+    get_tracer,
+    use_context,
+)
+
 
 _aiogram_bot = None
 
 
 async def handle_notify_user(request: web.Request):
+    # Продолжаем трассу вызывающей стороны (заголовок traceparent).
+    with use_context(request.headers):
+        with get_tracer().start_as_current_span("POST /notify_user", kind=SpanKind.SERVER) as span:
+            response = await _notify_user(request)
+            span.set_attribute("http.response.status_code", response.status)
+            return response
+
+
+async def _notify_user(request: web.Request) -> web.Response:
     if _aiogram_bot is None:
         return web.json_response({"status": "error", "message": "Bot not initialized"}, status=500)
 
@@ -33,7 +48,8 @@ async def handle_notify_user(request: web.Request):
         return web.json_response({"status": "error", "message": "Invalid 'telegram_id' format"}, status=400)
 
     try:
-        await _aiogram_bot.send_message(chat_id=telegram_id, text=message_text, parse_mode="MarkdownV2")
+        with get_tracer().start_as_current_span("telegram sendMessage", kind=SpanKind.CLIENT):
+            await _aiogram_bot.send_message(chat_id=telegram_id, text=message_text, parse_mode="MarkdownV2")
         return web.json_response({"status": "success", "message": "Notification sent"}, status=200)
     except Exception as e:
         return web.json_response({"status": "error", "message": f"Failed to send notification: {e}"}, status=500)